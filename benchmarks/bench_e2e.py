@@ -0,0 +1,133 @@
+"""
+End-to-end throughput and peak memory of fetching the complete inventory from
+a fake OneClick server, with 1k, 10k and 100k models by default.
+
+Each method of fetching the devices is run against an httpx MockTransport, so
+the results measure the client rather than the network, unless a simulated
+`--latency` is added to every request.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_e2e.py [--sizes 1000 10000 100000]
+        [--page-size 5000] [--latency 0.0] [--workers 4]
+        [--compare benchmarks/results/e2e-....json]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pyspectrum import SpectrumClient, AsyncSpectrumClient
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_oneclick import FakeOneClick, generate_models  # noqa: E402
+from harness import measure, save_results, compare_results  # noqa: E402
+
+
+def client(fake: FakeOneClick, size: int, **options) -> SpectrumClient:
+    return SpectrumClient(
+        base_url="http://oneclick",
+        username="bench",
+        password="bench",
+        transport=fake.transport(),
+        api_throttle=size,
+        **options,
+    )
+
+
+def scenarios(
+    fake: FakeOneClick, size: int, page_size: int, workers: int
+) -> dict:
+    """ Each method of fetching every device, returning the model count """
+
+    def single_request():
+        return len(client(fake, size).get_all_devices().result)
+
+    def paged():
+        return sum(
+            1 for _ in client(fake, size).iter_all_devices(page_size=page_size)
+        )
+
+    def streamed():
+        models = client(fake, size).iter_all_devices(
+            page_size=page_size, stream=True
+        )
+        return sum(1 for _ in models)
+
+    def parallel():
+        # Includes starting the worker processes, as a single export would
+        with client(fake, size, parse_pool=workers) as spectrum:
+            models = spectrum.iter_all_devices(page_size=page_size)
+            return sum(1 for _ in models)
+
+    def columns():
+        spectrum = client(fake, size)
+        return sum(
+            len(page.columns)
+            for page in spectrum.iter_device_pages(page_size=page_size)
+        )
+
+    def async_paged():
+        async def run():
+            async with AsyncSpectrumClient(
+                base_url="http://oneclick",
+                username="bench",
+                password="bench",
+                transport=fake.transport(use_async=True),
+            ) as spectrum:
+                count = 0
+                async for _ in spectrum.iter_all_devices(page_size=page_size):
+                    count += 1
+                return count
+
+        return asyncio.run(run())
+
+    return {
+        "single_request": single_request,
+        "paged": paged,
+        "streamed": streamed,
+        "parallel": parallel,
+        "columns": columns,
+        "async_paged": async_paged,
+    }
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    argp.add_argument("--page-size", type=int, default=5000)
+    argp.add_argument("--latency", type=float, default=0.0)
+    argp.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    argp.add_argument("--output", help="results file path")
+    argp.add_argument("--compare", help="earlier results file to compare")
+    args = argp.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        fake = FakeOneClick(generate_models(size), latency=args.latency)
+        cases = scenarios(fake, size, args.page_size, args.workers)
+        for name, func in cases.items():
+            counts = []
+            values = measure(lambda: counts.append(func()))
+            assert counts == [size] * 2, f"{name} returned {counts} models"
+
+            values["models_per_sec"] = size / values["seconds"]
+            results[f"{name}/{size}"] = values
+            print(
+                f"{name + '/' + str(size):<28} {values['seconds']:9.3f} s"
+                f" {values['models_per_sec']:12,.0f} models/s"
+                f" {values['peak_mb']:10.1f} MB peak"
+            )
+
+    print(f"\nResults saved to {save_results('e2e', results, args.output)}")
+
+    if args.compare:
+        # Throughput is derived from the time, and higher is better
+        for values in results.values():
+            values.pop("models_per_sec")
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
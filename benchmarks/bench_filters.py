@@ -0,0 +1,79 @@
+"""
+Benchmark of the hand-written filter parser against the reference parsimonious
+grammar. Before timing, the output of both parsers is compared for every
+expression in the corpus.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_filters.py [--clauses 10 100 500]
+"""
+import argparse
+import timeit
+from pyspectrum.filters import (
+    _FilterParser,
+    parse_filter_peg,
+    normalize_filter,
+)
+
+CORPUS = [
+    "model_name ~ FW",
+    "device_type ~ 'Juniper Networks'",
+    """
+    and (
+        model_type_name = Rtr_Cisco,
+        condition <= 2
+    )
+    """,
+    """
+    or (
+        and (model_name ^= lon, network_address =~ "10\\.1\\..*"),
+        not (model_type_name != Pingable, condition > 3),
+        0x1102e =$ lab
+    )
+    """,
+]
+
+
+def or_clauses(count: int) -> str:
+    """ A generated `or` group of `network_address` clauses """
+    clauses = ",\n".join(
+        f"network_address = 10.{n // 65536}.{n // 256 % 256}.{n % 256}"
+        for n in range(count)
+    )
+    return f"or (\n{clauses}\n)"
+
+
+def fast_parse(expr: str) -> dict:
+    return _FilterParser().parse(normalize_filter(expr))
+
+
+def check(exprs):
+    for expr in exprs:
+        assert fast_parse(expr) == parse_filter_peg(expr), expr
+
+
+def bench(label: str, expr: str, number: int):
+    peg = timeit.timeit(lambda: parse_filter_peg(expr), number=number)
+    fast = timeit.timeit(lambda: fast_parse(expr), number=number)
+    print(
+        f"{label:<24} peg {peg / number * 1e3:9.3f} ms   "
+        f"fast {fast / number * 1e3:9.3f} ms   x{peg / fast:6.1f}"
+    )
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument("--clauses", nargs="+", type=int, default=[10, 100, 500])
+    args = argp.parse_args()
+
+    generated = {count: or_clauses(count) for count in args.clauses}
+    check(CORPUS + list(generated.values()))
+
+    for num, expr in enumerate(CORPUS):
+        bench(f"corpus[{num}]", expr, number=200)
+
+    for count, expr in generated.items():
+        bench(f"or x {count}", expr, number=max(1, 2000 // count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Import time of the package, the client, and a first request, measured with
+`python -X importtime` in a new interpreter for each run.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_import.py [--repeat 7] [--top 10]
+        [--compare benchmarks/results/import-....json]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import save_results, compare_results  # noqa: E402
+
+_RESPONSE = (
+    '<model-response-list xmlns="http://www.ca.com/spectrum/restful/schema/'
+    'response" throttle="1" total-models="1"><model-responses>'
+    '<model mh="0x1000001"><attribute id="0x129fa">0x1000001</attribute>'
+    "</model></model-responses></model-response-list>"
+)
+
+_CLIENT = (
+    "import httpx\n"
+    "from pyspectrum import SpectrumClient\n"
+    "spectrum = SpectrumClient(base_url='http://localhost', username='a', "
+    "password='b', transport=httpx.MockTransport("
+    f"lambda request: httpx.Response(200, content={_RESPONSE!r})))\n"
+)
+
+SCENARIOS = {
+    "import_package": "import pyspectrum",
+    "import_client": "from pyspectrum import SpectrumClient",
+    "get_model": _CLIENT + "spectrum.get_model(0x1000001).result",
+    "get_models": _CLIENT
+    + "spectrum.get_models('model_name ~ lab', ['device_type']).result",
+}
+
+# Optional dependencies which should only be imported when they are used
+
+LAZY_MODULES = [
+    "parsimonious",
+    "jinja2",
+    "asyncio",
+    "sqlite3",
+    "concurrent.futures",
+    "pyspectrum.cache",
+    "pyspectrum.metrics",
+    "pyspectrum.parallel",
+]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importtime(statement: str) -> List[Tuple[int, str, int]]:
+    """
+    Runs the statement in a new interpreter and returns the (depth, module,
+    cumulative microseconds) of each module imported
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [
+        (len(match.group(3)) // 2, match.group(4), int(match.group(2)))
+        for match in map(_LINE_RE.match, proc.stderr.splitlines())
+        if match
+    ]
+
+
+def bench_scenario(
+    statement: str, startup: set, repeat: int
+) -> Tuple[Dict[str, float], List[Tuple[str, int]], List[str]]:
+    """
+    Returns the median import time, and the number of modules imported, by
+    the statement, excluding the modules imported at interpreter startup,
+    together with the slowest top-level imports of the last run and the lazy
+    modules which were imported.
+    """
+    totals = []
+    for _ in range(repeat):
+        new = [
+            entry for entry in importtime(statement) if entry[1] not in startup
+        ]
+        totals.append(sum(usec for depth, _, usec in new if depth == 0))
+
+    names = {name for _, name, _ in new}
+    slowest = sorted(
+        ((name, usec) for depth, name, usec in new if depth <= 1),
+        key=lambda item: -item[1],
+    )
+    return (
+        {
+            "seconds": statistics.median(totals) / 1e6,
+            "modules": len(names),
+        },
+        slowest,
+        [name for name in LAZY_MODULES if name in names],
+    )
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument("--repeat", type=int, default=7)
+    argp.add_argument("--top", type=int, default=8, help="slowest imports")
+    argp.add_argument("--output", help="results file path")
+    argp.add_argument("--compare", help="earlier results file to compare")
+    args = argp.parse_args()
+
+    startup = {name for _, name, _ in importtime("pass")}
+    results = {}
+
+    for case, statement in SCENARIOS.items():
+        values, slowest, lazy = bench_scenario(statement, startup, args.repeat)
+        results[case] = values
+
+        print(
+            f"{case:<20} {values['seconds'] * 1e3:9.1f} ms "
+            f"{values['modules']:6} modules   "
+            f"lazy modules imported: {', '.join(lazy) or 'none'}"
+        )
+        for name, usec in slowest[: args.top]:
+            print(f"    {name:<40} {usec / 1e3:9.1f} ms")
+
+    print(f"\nResults saved to {save_results('import', results, args.output)}")
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Micro-benchmarks of filter parsing, payload rendering, response parsing and
+CSV export, for synthetic responses of each size.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_micro.py [--sizes 1000 10000]
+        [--compare benchmarks/results/micro-....json]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import httpx
+from pyspectrum import SpectrumClient
+from pyspectrum.filters import parse_filter, clear_filter_cache
+from pyspectrum.responses import SpectrumModelResponseList
+from pyspectrum.template import model_search_xml
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_oneclick import generate_models, model_response_list  # noqa: E402
+from harness import best_of, save_results, compare_results  # noqa: E402
+
+FILTER = """
+and (
+    model_type_name = Rtr_Cisco,
+    or (condition >= 2, network_address =~ "10\\.1\\..*"),
+    not (model_name ^= lab, device_type ~ 'Juniper Networks')
+)
+"""
+
+ATTRS = ["0x129fa", "0x1006e", "0x10000", "0x12d7f", "0x1000a", "0x23000e"]
+
+
+def uncached_parse():
+    clear_filter_cache()
+    parse_filter(FILTER)
+
+
+def bench_filters(results: dict, number: int) -> None:
+    results["parse_filter"] = {"seconds": best_of(uncached_parse, number)}
+    results["parse_filter_cached"] = {
+        "seconds": best_of(lambda: parse_filter(FILTER), number)
+    }
+    parsed = parse_filter(FILTER)
+    results["model_search_xml"] = {
+        "seconds": best_of(
+            lambda: model_search_xml(
+                filter=parsed, req_attrs=ATTRS, throttlesize=1000
+            ),
+            number,
+        )
+    }
+
+
+def bench_responses(results: dict, size: int, number: int) -> None:
+    response = httpx.Response(
+        200,
+        content=model_response_list(generate_models(size)),
+        request=httpx.Request("GET", "http://localhost/devices"),
+    )
+
+    def parse():
+        return SpectrumModelResponseList(response)
+
+    def result():
+        return parse().result
+
+    parsed = result()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, "models.csv")
+        results[f"parse/{size}"] = {"seconds": best_of(parse, number)}
+        results[f"result/{size}"] = {"seconds": best_of(result, number)}
+        results[f"to_csv/{size}"] = {
+            "seconds": best_of(
+                lambda: SpectrumClient.to_csv(parsed, filepath), number
+            )
+        }
+        results[f"to_csv_sorted/{size}"] = {
+            "seconds": best_of(
+                lambda: SpectrumClient.to_csv(
+                    parsed, filepath, orderby="model_name"
+                ),
+                number,
+            )
+        }
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    argp.add_argument("--output", help="results file path")
+    argp.add_argument("--compare", help="earlier results file to compare")
+    args = argp.parse_args()
+
+    results = {}
+    bench_filters(results, number=1000)
+    for size in args.sizes:
+        bench_responses(results, size, number=max(1, 10000 // size))
+
+    for case, values in results.items():
+        print(f"{case:<32} {values['seconds'] * 1e3:12.3f} ms")
+
+    print(f"\nResults saved to {save_results('micro', results, args.output)}")
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of the direct model search payload writer against the Jinja2
+template. Before timing, the output of both is compared for each case.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_payload.py [--clauses 10 100 500]
+"""
+import argparse
+import timeit
+from pyspectrum.filters import parse_filter
+from pyspectrum.template import model_search_xml, model_search_bytes
+
+ATTRS = ["0x129fa", "0x1006e", "0x10000", 0x12D7F, 0x1000A, 0x23000E]
+
+
+def or_clauses(count: int) -> dict:
+    """ A parsed `or` group of `network_address` clauses """
+    clauses = ", ".join(
+        f"network_address = 10.{n // 65536}.{n // 256 % 256}.{n % 256}"
+        for n in range(count)
+    )
+    return parse_filter(f"or ({clauses})")
+
+
+def bench(label: str, params: dict, number: int):
+    assert model_search_bytes(**params) == model_search_xml(**params).encode()
+
+    jinja = timeit.timeit(
+        lambda: model_search_xml(**params).encode(), number=number
+    )
+    direct = timeit.timeit(lambda: model_search_bytes(**params), number=number)
+    print(
+        f"{label:<24} jinja {jinja / number * 1e3:9.3f} ms   "
+        f"direct {direct / number * 1e3:9.3f} ms   x{jinja / direct:6.1f}"
+    )
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument("--clauses", nargs="+", type=int, default=[10, 100, 500])
+    args = argp.parse_args()
+
+    bench(
+        "simple",
+        dict(filter=parse_filter("model_name ~ FW"), req_attrs=ATTRS),
+        number=1000,
+    )
+    bench(
+        "relation",
+        dict(
+            filter=parse_filter("model_type_name = Rtr_Cisco"),
+            req_attrs=ATTRS,
+            devices_only=True,
+            child_models=True,
+            relation=0x10001,
+        ),
+        number=1000,
+    )
+
+    for count in args.clauses:
+        bench(
+            f"or x {count}",
+            dict(filter=or_clauses(count), req_attrs=ATTRS * 10),
+            number=max(1, 20000 // count),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of a large /devices pull with and without response compression and
+connection reuse, against a local stand-in server or a real OneClick server
+(using the SPECTRUM_URL, SPECTRUM_USERNAME and SPECTRUM_PASSWORD environment
+variables when --real is given).
+
+HTTP/2 can only be compared against a server which supports it, with the `h2`
+package installed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_transport.py [--models 20000]
+"""
+import argparse
+import os
+import sys
+import time
+from pyspectrum import SpectrumClient
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_oneclick import FakeOneClickServer  # noqa: E402
+
+CONFIGS = {
+    "plain": dict(compression=False, max_keepalive_connections=0),
+    "keepalive": dict(compression=False),
+    "compressed": dict(compression=True),
+}
+
+
+def pull(base_url: str, repeat: int, **clientopts):
+    """ Fetch all devices `repeat` times, returning bytes and seconds """
+    downloaded = 0
+    with SpectrumClient(base_url=base_url, **clientopts) as spectrum:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            resp = spectrum.get_all_devices()
+            downloaded += resp.response.num_bytes_downloaded
+        return downloaded, time.perf_counter() - start
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argp.add_argument("--models", type=int, default=20000)
+    argp.add_argument("--repeat", type=int, default=5)
+    argp.add_argument("--real", action="store_true")
+    argp.add_argument("--http2", action="store_true")
+    args = argp.parse_args()
+
+    configs = dict(CONFIGS)
+    if args.http2:
+        configs["http2"] = dict(compression=True, http2=True)
+
+    def run(base_url, **opts):
+        for name, clientopts in configs.items():
+            size, secs = pull(base_url, args.repeat, **opts, **clientopts)
+            print(
+                f"{name:<12} {size / args.repeat / 1e6:8.2f} MB/request   "
+                f"{secs / args.repeat * 1e3:8.1f} ms/request"
+            )
+
+    if args.real:
+        run(os.environ["SPECTRUM_URL"])
+        return
+
+    with FakeOneClickServer(args.models) as server:
+        run(server.base_url, username="bench", password="bench")
+
+
+if __name__ == "__main__":
+    main()
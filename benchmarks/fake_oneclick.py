@@ -0,0 +1,396 @@
+"""
+A local stand-in for a OneClick server, serving synthetic ModelResponseList
+XML for use by the benchmarks. `FakeOneClick` is an httpx request handler,
+for use with `httpx.MockTransport`, and `FakeOneClickServer` serves the same
+responses over HTTP on localhost.
+
+It supports the following endpoints:
+    GET  /devices           paginated, with the requested attributes, and
+                            optionally of a single landscape
+    POST /models            model searches, with filters, and model handles
+
+A model is a device if it has a device type, which every model returned by
+`generate_models` has; other models are only returned by searches without
+`<devices-only-search />`.
+    GET  /model/{mh}        a single model
+    GET  /landscapes        the landscapes holding the models
+"""
+import asyncio
+import gzip
+import random
+import string
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import httpx
+from lxml import etree
+
+from pyspectrum.index import ModelIndex
+
+NAMESPACE = "http://www.ca.com/spectrum/restful/schema/response"
+
+API_PATH = "/spectrum/restful"
+
+DEVICE_TYPE = "0x23000e"
+
+MODEL_TYPES = [
+    ("Rtr_Cisco", "Cisco IOS"),
+    ("SwCiscoIOS", "Cisco Catalyst 2960"),
+    ("Pingable", "Pingable"),
+    ("HubCat29xx", "Cisco Catalyst 3850"),
+    ("FW_Juniper", "Juniper SRX"),
+    ("Host_Device", "Linux Server"),
+]
+
+
+def generate_models(
+    count: int,
+    landscapes: int = 1,
+    extra_attrs: int = 0,
+    value_size: int = 12,
+    seed: int = 0,
+) -> List[Dict[str, str]]:
+    """
+    Synthetic device models, keyed by attribute ID, with a realistic mix of
+    the attributes requested by the client by default.
+
+    Parameters
+    ----------
+    count
+        The number of models
+    landscapes
+        The number of landscapes the models are spread across
+    extra_attrs
+        The number of additional attributes of each model, whose values are
+        random strings of `value_size` characters
+    seed
+        The seed of the random values, so that runs are comparable
+    """
+    rnd = random.Random(seed)
+    models = []
+
+    for index in range(count):
+        landscape = (index % landscapes + 1) << 24
+        mtype, dtype = MODEL_TYPES[index % len(MODEL_TYPES)]
+        model = {
+            "0x129fa": hex(landscape + index // landscapes),
+            "0x1006e": f"device-{index:06d}.example.net",
+            "0x10000": mtype,
+            "0x23000e": dtype,
+            "0x1295d": "true" if index % 10 else "false",
+            "0x12d7f": f"10.{index >> 16 & 255}.{index >> 8 & 255}."
+            f"{index & 255}",
+            "0x1000a": str(rnd.choice((0, 0, 0, 1, 2, 3, 5))),
+            "0x129e7": f"Universe:World:Site-{index % 50}",
+            "0x12adb": "Network Devices",
+            "0x1102a": str(1600000000 + index * 60),
+            "0x11620": str(1700000000 + rnd.randrange(86400)),
+        }
+        for extra in range(extra_attrs):
+            model[hex(0x500000 + extra)] = "".join(
+                rnd.choices(string.ascii_lowercase, k=value_size)
+            )
+        models.append(model)
+
+    return models
+
+
+def model_xml(model: Dict[str, str], attrs: Optional[List[str]]) -> str:
+    """ A <model> element with the requested attributes """
+    body = "".join(
+        f'<attribute id="{attr_id}">{escape(model[attr_id])}</attribute>'
+        for attr_id in (attrs if attrs is not None else model)
+        if attr_id in model
+    )
+    return f'<model mh="{model["0x129fa"]}">{body}</model>'
+
+
+def model_response_list(
+    models: List[Dict[str, str]],
+    attrs: Optional[List[str]] = None,
+    start: int = 0,
+    size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    path: str = "/devices",
+) -> bytes:
+    """
+    A ModelResponseList document of the page of `models` beginning at
+    `start`, with a link to the next page if there are more models.
+    """
+    total = len(models)
+    size = size or total
+    page = models[start : start + size]
+    more = start + size < total
+
+    link = (
+        f'<link rel="next" href="http://localhost{API_PATH}{path}?id={cursor}'
+        f'&amp;start={start + size}&amp;throttlesize={size}" '
+        'type="application/xml"/>'
+        if more
+        else ""
+    )
+    error = "" if more else ' error="EndOfResults"'
+    body = "".join(model_xml(model, attrs) for model in page)
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<model-response-list xmlns="{NAMESPACE}"{error} '
+        f'throttle="{len(page)}" total-models="{total}">'
+        f"<model-responses>{body}</model-responses>{link}"
+        "</model-response-list>"
+    ).encode()
+
+
+def _filter_dict(elem: etree.Element) -> dict:
+    """ Converts a search criteria filter element to a filter dictionary """
+    tag = etree.QName(elem).localname
+    if tag in ("and", "or", "not"):
+        return {tag: [_filter_dict(child) for child in elem]}
+    attr = elem[0]
+    return {tag: (attr.get("id"), attr.findtext("{*}value"))}
+
+
+class FakeOneClick:
+    """
+    httpx request handler which responds as a OneClick server would, from a
+    list of synthetic models.
+
+    Examples
+    --------
+        fake = FakeOneClick(generate_models(10000), latency=0.01)
+        spectrum = SpectrumClient(
+            base_url="http://oneclick",
+            username="bench",
+            password="bench",
+            transport=fake.transport(),
+        )
+    """
+
+    def __init__(
+        self,
+        models: List[Dict[str, str]],
+        latency: float = 0.0,
+        throttle: int = 100000,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        models
+            The models held, as returned by `generate_models`
+        latency
+            The number of seconds to wait before each response
+        throttle
+            The largest page size which is returned
+        """
+        self.models = models
+        self.latency = latency
+        self.throttle = throttle
+        self.requests = 0
+        self._index = None
+        self._cursors: Dict[str, tuple] = {}
+
+    def transport(self, use_async: bool = False) -> httpx.MockTransport:
+        """ Returns a transport to pass to the client """
+        return httpx.MockTransport(
+            self.handle_async if use_async else self.handle
+        )
+
+    @property
+    def index(self) -> ModelIndex:
+        if self._index is None:
+            self._index = ModelIndex(self.models, resolve_attrs=False)
+        return self._index
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        """ Responds to a request without blocking the event loop """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """ Responds to a request """
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(request)
+
+    __call__ = handle
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        path = request.url.path[len(API_PATH) :]
+        params = request.url.params
+
+        if path == "/landscapes":
+            return self._landscapes()
+
+        if path.startswith("/model/"):
+            model = self.index.get(path.rsplit("/", 1)[1])
+            models = [model] if model else []
+            return self._page(models, self._attrs(params), path=path)
+
+        if "id" in params:
+            models, attrs = self._cursors[params["id"]]
+            return self._page(
+                models,
+                attrs,
+                int(params["start"]),
+                int(params["throttlesize"]),
+                params["id"],
+                path,
+            )
+
+        if request.method == "GET" and path == "/devices":
+            size = int(params.get("throttlesize", self.throttle))
+            models = self._devices(self.models)
+            if "landscapeid" in params:
+                landscape = int(params["landscapeid"], 0)
+                models = [
+                    model
+                    for model in models
+                    if int(model["0x129fa"], 16) >> 24 << 24 == landscape
+                ]
+            return self._search(models, self._attrs(params), size, path)
+
+        if request.method == "POST" and path == "/models":
+            return self._model_request(request.read(), path)
+
+        return httpx.Response(404)
+
+    def _model_request(self, payload: bytes, path: str) -> httpx.Response:
+        """ Responds to a models search, or a request for model handles """
+        root = etree.fromstring(payload)
+        size = int(root.get("throttlesize") or 100)
+        attrs = [
+            hex(int(elem.get("id"), 16))
+            for elem in root.iter("{*}requested-attribute")
+        ]
+
+        handles = [elem.get("mh") for elem in root.iter("{*}model")]
+        if handles:
+            models = [self.index.get(handle) for handle in handles]
+            models = [model for model in models if model is not None]
+        else:
+            filtered = next(root.iter("{*}filtered-models"), None)
+            if filtered is not None and len(filtered):
+                models = self.index.filter(_filter_dict(filtered[0]))
+            else:
+                models = self.models
+            if next(root.iter("{*}devices-only-search"), None) is not None:
+                models = self._devices(models)
+
+        return self._search(models, attrs, size, path)
+
+    def _search(self, models, attrs, size, path) -> httpx.Response:
+        """ Responds with the first page of a result set """
+        size = min(size, self.throttle)
+        cursor = None
+        if size < len(models):
+            cursor = str(uuid.uuid4())
+            self._cursors[cursor] = (models, attrs)
+        return self._page(models, attrs, 0, size, cursor, path)
+
+    def _page(self, models, attrs, start=0, size=None, cursor=None, path=""):
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/xml"},
+            content=model_response_list(
+                models, attrs, start, size, cursor, path
+            ),
+        )
+
+    @staticmethod
+    def _devices(models: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """ The models which are devices """
+        return [model for model in models if DEVICE_TYPE in model]
+
+    @staticmethod
+    def _attrs(params: httpx.QueryParams) -> Optional[List[str]]:
+        """ The requested attribute IDs, as lower-case hexadecimals """
+        attrs = params.get_list("attr")
+        return [hex(int(attr, 0)) for attr in attrs] if attrs else None
+
+    def _landscapes(self) -> httpx.Response:
+        ids = sorted({int(m["0x129fa"], 16) >> 24 << 24 for m in self.models})
+        body = "".join(
+            f"<landscape><name>landscape-{n}</name><id>{hex(id_)}</id>"
+            "</landscape>"
+            for n, id_ in enumerate(ids)
+        )
+        return httpx.Response(
+            200,
+            content=(
+                f'<landscape-response xmlns="{NAMESPACE}" '
+                f'total-landscapes="{len(ids)}">{body}</landscape-response>'
+            ).encode(),
+        )
+
+
+class FakeOneClickServer:
+    """
+    Threaded HTTP server on localhost which serves the responses of a
+    `FakeOneClick`, gzip compressed if the client accepts it.
+    """
+
+    def __init__(self, fake) -> None:
+        """
+        Parameters
+        ----------
+        fake
+            A `FakeOneClick`, or the number of synthetic models to serve
+        """
+        if isinstance(fake, int):
+            fake = FakeOneClick(generate_models(fake))
+        self.fake = fake
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = httpx.Request(
+                    self.command,
+                    f"http://localhost{self.path}",
+                    headers=dict(self.headers),
+                    content=self.rfile.read(length),
+                )
+                response = fake.handle(request)
+
+                body = response.content
+                compress = "gzip" in self.headers.get("Accept-Encoding", "")
+                if compress:
+                    body = gzip.compress(body, compresslevel=1)
+
+                self.send_response(response.status_code)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(body)))
+                if compress:
+                    self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,115 @@
+"""
+Shared helpers of the benchmarks: timing, peak memory measurement, and the
+storage and comparison of results.
+
+Results are stored as JSON in benchmarks/results, named after the benchmark
+and the time of the run, together with the Python version and git commit. A
+run can be compared with an earlier one, with --compare, to show the change
+of each measurement.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+RESULTS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "results"
+)
+
+# Relative change beyond which a measurement is flagged when comparing runs
+
+THRESHOLD = 0.10
+
+
+def best_of(func: Callable, number: int = 1, repeat: int = 5) -> float:
+    """ The best time of `repeat` runs of `number` calls, per call """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def measure(func: Callable) -> Dict[str, float]:
+    """
+    Returns the elapsed seconds of a call to the function, and the peak memory
+    allocated, in MB, during a second call. Memory is traced separately, as
+    tracing slows the function considerably.
+    """
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_mb": peak / 1e6}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(
+    name: str, results: Dict[str, Dict[str, float]], output: Optional[str]
+) -> str:
+    """ Stores the results of a run, returning the file path """
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{name}-{stamp}.json")
+
+    with open(output, "w") as fh:
+        json.dump(
+            {
+                "benchmark": name,
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            fh,
+            indent=2,
+        )
+    return output
+
+
+def compare_results(
+    results: Dict[str, Dict[str, float]], baseline_path: str
+) -> None:
+    """
+    Prints the change of each measurement from an earlier run. Lower values
+    are better for every measurement.
+    """
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit')}):")
+    for case, values in results.items():
+        for metric, value in values.items():
+            before = baseline["results"].get(case, {}).get(metric)
+            if not before:
+                continue
+            change = (value - before) / before
+            flag = ""
+            if change > THRESHOLD:
+                flag = "  <-- slower" if metric != "peak_mb" else "  <-- more"
+            elif change < -THRESHOLD:
+                flag = "  improved"
+            print(
+                f"  {case:<32} {metric:<10} {before:12.6f} -> {value:12.6f}"
+                f" ({change:+.1%}){flag}"
+            )
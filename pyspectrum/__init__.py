@@ -1 +1,22 @@
-from pyspectrum.client import SpectrumClient
+from typing import TYPE_CHECKING
+
+__all__ = ["SpectrumClient", "AsyncSpectrumClient"]
+
+# The clients are imported on first access, so that importing the package, or
+# a submodule such as `pyspectrum.attributes`, does not import httpx, lxml and
+# the rest of the client
+
+if TYPE_CHECKING:
+    from pyspectrum.client import SpectrumClient, AsyncSpectrumClient
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from pyspectrum import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
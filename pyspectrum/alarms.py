@@ -0,0 +1,130 @@
+from typing import Optional, List, Dict, Iterable, AnyStr, Union
+import json
+
+
+__all__ = ["AlarmTable", "AlarmDelta"]
+
+
+class AlarmDelta:
+    """
+    The alarms raised, changed and cleared since the previous poll, each keyed
+    by alarm ID. `previous` holds the prior version of each changed alarm.
+    """
+
+    def __init__(self) -> None:
+        self.new: Dict[str, Dict[str, str]] = {}
+        self.changed: Dict[str, Dict[str, str]] = {}
+        self.previous: Dict[str, Dict[str, str]] = {}
+        self.cleared: Dict[str, Dict[str, str]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"AlarmDelta <{len(self.new)} new, {len(self.changed)} changed, "
+            f"{len(self.cleared)} cleared>"
+        )
+
+    def __len__(self) -> int:
+        return len(self.new) + len(self.changed) + len(self.cleared)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class AlarmTable:
+    """
+    A local copy of the alarms in Spectrum, keyed by alarm ID. The table is
+    updated by `SpectrumAlarmsMixin.poll_alarms`, which reports only the
+    alarms which are new, changed or cleared since the previous poll, and can
+    be saved to and loaded from a JSON file between runs.
+
+    Examples
+    --------
+        from pyspectrum.alarms import AlarmTable
+
+        alarms = AlarmTable()
+        delta = spectrum.poll_alarms(alarms, "severity >= 3")
+        for alarm_id, alarm in delta.new.items():
+            print(alarm["alarm_title"])
+    """
+
+    def __init__(self, attrs: Optional[List[Union[int, str]]] = None) -> None:
+        """
+        Parameters
+        ----------
+        attrs
+            The attributes held for each alarm. If not given, the default
+            alarm attributes of the client are used.
+        """
+        self.attrs = list(attrs or [])
+        self.alarms: Dict[str, Dict[str, str]] = {}
+
+    def __repr__(self) -> str:
+        return f"AlarmTable <{len(self.alarms)} alarms>"
+
+    def __len__(self) -> int:
+        return len(self.alarms)
+
+    def __contains__(self, alarm_id: str) -> bool:
+        return alarm_id in self.alarms
+
+    def __getitem__(self, alarm_id: str) -> Dict[str, str]:
+        return self.alarms[alarm_id]
+
+    def __iter__(self):
+        return iter(self.alarms.values())
+
+    def update(
+        self, alarms: Iterable[Dict[str, str]], delta: AlarmDelta
+    ) -> None:
+        """
+        Replaces the table with the complete set of current alarms, recording
+        each new alarm in `delta.new`, each alarm whose attributes differ in
+        `delta.changed`, and each alarm which is no longer present in
+        `delta.cleared`. The table is left unchanged if `alarms` raises.
+        """
+        current = {}
+
+        for alarm in alarms:
+            alarm_id = alarm["alarm_id"]
+            current[alarm_id] = alarm
+
+            old = self.alarms.get(alarm_id)
+            if old is None:
+                delta.new[alarm_id] = alarm
+            elif old != alarm:
+                delta.changed[alarm_id] = alarm
+                delta.previous[alarm_id] = old
+
+        for alarm_id, alarm in self.alarms.items():
+            if alarm_id not in current:
+                delta.cleared[alarm_id] = alarm
+
+        self.alarms = current
+
+    # -------------------------------------------------------------------------
+    #                      Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, filepath: AnyStr) -> None:
+        """ Saves the table to a JSON file """
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"attrs": self.attrs, "alarms": list(self.alarms.values())},
+                fh,
+            )
+
+    @classmethod
+    def load(cls, filepath: AnyStr) -> "AlarmTable":
+        """
+        Loads a table from a JSON file, or returns a new empty table if the
+        file does not exist.
+        """
+        try:
+            with open(filepath, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return cls()
+
+        table = cls(data["attrs"])
+        table.alarms = {alarm["alarm_id"]: alarm for alarm in data["alarms"]}
+        return table
@@ -1,31 +1,105 @@
-from httpx import Client, Timeout
+from httpx import AsyncClient, Client, Limits, Timeout
 
 
-__all__ = ["SpectrumSession"]
+__all__ = ["SpectrumSession", "AsyncSpectrumSession"]
 
 
-class SpectrumSession(Client):
+class _SpectrumSessionMixin:
     """
-    Low-level instance to interact with the Spectrum API via REST calls.
+    Common initialisation shared by the synchronous and asyncio sessions
     """
 
     API_DEFAULT_TIMEOUT = Timeout(5.0, read=60.0)
     API_DEFAULT_VERIFY = False
 
+    # Connection pool defaults
+
+    API_DEFAULT_MAX_CONNECTIONS = 100
+    API_DEFAULT_MAX_KEEPALIVE = 20
+    API_DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
     def __init__(self, base_url: str, *args, **kwargs) -> None:
         """
-        Initialize the client session with the Spectrum API
+        Initialize the client session with the Spectrum API.
+
+        In addition to the `httpx` client options, the following options are
+        supported:
+
+        max_connections
+            Maximum number of concurrent connections to the server
+        max_keepalive_connections
+            Maximum number of idle connections kept open for reuse
+        keepalive_expiry
+            Seconds after which an idle connection is closed
+        http2
+            Use HTTP/2 if the server supports it. This requires the `h2`
+            package, e.g. `pip install httpx[http2]`
+        compression
+            Request compressed responses from the server (default True). The
+            ModelResponseList XML typically compresses by around 10x. This is
+            the `httpx` default, which accepts gzip and deflate, and brotli or
+            zstd if installed; set False to request uncompressed responses.
+
+        The connection pool options cannot be combined with the `httpx`
+        `limits` option, which sets all of them.
         """
 
         kwargs.setdefault("verify", self.API_DEFAULT_VERIFY)
 
+        pool_opts = {
+            name: kwargs.pop(name)
+            for name in (
+                "max_connections",
+                "max_keepalive_connections",
+                "keepalive_expiry",
+            )
+            if name in kwargs
+        }
+
+        limits = kwargs.pop("limits", None)
+        if limits is None:
+            limits = Limits(
+                max_connections=pool_opts.get(
+                    "max_connections", self.API_DEFAULT_MAX_CONNECTIONS
+                ),
+                max_keepalive_connections=pool_opts.get(
+                    "max_keepalive_connections", self.API_DEFAULT_MAX_KEEPALIVE
+                ),
+                keepalive_expiry=pool_opts.get(
+                    "keepalive_expiry", self.API_DEFAULT_KEEPALIVE_EXPIRY
+                ),
+            )
+        elif pool_opts:
+            raise ValueError(
+                "The limits option cannot be combined with "
+                f"{', '.join(pool_opts)}"
+            )
+
+        compression = kwargs.pop("compression", True)
+
         super().__init__(
             base_url=str(base_url),
             timeout=kwargs.pop("timeout", self.API_DEFAULT_TIMEOUT),
             proxies=kwargs.pop("proxies", {"all://": None}),
+            limits=limits,
             *args,
             **kwargs,
         )
 
         self.headers["Content-Type"] = "application/xml"
         self.headers["Accept"] = "application/xml"
+        if not compression:
+            self.headers["Accept-Encoding"] = "identity"
+
+
+class SpectrumSession(_SpectrumSessionMixin, Client):
+    """
+    Low-level instance to interact with the Spectrum API via REST calls.
+    """
+
+
+class AsyncSpectrumSession(_SpectrumSessionMixin, AsyncClient):
+    """
+    Low-level instance to interact with the Spectrum API via asyncio REST
+    calls.
+    """
@@ -1,4 +1,14 @@
 from enum import IntEnum
+from typing import Dict, Set, Union
+
+
+__all__ = [
+    "SpectrumModelAttributes",
+    "SpectrumAlarmAttributes",
+    "attr_name_to_id",
+    "attr_id_to_name",
+    "register_attribute",
+]
 
 
 def attr_name_to_id(attr_name: str) -> int:
@@ -7,27 +17,74 @@ def attr_name_to_id(attr_name: str) -> int:
     found, the name is assumed to be a hexadecimal (as string), and is therefore
     returned as an integer type. Otherwise, the lookup fails.
     """
+    attr_id = _NAME_TO_ID.get(str(attr_name).lower())
+    if attr_id is not None:
+        return attr_id
+
     try:
-        return SpectrumModelAttributes[attr_name.upper()].value
-    except KeyError:
-        try:
-            return int(str(attr_name), 0)
-        except ValueError:
-            raise ValueError(
-                f"'{attr_name}' is not a recognised Spectrum attribute name or "
-                f"valid ID."
-            )
-
-
-def attr_id_to_name(attr_id: int) -> str:
+        return int(str(attr_name), 0)
+    except ValueError:
+        raise ValueError(
+            f"'{attr_name}' is not a recognised Spectrum attribute name or "
+            f"valid ID."
+        )
+
+
+def attr_id_to_name(attr_id: Union[int, str]) -> str:
     """
     Attempts to match the attribute ID to the corresponding name. If no match
     found, the ID is returned as a hexadecimal in string format.
     """
-    try:
-        return SpectrumModelAttributes(int(attr_id, 0)).name.lower()
-    except ValueError:
-        return hex(int(attr_id, 0))
+
+    # Attribute IDs in a response are lower-case hexadecimal strings, which
+    # will almost always be found in the lookup table
+    attr_name = _HEX_TO_NAME.get(attr_id)
+    if attr_name is not None:
+        return attr_name
+    if attr_id in _UNKNOWN_HEX:
+        return attr_id
+
+    value = attr_id if isinstance(attr_id, int) else int(attr_id, 0)
+    attr_name = _ID_TO_NAME.get(value)
+    if attr_name is not None:
+        return attr_name
+
+    # Remember unrecognised IDs, so they are only converted once, up to a
+    # limit so that a stream of arbitrary IDs cannot grow the set unbounded
+    attr_name = hex(value)
+    if attr_id == attr_name and len(_UNKNOWN_HEX) < UNKNOWN_HEX_LIMIT:
+        _UNKNOWN_HEX.add(attr_id)
+
+    return attr_name
+
+
+def register_attribute(attr_name: str, attr_id: int) -> None:
+    """
+    Adds an attribute name to ID mapping to the lookup tables, so that it can
+    be used when requesting attributes and applying filters, and is resolved in
+    parsed responses.
+
+    Examples
+    --------
+        from pyspectrum.attributes import register_attribute
+        register_attribute("sys_contact", 0x1102D)
+    """
+    attr_name = attr_name.lower()
+
+    # Remove the mappings which the new one replaces, so that the old name
+    # no longer maps to the ID, nor the old ID to the name
+    old_name = _ID_TO_NAME.get(attr_id)
+    if old_name is not None and _NAME_TO_ID.get(old_name) == attr_id:
+        del _NAME_TO_ID[old_name]
+    old_id = _NAME_TO_ID.get(attr_name)
+    if old_id is not None and _ID_TO_NAME.get(old_id) == attr_name:
+        del _ID_TO_NAME[old_id]
+        del _HEX_TO_NAME[hex(old_id)]
+
+    _NAME_TO_ID[attr_name] = attr_id
+    _ID_TO_NAME[attr_id] = attr_name
+    _HEX_TO_NAME[hex(attr_id)] = attr_name
+    _UNKNOWN_HEX.discard(hex(attr_id))
 
 
 class SpectrumModelAttributes(IntEnum):
@@ -59,3 +116,40 @@ class SpectrumModelAttributes(IntEnum):
 
     def __repr__(self) -> str:
         return f"{str(self.name).lower()}: {hex(self.value)}"
+
+
+class SpectrumAlarmAttributes(IntEnum):
+    """ Alarm attribute name to ID mappings """
+
+    ACKNOWLEDGED = 0x11F4D
+    ALARM_ID = 0x11F9C
+    ALARM_STATUS = 0x11F4F
+    ALARM_TITLE = 0x12B4C
+    CAUSE_CODE = 0x11F50
+    CREATION_DATE = 0x11F4E
+    OCCURRENCES = 0x11FC5
+    SEVERITY = 0x11F56
+    TROUBLE_TICKET_ID = 0x12022
+
+    __str__ = SpectrumModelAttributes.__str__
+    __repr__ = SpectrumModelAttributes.__repr__
+
+
+# Lookup tables, by name, ID and hexadecimal ID string, which are built from
+# SpectrumModelAttributes and SpectrumAlarmAttributes, and may be extended
+# with `register_attribute`
+
+_NAME_TO_ID: Dict[str, int] = {}
+_ID_TO_NAME: Dict[int, str] = {}
+_HEX_TO_NAME: Dict[str, str] = {}
+
+# Unrecognised hexadecimal ID strings seen in responses, and the most held
+
+_UNKNOWN_HEX: Set[str] = set()
+
+UNKNOWN_HEX_LIMIT = 4096
+
+for _attr in (*SpectrumModelAttributes, *SpectrumAlarmAttributes):
+    register_attribute(_attr.name, _attr.value)
+
+del _attr
@@ -1,13 +1,31 @@
 from pyspectrum.consts import ENV
 from pyspectrum.attributes import attr_name_to_id
-from pyspectrum.api import SpectrumSession
-from pyspectrum.responses import SpectrumLandscapeResponse
+from pyspectrum.api import SpectrumSession, AsyncSpectrumSession
+from pyspectrum.responses import (
+    SpectrumLandscapeResponse,
+    SpectrumFanoutResult,
+)
 from os import environ, getenv
 from typing import Optional, AnyStr, DefaultDict, List, Dict, Union
+from typing import Callable, Iterator, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
+from contextvars import ContextVar
+from httpx import Response, TransportError, HTTPStatusError
+import time
 from dataclasses import dataclass
 
+# asyncio is only imported once an asyncio client is used, and the modules
+# of the optional client features once the feature is used
+if TYPE_CHECKING:
+    import asyncio
 
-__all__ = ["SpectrumBaseClient"]
+
+__all__ = ["SpectrumBaseClient", "AsyncSpectrumBaseClient"]
+
+# Set while requests must see live data, such as during an inventory sync, so
+# that they are neither served from nor stored in the response cache
+
+_CACHE_BYPASS: ContextVar[bool] = ContextVar("cache_bypass", default=False)
 
 
 @dataclass
@@ -22,6 +40,8 @@ class SpectrumBaseClient:
 
     API_PATH = "/spectrum/restful"
     API_THROTTLE = 9999
+    API_RETRIES = 3
+    SESSION_CLASS = SpectrumSession
 
     def __init__(
         self,
@@ -33,18 +53,75 @@ class SpectrumBaseClient:
         **clientopts,
     ) -> None:
         """
-        Initialize the base client
+        Initialize the base client.
+
+        Requests which fail with a transient error are retried according to
+        the `retries` client option, either a number of retries or a
+        `RetryPolicy`. The request rate can be limited with the `rate_limit`
+        client option, either a number of requests per second or a
+        `TokenBucket`, which may be shared with other clients.
+
+        Responses are cached if the `cache` client option is given, either
+        True to use an in-memory cache with the default settings, or a
+        `SpectrumResponseCache` instance.
+
+        Requests and responses are instrumented if the `hooks` client option
+        is given, either a `SpectrumHooks` instance, such as `SpectrumMetrics`,
+        or a list of instances.
+
+        The pages of paginated responses are parsed in worker processes if
+        the `parse_pool` client option is given, either True to use a worker
+        per CPU, the number of workers, or a `SpectrumParsePool`, which may be
+        shared with other clients.
         """
 
         # API Throttle - Largest number of results to return in single request
         self.api_throttle = clientopts.pop("api_throttle", self.API_THROTTLE)
 
+        # Retry policy for failed requests, and optional request rate limiter
+        from pyspectrum.retry import RetryPolicy, TokenBucket
+
+        self.retry = RetryPolicy.coerce(
+            clientopts.pop("retries", self.API_RETRIES)
+        )
+        self.rate_limit = TokenBucket.coerce(
+            clientopts.pop("rate_limit", None)
+        )
+
+        # Optional cache of responses
+        self.cache = clientopts.pop("cache", None)
+        if self.cache is False:
+            self.cache = None
+        elif self.cache is True:
+            from pyspectrum.cache import SpectrumResponseCache
+
+            self.cache = SpectrumResponseCache()
+
+        # Optional instrumentation hooks, called as requests are made
+        self.hooks = clientopts.pop("hooks", None)
+        if self.hooks is not None:
+            from pyspectrum.metrics import SpectrumHooks
+
+            self.hooks = SpectrumHooks.coerce(self.hooks)
+
+        # Optional pool of worker processes to parse pages. A pool created by
+        # the client is closed with the client.
+        self.parse_pool = clientopts.pop("parse_pool", None)
+        self._owns_parse_pool = False
+        if self.parse_pool is not None:
+            from pyspectrum.parallel import SpectrumParsePool
+
+            self._owns_parse_pool = not isinstance(
+                self.parse_pool, SpectrumParsePool
+            )
+            self.parse_pool = SpectrumParsePool.coerce(self.parse_pool)
+
         # Error will be thrown is base_url not present in either args or env
         base_url = base_url or environ[ENV.base_url]
         username = username or getenv(ENV.username)
         password = password or getenv(ENV.password)
 
-        self.api = SpectrumSession(
+        self.api = self.SESSION_CLASS(
             base_url=base_url + self.API_PATH,
             auth=(username, password),
             **clientopts,
@@ -68,6 +145,7 @@ class SpectrumBaseClient:
         Gracefully close the httpx.Client object when exiting Context Manager
         """
         self.api.close()
+        self._close_parse_pool()
 
     def __repr__(self):
         """ override the default repr to show the Spectrum base URL """
@@ -78,6 +156,12 @@ class SpectrumBaseClient:
     def close(self):
         """ Gracefully close the httpx.Client object """
         self.api.close()
+        self._close_parse_pool()
+
+    def _close_parse_pool(self):
+        """ Stops the parse pool worker processes, if started by the client """
+        if self.parse_pool is not None and self._owns_parse_pool:
+            self.parse_pool.close()
 
     @staticmethod
     def _normalize_attrs(attrs: List[Union[int, str]]) -> List[str]:
@@ -105,8 +189,350 @@ class SpectrumBaseClient:
             self.__class__.__name__, (self.__class__, *mixin_cls), {}
         )
 
+    def _send(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request, or return the cached response if it is held in the
+        response cache and has not expired.
+        """
+        key, res = self._cache_lookup(method, url, kwargs)
+        if res is not None:
+            return res
+
+        try:
+            res = self._request(method, url, **kwargs)
+        except HTTPStatusError as exc:
+            if key is None or exc.response.status_code != 304:
+                raise
+            return self.cache.refresh(key)
+
+        if key is not None:
+            self.cache.put(key, res)
+        return res
+
+    @contextmanager
+    def _uncached(self) -> Iterator[None]:
+        """
+        Requests sent within the context bypass the response cache. The
+        context is held per thread and per asyncio task.
+        """
+        token = _CACHE_BYPASS.set(True)
+        try:
+            yield
+        finally:
+            _CACHE_BYPASS.reset(token)
+
+    def _cache_lookup(
+        self, method: str, url: str, kwargs: dict
+    ) -> Tuple[Optional[str], Optional[Response]]:
+        """
+        Returns the cache key of a request, or None if the response is not to
+        be cached, and the cached response if it has not expired. If an expired
+        response can be refreshed with a conditional request, the conditional
+        headers are added to the request `kwargs`.
+        """
+        if self.cache is None or _CACHE_BYPASS.get():
+            return None, None
+
+        params = kwargs.get("params")
+        if not self.cache.is_cacheable(method, url, params):
+            return None, None
+
+        key = self.cache.key(
+            self.api.base_url, method, url, params, kwargs.get("content")
+        )
+        res = self.cache.get(key)
+        if res is None:
+            validators = self.cache.validators(key)
+            if validators:
+                kwargs["headers"] = {
+                    **kwargs.get("headers", {}),
+                    **validators,
+                }
+
+        return key, res
+
+    def _request(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request, subject to the rate limit, retrying it according to
+        the retry policy and raising an exception for any error response.
+        """
+        attempt = 0
+
+        while True:
+            if self.rate_limit:
+                self.rate_limit.acquire()
+
+            start = time.perf_counter()
+            try:
+                res = self.api.request(method, url, **kwargs)
+            except TransportError as exc:
+                self._on_request(method, url, None, start, exc)
+                if not self.retry.should_retry(method, url, attempt, exc=exc):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                self._on_request(method, url, res, start)
+                if not self.retry.should_retry(
+                    method, url, attempt, response=res
+                ):
+                    res.raise_for_status()
+                    return res
+                delay = self.retry.delay(attempt, res)
+
+            attempt += 1
+            time.sleep(delay)
+
+    @contextmanager
+    def _stream(self, method: str, url: str, **kwargs) -> Iterator[Response]:
+        """
+        Send a request and stream the response, as per `_send`. Only the
+        request is retried; an error while reading the response body is
+        raised to the caller.
+        """
+        attempt = 0
+
+        while True:
+            if self.rate_limit:
+                self.rate_limit.acquire()
+
+            start = time.perf_counter()
+            try:
+                res = self.api.send(
+                    self.api.build_request(method, url, **kwargs), stream=True
+                )
+            except TransportError as exc:
+                self._on_request(method, url, None, start, exc)
+                if not self.retry.should_retry(method, url, attempt, exc=exc):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if not self.retry.should_retry(
+                    method, url, attempt, response=res
+                ):
+                    break
+                res.close()
+                self._on_request(method, url, res, start)
+                delay = self.retry.delay(attempt, res)
+
+            attempt += 1
+            time.sleep(delay)
+
+        # The response is reported once its body has been read, so that the
+        # number of bytes received is known, with the time to its headers
+        elapsed = time.perf_counter() - start
+        try:
+            res.raise_for_status()
+            yield res
+        finally:
+            res.close()
+            if self.hooks is not None:
+                self.hooks.on_request(method, url, res, elapsed)
+
+    def _on_request(
+        self,
+        method: str,
+        url: str,
+        res: Optional[Response],
+        start: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """ Reports a request attempt which began at `start` to the hooks """
+        if self.hooks is not None:
+            self.hooks.on_request(
+                method, url, res, time.perf_counter() - start, error
+            )
+
     def get_landscapes(self) -> SpectrumLandscapeResponse:
         """ Gets the Landscape IDs """
-        res = self.api.get(url=URIs.landscapes)
-        res.raise_for_status()
-        return SpectrumLandscapeResponse(res)
+        res = self._send("GET", URIs.landscapes)
+        return SpectrumLandscapeResponse(res, hooks=self.hooks)
+
+    def _fan_out_landscapes(
+        self,
+        func: Callable,
+        landscapes: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> SpectrumFanoutResult:
+        """
+        Calls `func(landscape_id)` for each landscape concurrently, using a
+        thread pool, and collects the responses and failures per landscape.
+        If no landscapes are given, all landscapes are used.
+        """
+
+        if landscapes is None:
+            landscapes = [
+                landscape["id"] for landscape in self.get_landscapes().result
+            ]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        fanout = SpectrumFanoutResult(tag="landscape")
+
+        with ThreadPoolExecutor(max_workers or len(landscapes) or 1) as pool:
+            futures = {
+                landscape: pool.submit(func, landscape)
+                for landscape in landscapes
+            }
+
+            for landscape, future in futures.items():
+                try:
+                    fanout.responses[landscape] = future.result()
+                except Exception as exc:
+                    fanout.errors[landscape] = exc
+
+        return fanout
+
+
+class AsyncSpectrumBaseClient(SpectrumBaseClient):
+    """
+    Spectrum asyncio base class. Requests are issued over a single
+    `httpx.AsyncClient` connection pool, with at most `max_concurrency`
+    requests in flight at any one time.
+    """
+
+    SESSION_CLASS = AsyncSpectrumSession
+    MAX_CONCURRENCY = 10
+
+    def __init__(self, /, *mixin_classes, **clientopts) -> None:
+        """
+        Initialize the asyncio base client
+        """
+
+        # Maximum number of concurrent requests to the Spectrum API
+        self.max_concurrency = clientopts.pop(
+            "max_concurrency", self.MAX_CONCURRENCY
+        )
+
+        # The semaphore is created on first use so that it is bound to the
+        # running event loop
+        self._semaphore = None
+
+        super().__init__(*mixin_classes, **clientopts)
+
+    def __enter__(self):
+        """
+        The asyncio client must be closed with `await`, and so is only a
+        context manager with `async with`
+        """
+        raise TypeError(
+            f"{self.__class__.__name__} must be used with 'async with'"
+        )
+
+    async def __aenter__(self):
+        """ Returns self when using Async Context Manager """
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        """
+        Gracefully close the httpx.AsyncClient object when exiting Async
+        Context Manager
+        """
+        await self.close()
+
+    async def close(self):
+        """ Gracefully close the httpx.AsyncClient object """
+        await self.api.aclose()
+        self._close_parse_pool()
+
+    @property
+    def semaphore(self) -> "asyncio.Semaphore":
+        """ Semaphore used to limit the number of concurrent requests """
+        if self._semaphore is None:
+            import asyncio
+
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _send(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request, or return the cached response if it is held in the
+        response cache and has not expired.
+        """
+        key, res = self._cache_lookup(method, url, kwargs)
+        if res is not None:
+            return res
+
+        try:
+            res = await self._request(method, url, **kwargs)
+        except HTTPStatusError as exc:
+            if key is None or exc.response.status_code != 304:
+                raise
+            return self.cache.refresh(key)
+
+        if key is not None:
+            self.cache.put(key, res)
+        return res
+
+    async def _request(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request once a concurrency slot is available, subject to the
+        rate limit, retrying it according to the retry policy and raising an
+        exception for any error response. The concurrency slot is released
+        while waiting to retry.
+        """
+        import asyncio
+
+        attempt = 0
+
+        while True:
+            if self.rate_limit:
+                await self.rate_limit.acquire_async()
+
+            try:
+                async with self.semaphore:
+                    start = time.perf_counter()
+                    res = await self.api.request(method, url, **kwargs)
+            except TransportError as exc:
+                self._on_request(method, url, None, start, exc)
+                if not self.retry.should_retry(method, url, attempt, exc=exc):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                self._on_request(method, url, res, start)
+                if not self.retry.should_retry(
+                    method, url, attempt, response=res
+                ):
+                    res.raise_for_status()
+                    return res
+                delay = self.retry.delay(attempt, res)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get_landscapes(self) -> SpectrumLandscapeResponse:
+        """ Gets the Landscape IDs """
+        res = await self._send("GET", URIs.landscapes)
+        return SpectrumLandscapeResponse(res, hooks=self.hooks)
+
+    async def _fan_out_landscapes(
+        self,
+        func: Callable,
+        landscapes: Optional[List[str]] = None,
+    ) -> SpectrumFanoutResult:
+        """
+        Awaits `func(landscape_id)` for each landscape concurrently, and
+        collects the responses and failures per landscape. If no landscapes
+        are given, all landscapes are used.
+        """
+        import asyncio
+
+        if landscapes is None:
+            landscapes = [
+                landscape["id"]
+                for landscape in (await self.get_landscapes()).result
+            ]
+
+        fanout = SpectrumFanoutResult(tag="landscape")
+
+        results = await asyncio.gather(
+            *(func(landscape) for landscape in landscapes),
+            return_exceptions=True,
+        )
+
+        for landscape, result in zip(landscapes, results):
+            if isinstance(result, Exception):
+                fanout.errors[landscape] = result
+            else:
+                fanout.responses[landscape] = result
+
+        return fanout
@@ -0,0 +1,369 @@
+from httpx import Request, Response, QueryParams
+from typing import Optional, Dict, Tuple, NamedTuple, AnyStr, Any
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import json
+import time
+
+
+__all__ = ["SpectrumResponseCache", "SqliteResponseCache", "CacheInfo"]
+
+
+class CacheInfo(NamedTuple):
+    """ Response cache statistics """
+
+    hits: int
+    misses: int
+    revalidated: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+
+class SpectrumResponseCache:
+    """
+    In-memory LRU cache of API responses, each held for a time-to-live which
+    may be set per endpoint. Responses are keyed by the request method, URL,
+    query parameters and payload.
+
+    Only requests which read data are cached: GET requests and model searches.
+    The pages of a paginated response are not cached, as the result set which
+    they refer to is only held by the server for a short time.
+
+    When a response has expired, it is retained so that it can be refreshed
+    with a conditional request if the server provided an `ETag` or
+    `Last-Modified` header. A `304 Not Modified` response then renews the
+    cached response without transferring it again.
+
+    Examples
+    --------
+        from pyspectrum.cache import SpectrumResponseCache
+
+        cache = SpectrumResponseCache(ttl=60, ttls={"/model": 10})
+        spectrum = SpectrumClient(cache=cache)
+
+        spectrum.get_all_devices()
+        spectrum.get_all_devices()      # served from the cache
+        print(cache.info())
+
+        cache.invalidate("/devices")
+    """
+
+    DEFAULT_TTL = 60.0
+    DEFAULT_MAXSIZE = 256
+
+    # POST endpoints which only search and so can be cached
+
+    SEARCH_PATHS = ("/models",)
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        ttls: Optional[Dict[str, float]] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        ttl
+            The number of seconds for which a response is used
+        ttls
+            The time-to-live of specific endpoints, such as "/devices",
+            "/model" or "/models", overriding `ttl`. A time-to-live of zero
+            disables caching of that endpoint.
+        maxsize
+            The maximum number of responses held, after which the least
+            recently used response is discarded
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.maxsize = maxsize
+        self.hits = self.misses = self.revalidated = self.evictions = 0
+        self._entries: Dict[str, Tuple] = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__} <{self.info()}>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------------------------------------------------------
+    #                      Cache Interface
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def endpoint(path: str) -> str:
+        """
+        Returns the endpoint of a request path, either relative to the API
+        root or absolute, e.g. "/model" for "/spectrum/restful/model/0x1"
+        """
+        root = path.find("/restful/")
+        if root >= 0:
+            path = path[root + len("/restful") :]
+        return "/" + path.lstrip("/").split("/", 1)[0]
+
+    def ttl_for(self, path: str) -> float:
+        """ Returns the time-to-live of responses to a request path """
+        return self.ttls.get(self.endpoint(path), self.ttl)
+
+    def is_cacheable(
+        self, method: str, path: str, params: Optional[Any] = None
+    ) -> bool:
+        """ Returns True if the response to the request may be cached """
+        if method == "POST":
+            if self.endpoint(path) not in self.SEARCH_PATHS:
+                return False
+        elif method != "GET":
+            return False
+
+        # Requests for subsequent pages identify the paginated result set
+        if params and "id" in params:
+            return False
+
+        return self.ttl_for(path) > 0
+
+    @staticmethod
+    def key(
+        base_url: str,
+        method: str,
+        path: str,
+        params: Optional[Any] = None,
+        content: Optional[bytes] = None,
+    ) -> str:
+        """
+        Returns the cache key of a request, from the server, method, path,
+        query parameters and payload
+        """
+        digest = hashlib.sha1(f"{method} {base_url} {path}".encode())
+        if params:
+            items = sorted(QueryParams(params).multi_items())
+            digest.update(repr(items).encode())
+        if content:
+            digest.update(
+                content if isinstance(content, bytes) else content.encode()
+            )
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Response]:
+        """
+        Returns the cached response for the key, or None if there is no
+        response or it has expired.
+        """
+        entry = self._load(key)
+        if entry is None or entry[0] < time.time():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """
+        Returns the headers for a conditional request to refresh an expired
+        response, if the server provided an `ETag` or `Last-Modified` header.
+        """
+        entry = self._load(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if "ETag" in entry[1].headers:
+            headers["If-None-Match"] = entry[1].headers["ETag"]
+        if "Last-Modified" in entry[1].headers:
+            headers["If-Modified-Since"] = entry[1].headers["Last-Modified"]
+        return headers
+
+    def put(self, key: str, response: Response) -> None:
+        """ Caches a successful response """
+        if response.status_code != 200 or b'rel="next"' in response.content:
+            return
+
+        expires = time.time() + self.ttl_for(response.request.url.path)
+        self._store(key, (expires, response))
+
+    def refresh(self, key: str) -> Optional[Response]:
+        """
+        Renews an expired response following a `304 Not Modified` response to
+        a conditional request, and returns it.
+        """
+        entry = self._load(key)
+        if entry is None:
+            return None
+
+        self.revalidated += 1
+        expires = time.time() + self.ttl_for(entry[1].request.url.path)
+        self._store(key, (expires, entry[1]))
+        return entry[1]
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        """
+        Removes the cached responses of an endpoint, such as "/devices", or
+        of all endpoints, returning the number of responses removed.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, (_, response) in self._entries.items()
+                if endpoint is None
+                or self.endpoint(response.request.url.path) == endpoint
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """ Removes all cached responses and resets the statistics """
+        self.invalidate()
+        self.hits = self.misses = self.revalidated = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """ Returns the cache statistics """
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.revalidated,
+            self.evictions,
+            len(self),
+            self.maxsize,
+        )
+
+    # -------------------------------------------------------------------------
+    #                      Storage
+    # -------------------------------------------------------------------------
+
+    def _load(self, key: str) -> Optional[Tuple[float, Response]]:
+        """ Returns the (expiry, response) entry of a key """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, entry: Tuple[float, Response]) -> None:
+        """ Stores the (expiry, response) entry of a key """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+class SqliteResponseCache(SpectrumResponseCache):
+    """
+    Response cache held in an SQLite database, so that cached responses are
+    shared between processes and retained between runs.
+
+    Examples
+    --------
+        from pyspectrum.cache import SqliteResponseCache
+        spectrum = SpectrumClient(cache=SqliteResponseCache("spectrum.db"))
+    """
+
+    DEFAULT_MAXSIZE = 4096
+
+    def __init__(
+        self,
+        filepath: AnyStr,
+        ttl: float = SpectrumResponseCache.DEFAULT_TTL,
+        ttls: Optional[Dict[str, float]] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        filepath
+            The SQLite database file, which is created if it does not exist
+        ttl, ttls, maxsize
+            As per `SpectrumResponseCache`
+        """
+        import sqlite3
+
+        super().__init__(ttl, ttls, maxsize)
+        self.filepath = filepath
+        self._db = sqlite3.connect(filepath, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT, expires REAL, used REAL, "
+            "method TEXT, url TEXT, status INTEGER, headers TEXT, "
+            "content BLOB)"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            cur = self._db.execute("SELECT COUNT(*) FROM responses")
+            return cur.fetchone()[0]
+
+    def close(self) -> None:
+        """ Closes the database """
+        self._db.close()
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        with self._lock, self._db:
+            if endpoint is None:
+                cur = self._db.execute("DELETE FROM responses")
+            else:
+                cur = self._db.execute(
+                    "DELETE FROM responses WHERE endpoint = ?", (endpoint,)
+                )
+            return cur.rowcount
+
+    def _load(self, key: str) -> Optional[Tuple[float, Response]]:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT expires, method, url, status, headers, content "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._db.execute(
+                "UPDATE responses SET used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        expires, method, url, status, headers, content = row
+        response = Response(
+            status,
+            headers=json.loads(headers),
+            content=content,
+            request=Request(method, url),
+        )
+        return expires, response
+
+    def _store(self, key: str, entry: Tuple[float, Response]) -> None:
+        expires, response = entry
+
+        # The content is held decoded, so any encoding headers are discarded
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in ("content-encoding", "content-length")
+        ]
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    self.endpoint(response.request.url.path),
+                    expires,
+                    time.time(),
+                    response.request.method,
+                    str(response.request.url),
+                    response.status_code,
+                    json.dumps(headers),
+                    response.content,
+                ),
+            )
+            cur = self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM "
+                "responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+            self.evictions += cur.rowcount
@@ -1,8 +1,12 @@
-import csv
-from pyspectrum.mixins.models import SpectrumModelsMixin
-from typing import AnyStr, List, Dict, Optional
+from pyspectrum.attributes import attr_id_to_name
+from pyspectrum.export import write_csv, write_jsonl
+from pyspectrum.mixins.models import (
+    SpectrumModelsMixin,
+    AsyncSpectrumModelsMixin,
+)
+from typing import AnyStr, List, Dict, Iterable, Optional, Union
 
-__all__ = ["SpectrumClient"]
+__all__ = ["SpectrumClient", "AsyncSpectrumClient"]
 
 
 class SpectrumClient(SpectrumModelsMixin):
@@ -36,8 +40,10 @@ class SpectrumClient(SpectrumModelsMixin):
         """
         This method will store the given list of dict items to a CSV file.  The
         CSV column headers will be taken from the first list item keys.  The
-        `exclude` list can be used to omit designated columns from the CSV file,
-        for example ['model_type_id'] would omit the 'model_type_id' column.
+        `exclude` list can be used to omit designated columns from the CSV
+        file, for example ['model_type_id'] would omit the 'model_type_id'
+        column. The list items are not modified. A ValueError is raised for
+        an item with keys which are neither columns nor excluded.
 
         Parameters
         ----------
@@ -46,20 +52,137 @@ class SpectrumClient(SpectrumModelsMixin):
         exclude
         orderby
         """
-        fieldnames = datalist[0].keys()
+        write_csv(
+            datalist,
+            filepath,
+            exclude=exclude,
+            orderby=orderby,
+            extrasaction="raise",
+        )
 
-        if exclude:
-            fieldnames = [col for col in fieldnames if col not in exclude]
-            for rec in datalist:
-                for key in exclude:
-                    del rec[key]
+    def export_csv(
+        self,
+        models: Iterable[Dict],
+        filepath: AnyStr,
+        attrs: Optional[List[Union[int, str]]] = None,
+        exclude: Optional[List[str]] = None,
+        orderby: Optional[str] = None,
+        resolve_attrs: bool = True,
+    ) -> int:
+        """
+        This method will write each model to a CSV file as it is received from
+        the given iterable, for example directly from `iter_all_devices`, so
+        the complete list of models is never held in memory. The models are
+        not modified. Returns the number of models written.
+
+        Parameters
+        ----------
+        models
+            Iterable of parsed model dictionaries
+        filepath
+            The path of the CSV file
+        attrs
+            The attributes requested for the models. The CSV column headers
+            are derived from these, otherwise from the first model keys.
+        exclude
+            Columns to omit from the CSV file
+        orderby
+            Column to sort the rows by. Large exports are sorted using
+            temporary files rather than in memory.
+        resolve_attrs
+            Whether the attribute IDs were resolved to names in the models
+        """
+        return write_csv(
+            models,
+            filepath,
+            fieldnames=self._attr_fieldnames(attrs, resolve_attrs),
+            exclude=exclude,
+            orderby=orderby,
+        )
 
-        if orderby in fieldnames:
-            datalist = sorted(datalist, key=lambda d: d[orderby].lower())
+    def export_jsonl(
+        self,
+        models: Iterable[Dict],
+        filepath: AnyStr,
+        attrs: Optional[List[Union[int, str]]] = None,
+        exclude: Optional[List[str]] = None,
+        orderby: Optional[str] = None,
+        resolve_attrs: bool = True,
+    ) -> int:
+        """
+        This method will write each model to a JSON lines file as it is
+        received from the given iterable. The parameters are as per
+        `export_csv`. Returns the number of models written.
+        """
+        return write_jsonl(
+            models,
+            filepath,
+            fieldnames=self._attr_fieldnames(attrs, resolve_attrs),
+            exclude=exclude,
+            orderby=orderby,
+        )
 
-        with open(filepath, "w+", newline="") as outfile:
-            csv_wr = csv.DictWriter(
-                outfile, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC
+    def export_snapshot(
+        self,
+        models: Iterable[Dict],
+        filepath: AnyStr,
+        attrs: Optional[List[Union[int, str]]] = None,
+        resolve_attrs: bool = True,
+    ) -> int:
+        """
+        This method will write the models to a binary snapshot file, which can
+        be opened with `SpectrumSnapshot` to look up models by handle without
+        reading the whole file. The parameters are as per `export_csv`.
+        Returns the number of models written.
+
+        Examples
+        --------
+            spectrum.export_snapshot(
+                spectrum.iter_all_devices(page_size=5000), "inventory.snap"
             )
-            csv_wr.writeheader()
-            csv_wr.writerows(datalist)
\ No newline at end of file
+        """
+        from pyspectrum.snapshot import write_snapshot
+
+        return write_snapshot(
+            models,
+            filepath,
+            fieldnames=self._attr_fieldnames(attrs, resolve_attrs),
+        )
+
+    def _attr_fieldnames(
+        self, attrs: Optional[List[Union[int, str]]], resolve_attrs: bool
+    ) -> Optional[List[str]]:
+        """
+        Returns the keys of the parsed models for the requested attributes, in
+        the order they are requested.
+        """
+        if not attrs:
+            return None
+
+        attr_ids = [
+            attr if isinstance(attr, str) else hex(attr)
+            for attr in self._normalize_attrs(self.MODEL_ATTRS + attrs)
+        ]
+        if resolve_attrs:
+            attr_ids = [attr_id_to_name(attr) for attr in attr_ids]
+
+        return list(dict.fromkeys(attr_ids))
+
+
+class AsyncSpectrumClient(AsyncSpectrumModelsMixin):
+    """
+    The asyncio counterpart of SpectrumClient. Each API method is a coroutine,
+    and the number of requests in flight is bounded by the `max_concurrency`
+    client option.
+
+    Examples
+    --------
+        from pyspectrum import AsyncSpectrumClient
+
+        async with AsyncSpectrumClient(max_concurrency=20) as spectrum:
+            responses = await spectrum.gather_models(model_handles)
+            async for device in spectrum.iter_all_devices(page_size=1000):
+                print(device["model_name"])
+    """
+
+    to_csv = staticmethod(SpectrumClient.to_csv)
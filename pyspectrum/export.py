@@ -0,0 +1,186 @@
+import csv
+import heapq
+import json
+import pickle
+from itertools import chain, islice
+from tempfile import TemporaryFile
+from typing import AnyStr, Dict, Iterable, Iterator, List, Optional, Set
+from typing import Tuple
+
+
+__all__ = ["write_csv", "write_jsonl"]
+
+# Maximum number of rows to sort in memory. Larger exports are sorted in runs
+# of this size, which are spilled to temporary files and then merged.
+
+SORT_CHUNK_SIZE = 100000
+
+
+def write_csv(
+    models: Iterable[Dict],
+    filepath: AnyStr,
+    fieldnames: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    orderby: Optional[str] = None,
+    extrasaction: str = "ignore",
+) -> int:
+    """
+    Writes each model to a CSV file as it is received from the iterable, for
+    example directly from `iter_all_devices`. Neither the iterable nor the
+    models are modified. Returns the number of models written. If there are
+    no models and no fieldnames, an empty file is written.
+
+    Parameters
+    ----------
+    models
+        Iterable of parsed model dictionaries
+    filepath
+        The path of the CSV file
+    fieldnames
+        The CSV column headers. If not given, the keys of the first model are
+        used.
+    exclude
+        Columns to omit from the CSV file
+    orderby
+        Column to sort the rows by. Rows are sorted in memory in runs of
+        SORT_CHUNK_SIZE, and larger exports are merged from temporary files.
+    extrasaction
+        As per `csv.DictWriter`, "ignore" to omit the keys of a model which
+        are not fieldnames, or "raise" to raise a ValueError. Excluded keys
+        are always omitted.
+    """
+    fieldnames, rows = _export_rows(
+        models, fieldnames, exclude, orderby, extrasaction
+    )
+    count = 0
+
+    with open(filepath, "w+", newline="") as outfile:
+        csv_wr = csv.writer(outfile, quoting=csv.QUOTE_NONNUMERIC)
+        if fieldnames:
+            csv_wr.writerow(fieldnames)
+        for row in rows:
+            csv_wr.writerow(row)
+            count += 1
+
+    return count
+
+
+def write_jsonl(
+    models: Iterable[Dict],
+    filepath: AnyStr,
+    fieldnames: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    orderby: Optional[str] = None,
+) -> int:
+    """
+    Writes each model to a JSON lines file, one JSON object per line, as it is
+    received from the iterable. The parameters are as per `write_csv`. Returns
+    the number of models written.
+    """
+    fieldnames, rows = _export_rows(models, fieldnames, exclude, orderby)
+    count = 0
+
+    with open(filepath, "w+") as outfile:
+        for row in rows:
+            outfile.write(json.dumps(dict(zip(fieldnames, row))) + "\n")
+            count += 1
+
+    return count
+
+
+def _export_rows(
+    models: Iterable[Dict],
+    fieldnames: Optional[List[str]],
+    exclude: Optional[List[str]],
+    orderby: Optional[str],
+    extrasaction: str = "ignore",
+) -> Tuple[List[str], Iterator[List]]:
+    """
+    Returns the exported fieldnames, and an iterator of the values of each
+    model in fieldname order, sorted if required.
+    """
+    if extrasaction not in ("ignore", "raise"):
+        raise ValueError(
+            f"extrasaction ({extrasaction}) must be 'ignore' or 'raise'"
+        )
+    models = iter(models)
+
+    if fieldnames is None:
+        first = next(models, None)
+        if first is None:
+            return [], iter(())
+        fieldnames = list(first)
+        models = chain([first], models)
+
+    if exclude:
+        fieldnames = [name for name in fieldnames if name not in exclude]
+
+    if extrasaction == "raise":
+        models = _check_fields(models, set(fieldnames).union(exclude or ()))
+
+    rows = ([model.get(name) for name in fieldnames] for model in models)
+
+    if orderby in fieldnames:
+        rows = _sorted_rows(rows, fieldnames.index(orderby))
+
+    return fieldnames, rows
+
+
+def _check_fields(
+    models: Iterator[Dict], allowed: Set[str]
+) -> Iterator[Dict]:
+    """ Raises a ValueError for a model with keys which are not allowed """
+    for model in models:
+        wrong = [key for key in model if key not in allowed]
+        if wrong:
+            raise ValueError(
+                "dict contains fields not in fieldnames: "
+                + ", ".join(map(repr, wrong))
+            )
+        yield model
+
+
+def _sort_key(value) -> str:
+    """ Case-insensitive sort key of an exported value """
+    return value.lower() if isinstance(value, str) else ""
+
+
+def _sorted_rows(rows: Iterator[List], key_idx: int) -> Iterator[List]:
+    """
+    Sorts the rows by the value at `key_idx`. Each run of SORT_CHUNK_SIZE rows
+    is sorted in memory and, unless there is only one run, written to a
+    temporary file. The sorted runs are then merged.
+    """
+
+    def key(row):
+        return _sort_key(row[key_idx])
+
+    run = sorted(islice(rows, SORT_CHUNK_SIZE), key=key)
+    if len(run) < SORT_CHUNK_SIZE:
+        yield from run
+        return
+
+    run_files = []
+    try:
+        while run:
+            run_file = TemporaryFile()
+            run_files.append(run_file)
+            for row in run:
+                pickle.dump(row, run_file, pickle.HIGHEST_PROTOCOL)
+            run_file.seek(0)
+            run = sorted(islice(rows, SORT_CHUNK_SIZE), key=key)
+
+        yield from heapq.merge(*map(_read_run, run_files), key=key)
+
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+
+def _read_run(run_file) -> Iterator[List]:
+    """ Yields each row of a sorted run written to a temporary file """
+    while True:
+        try:
+            yield pickle.load(run_file)
+        except EOFError:
+            return
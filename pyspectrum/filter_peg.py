@@ -0,0 +1,88 @@
+"""
+Reference parser of filter expressions, using the parsimonious FILTER_GRAMMER.
+The grammar is only required by `parse_filter_peg`, and so this module, and
+parsimonious, are imported on first use rather than with `pyspectrum.filters`.
+"""
+from functools import lru_cache
+from itertools import chain
+from parsimonious import Grammar, NodeVisitor
+from parsimonious.nodes import RegexNode
+from pyspectrum.attributes import attr_name_to_id
+from pyspectrum.filters import FILTER_GRAMMER, _OPERATORS
+
+
+__all__ = ["filter_grammar", "filter_builder"]
+
+
+@lru_cache(maxsize=None)
+def filter_grammar() -> Grammar:
+    """ Returns the FILTER_GRAMMER, compiled on the first call """
+    return Grammar(FILTER_GRAMMER)
+
+
+class _FilterConstructor(NodeVisitor):
+    """ parsimouneous node visitor for handling the FILTER_GRAMMER """
+
+    # An unknown attribute name is raised as per `parse_filter`
+    unwrapped_exceptions = (ValueError,)
+
+    def visit_group_expr(self, node, vc):  # noqa
+        """ create a group_expr item """
+        group_tok, _, _, _, filter_list, *_ = vc
+        return {group_tok: filter_list}
+
+    def visit_group_list_expr(self, node, vc):  # noqa
+        """ create a list of group_expr items """
+        expr_1, _, expr_n = vc
+        expr_list = [
+            expr_1,
+            *(
+                expr
+                for expr in chain.from_iterable(expr_n)
+                if isinstance(expr, dict)
+            ),
+        ]
+        return expr_list
+
+    def visit_group_list_item(self, node, vc):  # noqa
+        return vc[0]
+
+    def visit_simple_expr(self, node, vc):  # noqa
+        """ return a filter dictionary """
+        attr, _, oper, _, value_tok, *_ = vc
+        attr_id = attr_name_to_id(attr.text)
+        return {oper: (hex(attr_id), value_tok)}
+
+    # -------------------------------------------------------------------------
+    #                      Token Expressions
+    # -------------------------------------------------------------------------
+
+    def visit_group_tok(self, node, vc):  # noqa
+        """ returns the group operator (and, or, not) value """
+        return node.text
+
+    def visit_value_tok(self, node, vc):  # noqa
+        """ children will either be a single node-value or a quoted-value """
+        vc = vc.pop(0)
+
+        # Single node-value
+        if isinstance(vc, RegexNode):
+            return vc.text
+
+        # Remove the single or double quotes from a Quoted value
+        return node.text[1:-1]
+
+    # -------------------------------------------------------------------------
+    #                      Operator Nodes
+    # -------------------------------------------------------------------------
+
+    def visit_oper(self, node, vc):  # noqa
+        """ returns the string operator in IPF API form """
+        return _OPERATORS[node.text]
+
+    def generic_visit(self, node, visited_children):
+        """ pass through for nodes not explicility visited """
+        return visited_children or node
+
+
+filter_builder = _FilterConstructor()
@@ -1,13 +1,29 @@
+import abc
+import re
+from functools import lru_cache
 from types import MappingProxyType
-from typing import Dict
-from parsimonious import Grammar, NodeVisitor
-from parsimonious.nodes import RegexNode
-from parsimonious.exceptions import IncompleteParseError
-from itertools import chain
+from typing import Dict, Iterable, List, Union
+from xml.sax.saxutils import escape
 from pyspectrum.attributes import attr_name_to_id
 
 
-__all__ = ["parse_filter"]
+__all__ = [
+    "parse_filter",
+    "parse_filter_peg",
+    "normalize_filter",
+    "filter_cache_info",
+    "clear_filter_cache",
+    "FilterExpr",
+    "Attr",
+    "F",
+    "And",
+    "Or",
+    "Not",
+]
+
+# Maximum number of parsed filter expressions to cache
+
+FILTER_CACHE_SIZE = 512
 
 
 _OPERATORS = MappingProxyType(
@@ -54,72 +70,134 @@ sq_tok          = sq sq_words sq
 dq_tok          = dq dq_words dq
 """
 
-_grammer = Grammar(FILTER_GRAMMER)
 
+class _FilterParser:
+    """
+    Hand-written recursive descent parser for the FILTER_GRAMMER. It accepts
+    the same expressions, and returns the same filter dictionary, as the
+    parsimonious grammar but without building an intermediate parse tree.
+
+    The one difference is that whitespace is accepted before every comma of a
+    group list, whereas the grammar only accepts it after the first item.
+    """
+
+    ws_re = re.compile(r"\s*")
+    group_re = re.compile(r"(and|or|not)\s*\(")
+    attr_re = re.compile(r"[a-z0-9_\-]+", re.IGNORECASE)
+    oper_re = re.compile(r"!=|=~|=\$|=|!~|~|\^=|<=|>=|<|>")
+    value_re = re.compile(
+        r"'([^']+)'|\"([^\"]+)\"|([\\a-z0-9\.\/_\-]+)", re.IGNORECASE
+    )
+
+    def parse(self, expr: str) -> dict:
+        """ Parse the complete expression into a filter dictionary """
+        self.expr = expr
+        self.pos = 0
+
+        result = self.filter_expr()
+
+        if self.pos != len(expr):
+            self.error("unexpected text")
+
+        return result
+
+    def error(self, reason: str):
+        """ Raise an exception identifying the position of the failure """
+        raise ValueError(
+            f"Invalid filter expression, {reason} at position {self.pos}: "
+            f"'{self.expr[self.pos:self.pos + 20]}'"
+        )
+
+    def match(self, regex: re.Pattern, reason: str) -> re.Match:
+        """ Match the regex at the current position, and advance past it """
+        match = regex.match(self.expr, self.pos)
+        if not match:
+            self.error(reason)
+        self.pos = match.end()
+        return match
+
+    def skip_ws(self):
+        self.pos = self.ws_re.match(self.expr, self.pos).end()
 
-class _FilterConstructor(NodeVisitor):
-    """ parsimouneous node visitor for handling the FILTER_GRAMMER """
+    def filter_expr(self) -> dict:
+        """ filter_expr = group_expr / simple_expr """
+        group = self.group_re.match(self.expr, self.pos)
+        if group:
+            self.pos = group.end()
+            return self.group_expr(group.group(1))
+        return self.simple_expr()
 
-    def visit_group_expr(self, node, vc):  # noqa
-        """ create a group_expr item """
-        group_tok, _, _, _, filter_list, *_ = vc
-        return {group_tok: filter_list}
+    def group_expr(self, group_tok: str) -> dict:
+        """ The group list, following the opening parenthesis """
+        self.skip_ws()
+        items = [self.filter_expr()]
+        self.skip_ws()
 
-    def visit_group_list_expr(self, node, vc):  # noqa
-        """ create a list of group_expr items """
-        expr_1, _, expr_n = vc
-        expr_list = [
-            expr_1,
-            *(
-                expr
-                for expr in chain.from_iterable(expr_n)
-                if isinstance(expr, dict)
-            ),
-        ]
-        return expr_list
+        while self.expr.startswith(",", self.pos):
+            self.pos += 1
+            self.skip_ws()
+            items.append(self.filter_expr())
+            self.skip_ws()
 
-    def visit_group_list_item(self, node, vc):  # noqa
-        return vc[0]
+        if len(items) < 2:
+            self.error("expected ','")
 
-    def visit_simple_expr(self, node, vc):  # noqa
-        """ return a filter dictionary """
-        attr, _, oper, _, value_tok, *_ = vc
-        attr_id = attr_name_to_id(attr.text)
-        return {oper: (hex(attr_id), value_tok)}
+        if not self.expr.startswith(")", self.pos):
+            self.error("expected ')'")
+        self.pos += 1
 
-    # -------------------------------------------------------------------------
-    #                      Token Expressions
-    # -------------------------------------------------------------------------
+        return {group_tok: items}
 
-    def visit_group_tok(self, node, vc):  # noqa
-        """ returns the group operator (and, or, not) value """
-        return node.text
+    def simple_expr(self) -> dict:
+        """ simple_expr = attr ws oper ws value_tok """
+        attr = self.match(self.attr_re, "expected attribute").group()
+        self.skip_ws()
+        oper = self.match(self.oper_re, "expected operator").group()
+        self.skip_ws()
+        value = self.match(self.value_re, "expected value")
 
-    def visit_value_tok(self, node, vc):  # noqa
-        """ children will either be a single node-value or a quoted-value """
-        vc = vc.pop(0)
+        # The value is either single-quoted, double-quoted or a single word
+        value = next(group for group in value.groups() if group is not None)
 
-        # Single node-value
-        if isinstance(vc, RegexNode):
-            return vc.text
+        return {_OPERATORS[oper]: (hex(attr_name_to_id(attr)), value)}
 
-        # Remove the single or double quotes from a Quoted value
-        return node.text[1:-1]
 
-    # -------------------------------------------------------------------------
-    #                      Operator Nodes
-    # -------------------------------------------------------------------------
+def parse_filter_peg(expr: str) -> dict:
+    """
+    Reference implementation of `parse_filter`, which parses the expression
+    using the parsimonious FILTER_GRAMMER. It is not cached. The grammar is
+    compiled on first use.
+    """
+    from pyspectrum.filter_peg import filter_grammar, filter_builder
+    from parsimonious.exceptions import ParseError
 
-    def visit_oper(self, node, vc):  # noqa
-        """ returns the string operator in IPF API form """
-        return _OPERATORS[node.text]
+    # Parse the expression against the defined Grammer. A syntax error is
+    # raised as a ValueError, as per `parse_filter`
+    try:
+        res = filter_grammar().parse(normalize_filter(expr))
+    except ParseError as exc:
+        raise ValueError(f"Invalid filter expression, {exc}") from None
 
-    def generic_visit(self, node, visited_children):
-        """ pass through for nodes not explicility visited """
-        return visited_children or node
+    # Return the parsed expression as a filter dictionary
+    return filter_builder.visit(res)[0]
 
 
-_filter_builder = _FilterConstructor()
+def normalize_filter(expr: str) -> str:
+    """
+    Returns the filter expression in the form that is parsed, which is also
+    used as the key when caching parsed expressions.
+    """
+    return expr.strip().replace("\n", "")
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _parse_filter_cached(expr: str) -> dict:
+    """
+    Parses a normalized filter expression. The results are cached, and so must
+    not be modified by the caller.
+    """
+
+    return _FilterParser().parse(expr)
 
 
 def parse_filter(expr: str) -> dict:
@@ -128,14 +206,255 @@ def parse_filter(expr: str) -> dict:
     form of FILTER_GRAMMER, and return a Spectrum compatible XML string which
     will be inserted into the payload of a POST request.
 
+    Parsed expressions are held in a bounded LRU cache, so repeated
+    expressions are only parsed once. See `filter_cache_info` and
+    `clear_filter_cache`.
+
     Parameters
     ----------
     expr
         The filter expression, for example "model_name ~ FW"
     """
+    return _copy_filter(_parse_filter_cached(normalize_filter(expr)))
 
-    # Parse the expression against the defined Grammer
-    res = _grammer.parse(expr.strip().replace("\n", ""))
 
-    # Return the parsed expression as a filter dictionary
-    return _filter_builder.visit(res)[0]
+def _copy_filter(filter_dict: dict) -> dict:
+    """
+    Copies a filter dictionary, so that the cached dictionary is not modified
+    by the caller. Only the dictionaries and group lists are copied, as the
+    (attribute, value) tuples of the conditions are immutable, which is far
+    cheaper than a `deepcopy`.
+    """
+    return {
+        key: (
+            value
+            if isinstance(value, tuple)
+            else [_copy_filter(item) for item in value]
+        )
+        for key, value in filter_dict.items()
+    }
+
+
+def filter_cache_info():
+    """ Returns the hit/miss statistics of the parsed filter cache """
+    return _parse_filter_cached.cache_info()
+
+
+def clear_filter_cache() -> None:
+    """ Removes all entries from the parsed filter cache """
+    _parse_filter_cached.cache_clear()
+
+
+# -----------------------------------------------------------------------------
+#                      Programmatic Filter Expressions
+# -----------------------------------------------------------------------------
+
+
+class FilterExpr(abc.ABC):
+    """
+    Base class of the programmatic filter expressions. Expressions can be
+    combined with the `&`, `|` and `~` operators, and are serialized directly
+    to the filter XML without any string parsing.
+    """
+
+    __slots__ = ()
+
+    def __and__(self, other: "FilterExpr") -> "And":
+        return And(self, other)
+
+    def __or__(self, other: "FilterExpr") -> "Or":
+        return Or(self, other)
+
+    def __invert__(self) -> "Not":
+        return Not(self)
+
+    @staticmethod
+    def from_dict(exp: dict) -> "FilterExpr":
+        """
+        Create an expression from a filter dictionary, as returned by
+        `parse_filter`.
+        """
+        ((key, value),) = exp.items()
+        if isinstance(value[0], str):
+            return Condition(key, *value)
+        return _GROUPS[key](*map(FilterExpr.from_dict, value))
+
+    @staticmethod
+    def coerce(filters: Union[str, "FilterExpr"]) -> "FilterExpr":
+        """ Returns the filter, parsing it if it is a filter expression """
+        if isinstance(filters, FilterExpr):
+            return filters
+        return FilterExpr.from_dict(parse_filter(filters))
+
+    @abc.abstractmethod
+    def to_dict(self) -> dict:
+        """ Returns the expression in the form returned by `parse_filter` """
+
+    def to_xml(self) -> str:
+        """ Returns the expression as the XML for the model search payload """
+        parts = []
+        self._write(parts)
+        return "".join(parts)
+
+    @abc.abstractmethod
+    def _write(self, parts: List[str]) -> None:
+        """ Appends the XML of the expression to the list of parts """
+
+
+class Condition(FilterExpr):
+    """ Compares an attribute to a value using a Spectrum filter operator """
+
+    __slots__ = ("oper", "attr_id", "value")
+
+    def __init__(self, oper: str, attr_id: str, value) -> None:
+        self.oper = oper
+        self.attr_id = attr_id
+        self.value = str(value)
+
+    def __repr__(self) -> str:
+        return f"Condition({self.oper!r}, {self.attr_id!r}, {self.value!r})"
+
+    def to_dict(self) -> dict:
+        return {self.oper: (self.attr_id, self.value)}
+
+    def _write(self, parts: List[str]) -> None:
+        parts.append(
+            f"\n<{self.oper}>"
+            f'\n<attribute id="{self.attr_id}">'
+            f"\n<value>{escape(self.value)}</value>"
+            f"\n</attribute>"
+            f"\n</{self.oper}>"
+        )
+
+
+class _Group(FilterExpr):
+    """ Base class of the grouped filter expressions """
+
+    __slots__ = ("exprs",)
+
+    group_tok = None
+
+    def __init__(self, *exprs: FilterExpr) -> None:
+        if not exprs:
+            raise ValueError(
+                f"'{self.group_tok}' requires at least one filter expression"
+            )
+        self.exprs = exprs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}{self.exprs!r}"
+
+    def to_dict(self) -> dict:
+        return {self.group_tok: [expr.to_dict() for expr in self.exprs]}
+
+    def _write(self, parts: List[str]) -> None:
+        parts.append(f"\n<{self.group_tok}>")
+        for expr in self.exprs:
+            expr._write(parts)
+        parts.append(f"\n</{self.group_tok}>")
+
+
+class And(_Group):
+    """ Matches models which match all of the given expressions """
+
+    __slots__ = ()
+    group_tok = "and"
+
+
+class Or(_Group):
+    """ Matches models which match any of the given expressions """
+
+    __slots__ = ()
+    group_tok = "or"
+
+
+class Not(_Group):
+    """ Matches models which do not match the given expressions """
+
+    __slots__ = ()
+    group_tok = "not"
+
+
+_GROUPS = {group.group_tok: group for group in (And, Or, Not)}
+
+
+class Attr:
+    """
+    A Spectrum attribute, by name or ID, for use in a filter expression. The
+    comparison operators, and the methods below, return a `Condition`.
+    """
+
+    __slots__ = ("attr_id",)
+
+    def __init__(self, attr: Union[int, str]) -> None:
+        self.attr_id = hex(
+            attr if isinstance(attr, int) else attr_name_to_id(attr)
+        )
+
+    def __repr__(self) -> str:
+        return f"Attr({self.attr_id})"
+
+    def _cond(self, oper: str, value) -> Condition:
+        return Condition(_OPERATORS[oper], self.attr_id, value)
+
+    # Comparisons build conditions, so an attribute cannot be hashed
+
+    __hash__ = None
+
+    def __eq__(self, value) -> Condition:
+        return self._cond("=", value)
+
+    def __ne__(self, value) -> Condition:
+        return self._cond("!=", value)
+
+    def __lt__(self, value) -> Condition:
+        return self._cond("<", value)
+
+    def __le__(self, value) -> Condition:
+        return self._cond("<=", value)
+
+    def __gt__(self, value) -> Condition:
+        return self._cond(">", value)
+
+    def __ge__(self, value) -> Condition:
+        return self._cond(">=", value)
+
+    def contains(self, value) -> Condition:
+        return self._cond("~", value)
+
+    def not_contains(self, value) -> Condition:
+        return self._cond("!~", value)
+
+    def matches(self, pattern) -> Condition:
+        return self._cond("=~", pattern)
+
+    def startswith(self, value) -> Condition:
+        return self._cond("^=", value)
+
+    def endswith(self, value) -> Condition:
+        return self._cond("=$", value)
+
+    def isin(self, values: Iterable) -> FilterExpr:
+        """ Matches any of the given values """
+        conds = [self == value for value in values]
+        return conds[0] if len(conds) == 1 else Or(*conds)
+
+
+class _AttrFactory:
+    """
+    Creates an `Attr` via attribute access by name, e.g. `F.model_name`, or
+    item access by name or ID, e.g. `F[0x1006e]`.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Attr:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return Attr(name)
+
+    def __getitem__(self, attr: Union[int, str]) -> Attr:
+        return Attr(attr)
+
+
+F = _AttrFactory()
@@ -0,0 +1,301 @@
+from pyspectrum.attributes import attr_id_to_name, attr_name_to_id
+from pyspectrum.filters import FilterExpr, parse_filter
+from typing import Optional, List, Dict, Iterable, Iterator, Union, Callable
+from typing import Set
+from functools import lru_cache
+import re
+
+
+__all__ = ["ModelIndex"]
+
+
+def _number(value: str):
+    """ Returns the value as a number if it is numeric, e.g. "2" or "0x1f" """
+    try:
+        return int(value, 0)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+
+def _compare(compare: Callable) -> Callable:
+    """
+    Returns a predicate which compares a model value to the filter value as
+    numbers, if both are numeric, and otherwise as strings.
+    """
+
+    def predicate(value: str, target: str) -> bool:
+        number, target_number = _number(value), _number(target)
+        if number is None or target_number is None:
+            return compare(value, target)
+        return compare(number, target_number)
+
+    return predicate
+
+
+@lru_cache(maxsize=128)
+def _pcre(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Predicates of the Spectrum filter operators, as named in `_OPERATORS`, each
+# called with the model value and the filter value
+
+_PREDICATES: Dict[str, Callable[[str, str], bool]] = {
+    "equals-ignore-case": lambda v, t: v.lower() == t.lower(),
+    "does-not-equal": lambda v, t: v != t,
+    "has-substring-ignore-case": lambda v, t: t.lower() in v.lower(),
+    "does-not-have-substring-ignore-case": (
+        lambda v, t: t.lower() not in v.lower()
+    ),
+    "has-pcre-ignore-case": lambda v, t: _pcre(t).search(v) is not None,
+    "has-prefix-ignore-case": lambda v, t: v.lower().startswith(t.lower()),
+    "has-suffix-ignore-case": lambda v, t: v.lower().endswith(t.lower()),
+    "less-than": _compare(lambda v, t: v < t),
+    "less-than-or-equals": _compare(lambda v, t: v <= t),
+    "greater-than": _compare(lambda v, t: v > t),
+    "greater-than-or-equals": _compare(lambda v, t: v >= t),
+}
+
+
+class ModelIndex:
+    """
+    An in-memory collection of parsed models which answers lookups and filter
+    expressions locally, rather than searching the server again.
+
+    Hash indexes are kept on the chosen attributes, so equality lookups, and
+    filters containing an equality condition on an indexed attribute, only
+    examine the matching models. Filters are evaluated with the same operator
+    semantics as a Spectrum model search:
+
+    - `=`, `~`, `!~`, `=~`, `^=` and `=$` ignore case
+    - `!=` is case sensitive
+    - `<`, `<=`, `>` and `>=` compare numerically if both values are numeric
+    - a condition on an attribute which a model does not have never matches
+    - `not` matches models which match none of its expressions
+
+    Examples
+    --------
+        from pyspectrum.index import ModelIndex
+
+        index = ModelIndex(spectrum.iter_all_devices(page_size=5000))
+
+        index.get("0x10a3b11")
+        index.lookup("network_address", "10.1.1.1")
+        index.filter("and(model_type_name = Rtr_Cisco, condition >= 2)")
+    """
+
+    INDEXES = [
+        "model_handle",
+        "network_address",
+        "model_type_name",
+        "device_type",
+    ]
+
+    def __init__(
+        self,
+        models: Iterable[Dict[str, str]] = (),
+        indexes: Optional[List[Union[int, str]]] = None,
+        resolve_attrs: bool = True,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        models
+            The parsed models, for example the `result` of a response or the
+            models yielded by `iter_all_devices`
+        indexes
+            The attributes to index, by name or ID. Defaults to `INDEXES`.
+        resolve_attrs
+            Whether the models are keyed by attribute name, as is the default
+            when parsing a response, or by attribute ID
+        """
+        self.resolve_attrs = resolve_attrs
+        self.models: List[Dict[str, str]] = []
+        self.indexes: Dict[str, Dict[str, List[int]]] = {
+            self._key(attr): {} for attr in (indexes or self.INDEXES)
+        }
+        self._handle_key = self._key("model_handle")
+        self._handles: Dict[str, int] = {}
+        self.extend(models)
+
+    @classmethod
+    def from_response(cls, response, **kwargs) -> "ModelIndex":
+        """ Creates an index of the models of a ModelResponseList """
+        kwargs.setdefault("resolve_attrs", response.resolve_attrs)
+        return cls(response.models, **kwargs)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable, **kwargs) -> "ModelIndex":
+        """
+        Creates an index of the models of each page of a paginated response,
+        as yielded by `iter_device_pages` or `iter_model_pages`
+        """
+        index = None
+        for page in pages:
+            if index is None:
+                kwargs.setdefault("resolve_attrs", page.resolve_attrs)
+                index = cls(**kwargs)
+            index.extend(page.models)
+        return index if index is not None else cls(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"ModelIndex <{len(self.models)} models>"
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self.models)
+
+    def __contains__(self, model_handle: str) -> bool:
+        return model_handle in self._handles
+
+    # -------------------------------------------------------------------------
+    #                      Loading
+    # -------------------------------------------------------------------------
+
+    def add(self, model: Dict[str, str]) -> None:
+        """ Adds a model to the index, replacing any with the same handle """
+        handle = model.get(self._handle_key)
+        pos = self._handles.get(handle)
+
+        if pos is None:
+            pos = len(self.models)
+            self.models.append(model)
+            if handle is not None:
+                self._handles[handle] = pos
+        else:
+            self._unindex(pos)
+            self.models[pos] = model
+
+        for key, index in self.indexes.items():
+            value = model.get(key)
+            if isinstance(value, str):
+                index.setdefault(value.lower(), []).append(pos)
+
+    def extend(self, models: Iterable[Dict[str, str]]) -> None:
+        """ Adds each of the models to the index """
+        for model in models:
+            self.add(model)
+
+    def _unindex(self, pos: int) -> None:
+        """ Removes the model at the position from the hash indexes """
+        model = self.models[pos]
+        for key, index in self.indexes.items():
+            value = model.get(key)
+            if isinstance(value, str):
+                index[value.lower()].remove(pos)
+
+    # -------------------------------------------------------------------------
+    #                      Queries
+    # -------------------------------------------------------------------------
+
+    def get(self, model_handle: Union[int, str]) -> Optional[Dict[str, str]]:
+        """ Returns the model with the given handle, or None """
+        if isinstance(model_handle, int):
+            model_handle = hex(model_handle)
+        pos = self._handles.get(model_handle)
+        return None if pos is None else self.models[pos]
+
+    def lookup(
+        self, attr: Union[int, str], value: str
+    ) -> List[Dict[str, str]]:
+        """
+        Returns the models whose attribute equals the value, ignoring case, as
+        per the `=` filter operator
+        """
+        condition = {"equals-ignore-case": (self._attr_id(attr), value)}
+        return self.filter(condition)
+
+    def filter(
+        self, filters: Union[str, dict, FilterExpr]
+    ) -> List[Dict[str, str]]:
+        """
+        Returns the models matching a filter expression, given as a string,
+        a filter dictionary as returned by `parse_filter`, or a `FilterExpr`,
+        in the order in which they were added.
+        """
+        if isinstance(filters, str):
+            filters = parse_filter(filters)
+        elif isinstance(filters, FilterExpr):
+            filters = filters.to_dict()
+
+        predicate = self._compile(filters)
+        candidates = self._candidates(filters)
+        if candidates is None:
+            return [model for model in self.models if predicate(model)]
+
+        models = self.models
+        return [
+            models[pos]
+            for pos in sorted(candidates)
+            if predicate(models[pos])
+        ]
+
+    # -------------------------------------------------------------------------
+    #                      Filter Evaluation
+    # -------------------------------------------------------------------------
+
+    def _key(self, attr: Union[int, str]) -> str:
+        """ Returns the key of an attribute in the parsed models """
+        attr_id = self._attr_id(attr)
+        return attr_id_to_name(attr_id) if self.resolve_attrs else attr_id
+
+    @staticmethod
+    def _attr_id(attr: Union[int, str]) -> str:
+        """ Returns the attribute ID of an attribute name or ID """
+        return hex(attr if isinstance(attr, int) else attr_name_to_id(attr))
+
+    def _compile(self, exp: dict) -> Callable[[Dict[str, str]], bool]:
+        """ Returns a predicate function of a filter dictionary """
+        ((oper, value),) = exp.items()
+
+        if isinstance(value[0], str):
+            key = self._key(value[0])
+            target = value[1]
+            compare = _PREDICATES[oper]
+
+            def condition(model):
+                value = model.get(key)
+                return isinstance(value, str) and compare(value, target)
+
+            return condition
+
+        preds = [self._compile(item) for item in value]
+        if oper == "and":
+            return lambda model: all(pred(model) for pred in preds)
+        if oper == "or":
+            return lambda model: any(pred(model) for pred in preds)
+        return lambda model: not any(pred(model) for pred in preds)
+
+    def _candidates(self, exp: dict) -> Optional[Set[int]]:
+        """
+        Returns the positions of the models which may match the filter, using
+        the hash indexes, or None if every model must be examined.
+        """
+        ((oper, value),) = exp.items()
+
+        if isinstance(value[0], str):
+            index = self.indexes.get(self._key(value[0]))
+            if oper != "equals-ignore-case" or index is None:
+                return None
+            return set(index.get(value[1].lower(), ()))
+
+        if oper == "and":
+            sets = [
+                cands
+                for cands in map(self._candidates, value)
+                if cands is not None
+            ]
+            return set.intersection(*sets) if sets else None
+
+        if oper == "or":
+            sets = list(map(self._candidates, value))
+            if any(cands is None for cands in sets):
+                return None
+            return set.union(*sets)
+
+        return None
@@ -0,0 +1,179 @@
+from pyspectrum.attributes import attr_id_to_name, attr_name_to_id
+from typing import Optional, List, Dict, Iterable, AnyStr, Union
+import json
+
+
+__all__ = ["InventorySnapshot", "InventoryDelta"]
+
+
+def _watermark_key(value: str):
+    """
+    Sort key for a watermark attribute value. Spectrum times and counters are
+    returned as decimal strings, which must be compared as numbers.
+    """
+    return (0, int(value), "") if value.isdigit() else (1, 0, value)
+
+
+class InventoryDelta:
+    """
+    The models added, changed and removed by an inventory sync, each keyed by
+    model handle. `previous` holds the prior version of each changed model.
+    """
+
+    def __init__(self) -> None:
+        self.added: Dict[str, Dict[str, str]] = {}
+        self.changed: Dict[str, Dict[str, str]] = {}
+        self.previous: Dict[str, Dict[str, str]] = {}
+        self.removed: Dict[str, Dict[str, str]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"InventoryDelta <{len(self.added)} added, {len(self.changed)} "
+            f"changed, {len(self.removed)} removed>"
+        )
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class InventorySnapshot:
+    """
+    A local copy of the models in Spectrum, keyed by model handle, together
+    with the watermark of each watermark attribute: the highest value seen.
+    The snapshot is updated by `SpectrumModelsMixin.sync_inventory`, and can
+    be saved to and loaded from a JSON file between runs.
+
+    Examples
+    --------
+        from pyspectrum.inventory import InventorySnapshot
+
+        snapshot = InventorySnapshot.load("inventory.json")
+        delta = spectrum.sync_inventory(snapshot)
+        snapshot.save("inventory.json")
+    """
+
+    def __init__(
+        self,
+        attrs: Optional[List[Union[int, str]]] = None,
+        watermark_attrs: Optional[List[Union[int, str]]] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        attrs
+            The attributes held for each model. If not given, the default
+            device attributes of the client are used.
+        watermark_attrs
+            The attributes whose values increase when a model is created or
+            changed, as names or IDs. If not given, the default watermark
+            attributes of the client are used.
+        """
+        self.attrs = list(attrs or [])
+        self.watermark_attrs = [
+            hex(attr_name_to_id(attr)) for attr in watermark_attrs or []
+        ]
+        self.watermarks: Dict[str, str] = {}
+        self.models: Dict[str, Dict[str, str]] = {}
+
+    def __repr__(self) -> str:
+        return f"InventorySnapshot <{len(self.models)} models>"
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __contains__(self, model_handle: str) -> bool:
+        return model_handle in self.models
+
+    def __getitem__(self, model_handle: str) -> Dict[str, str]:
+        return self.models[model_handle]
+
+    def __iter__(self):
+        return iter(self.models.values())
+
+    # -------------------------------------------------------------------------
+    #                      Updates
+    # -------------------------------------------------------------------------
+
+    def merge(
+        self, models: Iterable[Dict[str, str]], delta: InventoryDelta
+    ) -> None:
+        """
+        Merges fetched models into the snapshot, recording each new model in
+        `delta.added` and each model whose attributes differ, other than the
+        watermark attributes, in `delta.changed`. The watermarks are advanced
+        to the highest values seen.
+        """
+        names = [attr_id_to_name(attr) for attr in self.watermark_attrs]
+
+        for model in models:
+            handle = model["model_handle"]
+            old = self.models.get(handle)
+            self.models[handle] = model
+
+            if old is None:
+                delta.added[handle] = model
+            elif self._differs(old, model, names):
+                delta.changed[handle] = model
+                delta.previous[handle] = old
+
+            for attr_id, name in zip(self.watermark_attrs, names):
+                value = model.get(name)
+                if value is None:
+                    continue
+                mark = self.watermarks.get(attr_id)
+                if mark is None or _watermark_key(value) > _watermark_key(
+                    mark
+                ):
+                    self.watermarks[attr_id] = value
+
+    def remove(self, model_handles: Iterable[str], delta: InventoryDelta):
+        """ Removes models from the snapshot, recording them in `delta` """
+        for handle in model_handles:
+            model = self.models.pop(handle, None)
+            if model is not None:
+                delta.removed[handle] = model
+
+    @staticmethod
+    def _differs(old: dict, new: dict, ignore: List[str]) -> bool:
+        """ Compares two models, except for the ignored attributes """
+        keys = (old.keys() | new.keys()).difference(ignore)
+        return any(old.get(key) != new.get(key) for key in keys)
+
+    # -------------------------------------------------------------------------
+    #                      Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, filepath: AnyStr) -> None:
+        """ Saves the snapshot to a JSON file """
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "attrs": self.attrs,
+                    "watermark_attrs": self.watermark_attrs,
+                    "watermarks": self.watermarks,
+                    "models": list(self.models.values()),
+                },
+                fh,
+            )
+
+    @classmethod
+    def load(cls, filepath: AnyStr) -> "InventorySnapshot":
+        """
+        Loads a snapshot from a JSON file, or returns a new empty snapshot if
+        the file does not exist.
+        """
+        try:
+            with open(filepath, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return cls()
+
+        snapshot = cls(data["attrs"], data["watermark_attrs"])
+        snapshot.watermarks = data["watermarks"]
+        snapshot.models = {
+            model["model_handle"]: model for model in data["models"]
+        }
+        return snapshot
@@ -0,0 +1,347 @@
+from pyspectrum.cache import SpectrumResponseCache
+from httpx import Response, RequestNotRead, ResponseNotRead
+from typing import Optional, Dict, List, Iterable, NamedTuple, Union
+from threading import Lock
+import time
+
+
+__all__ = [
+    "SpectrumHooks",
+    "SpectrumMetrics",
+    "MetricsInfo",
+    "OpenTelemetryHooks",
+]
+
+
+_endpoint = SpectrumResponseCache.endpoint
+
+
+class SpectrumHooks:
+    """
+    Instrumentation hooks of a client, which are called as each request is
+    built, sent and parsed. Each method does nothing; subclasses override the
+    events they are interested in, and are passed to the client with the
+    `hooks` client option. No timing information is collected unless a client
+    has hooks.
+
+    The parse phases reported are:
+
+    - "xml": parsing the response body, with the number of models received
+    - "strip_ns": removing the XML namespaces
+    - "models": converting the models to dictionaries, on first access to
+      `result`, including resolving the attribute names
+    - "columns": converting the models to `SpectrumModelColumns`
+    - "stream": incrementally parsing a streamed response, including the time
+      spent waiting for the response body, with the number of models received
+
+    Examples
+    --------
+        from pyspectrum.metrics import SpectrumHooks
+
+        class SlowRequestLogger(SpectrumHooks):
+            def on_request(self, method, url, response, seconds, error=None):
+                if seconds > 5:
+                    log.warning(f"{method} {url} took {seconds:.1f}s")
+
+        spectrum = SpectrumClient(hooks=SlowRequestLogger())
+    """
+
+    @staticmethod
+    def coerce(
+        value: Union[None, "SpectrumHooks", Iterable["SpectrumHooks"]]
+    ) -> Optional["SpectrumHooks"]:
+        """
+        Returns the hooks given by the `hooks` client option: None, a
+        `SpectrumHooks` instance, or a list of instances, each of which is
+        called in turn.
+        """
+        if value is None or isinstance(value, SpectrumHooks):
+            return value
+        hooks = list(value)
+        if not hooks:
+            return None
+        return hooks[0] if len(hooks) == 1 else _HookChain(hooks)
+
+    def on_build(self, url: str, seconds: float) -> None:
+        """
+        Called when the payload of a request has been built, including
+        parsing the filter expression and rendering the XML template
+        """
+
+    def on_request(
+        self,
+        method: str,
+        url: str,
+        response: Optional[Response],
+        seconds: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """
+        Called when each attempt of a request completes, with the number of
+        seconds until the response was received, or the error if it failed.
+        The response of a streamed request is reported once its body has been
+        read.
+        """
+
+    def on_parse(
+        self, response: Response, phase: str, seconds: float, models: int = 0
+    ) -> None:
+        """ Called when a phase of parsing a response completes """
+
+
+class _HookChain(SpectrumHooks):
+    """ Calls each of a list of hooks in turn """
+
+    def __init__(self, hooks: List[SpectrumHooks]) -> None:
+        self.hooks = hooks
+
+    def on_build(self, *args) -> None:
+        for hook in self.hooks:
+            hook.on_build(*args)
+
+    def on_request(self, *args, **kwargs) -> None:
+        for hook in self.hooks:
+            hook.on_request(*args, **kwargs)
+
+    def on_parse(self, *args) -> None:
+        for hook in self.hooks:
+            hook.on_parse(*args)
+
+
+def _bytes_sent(response: Response) -> int:
+    """ Returns the size of the request payload of a response """
+    try:
+        return len(response.request.content)
+    except (RequestNotRead, RuntimeError):
+        return 0
+
+
+def _bytes_received(response: Response) -> int:
+    """
+    Returns the size of the response body as received, which is smaller than
+    the content if it was compressed
+    """
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    try:
+        return len(response.content)
+    except ResponseNotRead:
+        return 0
+
+
+class MetricsInfo(NamedTuple):
+    """ Request statistics of an endpoint """
+
+    requests: int
+    errors: int
+    pages: int
+    models: int
+    bytes_sent: int
+    bytes_received: int
+    build_time: float
+    server_time: float
+    parse_time: float
+    parse_times: Dict[str, float]
+
+
+class SpectrumMetrics(SpectrumHooks):
+    """
+    Hooks which collect the statistics of the requests made by a client, per
+    endpoint: the number of requests, failed attempts, pages and models, the
+    bytes sent and received, and the seconds spent building requests, waiting
+    for the server and parsing each phase of the responses.
+
+    Examples
+    --------
+        from pyspectrum.metrics import SpectrumMetrics
+
+        metrics = SpectrumMetrics()
+        spectrum = SpectrumClient(hooks=metrics)
+
+        spectrum.get_all_devices()
+        print(metrics.summary())
+        print(metrics.stats()["/devices"].parse_times)
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, dict] = {}
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"SpectrumMetrics <{self.total()}>"
+
+    def _endpoint_stats(self, url: str) -> dict:
+        endpoint = _endpoint(url)
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = {
+                "requests": 0,
+                "errors": 0,
+                "pages": 0,
+                "models": 0,
+                "bytes_sent": 0,
+                "bytes_received": 0,
+                "build_time": 0.0,
+                "server_time": 0.0,
+                "parse_times": {},
+            }
+        return stats
+
+    # -------------------------------------------------------------------------
+    #                      Hooks
+    # -------------------------------------------------------------------------
+
+    def on_build(self, url: str, seconds: float) -> None:
+        with self._lock:
+            self._endpoint_stats(url)["build_time"] += seconds
+
+    def on_request(self, method, url, response, seconds, error=None) -> None:
+        with self._lock:
+            stats = self._endpoint_stats(url)
+            stats["requests"] += 1
+            stats["server_time"] += seconds
+            if response is None:
+                stats["errors"] += 1
+                return
+
+            stats["bytes_sent"] += _bytes_sent(response)
+            stats["bytes_received"] += _bytes_received(response)
+            if response.is_success:
+                stats["pages"] += 1
+            else:
+                stats["errors"] += 1
+
+    def on_parse(self, response, phase, seconds, models=0) -> None:
+        with self._lock:
+            stats = self._endpoint_stats(response.request.url.path)
+            stats["models"] += models
+            times = stats["parse_times"]
+            times[phase] = times.get(phase, 0.0) + seconds
+
+    # -------------------------------------------------------------------------
+    #                      Statistics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, MetricsInfo]:
+        """ Returns the statistics of each endpoint """
+        with self._lock:
+            return {
+                endpoint: MetricsInfo(
+                    parse_time=sum(stats["parse_times"].values(), 0.0),
+                    **{**stats, "parse_times": dict(stats["parse_times"])},
+                )
+                for endpoint, stats in self._stats.items()
+            }
+
+    def total(self) -> MetricsInfo:
+        """ Returns the statistics of all endpoints combined """
+        stats = list(self.stats().values())
+        parse_times = {}
+        for info in stats:
+            for phase, seconds in info.parse_times.items():
+                parse_times[phase] = parse_times.get(phase, 0.0) + seconds
+
+        return MetricsInfo(
+            parse_times=parse_times,
+            **{
+                field: sum(getattr(info, field) for info in stats)
+                for field in MetricsInfo._fields[:-1]
+            },
+        )
+
+    def reset(self) -> None:
+        """ Discards the statistics collected """
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> str:
+        """ Returns a table of the statistics of each endpoint """
+        lines = [
+            f"{'endpoint':<12} {'requests':>8} {'errors':>6} {'pages':>6} "
+            f"{'models':>9} {'sent':>10} {'received':>12} {'build':>8} "
+            f"{'server':>8} {'parse':>8}"
+        ]
+        rows = list(self.stats().items()) + [("total", self.total())]
+        for endpoint, info in rows:
+            lines.append(
+                f"{endpoint:<12} {info.requests:>8} {info.errors:>6} "
+                f"{info.pages:>6} {info.models:>9} {info.bytes_sent:>10} "
+                f"{info.bytes_received:>12} {info.build_time:>8.3f} "
+                f"{info.server_time:>8.3f} {info.parse_time:>8.3f}"
+            )
+        return "\n".join(lines)
+
+
+class OpenTelemetryHooks(SpectrumHooks):
+    """
+    Hooks which record a span for each request attempt, request build and
+    parse phase, using the OpenTelemetry API. The spans are children of the
+    span which is current when the request is made. Requires the
+    `opentelemetry-api` package.
+
+    Examples
+    --------
+        from pyspectrum.metrics import OpenTelemetryHooks, SpectrumMetrics
+
+        metrics = SpectrumMetrics()
+        spectrum = SpectrumClient(hooks=[metrics, OpenTelemetryHooks()])
+    """
+
+    def __init__(self, tracer=None) -> None:
+        """
+        Parameters
+        ----------
+        tracer
+            The OpenTelemetry tracer to use. Defaults to the "pyspectrum"
+            tracer of the global tracer provider.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "opentelemetry-api must be installed to use OpenTelemetryHooks"
+            )
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("pyspectrum")
+
+    def _span(
+        self, name: str, seconds: float, attributes: dict, error=None
+    ) -> None:
+        """ Records a span which ended now and lasted `seconds` """
+        end = time.time_ns()
+        span = self.tracer.start_span(
+            name, start_time=end - int(seconds * 1e9), attributes=attributes
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end(end_time=end)
+
+    def on_build(self, url: str, seconds: float) -> None:
+        self._span("spectrum.build", seconds, {"spectrum.endpoint": url})
+
+    def on_request(self, method, url, response, seconds, error=None) -> None:
+        attributes = {
+            "http.request.method": method,
+            "url.path": url,
+            "spectrum.endpoint": _endpoint(url),
+        }
+        if response is not None:
+            attributes.update(
+                {
+                    "http.response.status_code": response.status_code,
+                    "http.request.body.size": _bytes_sent(response),
+                    "http.response.body.size": _bytes_received(response),
+                }
+            )
+        self._span(f"spectrum {method}", seconds, attributes, error)
+
+    def on_parse(self, response, phase, seconds, models=0) -> None:
+        self._span(
+            f"spectrum.parse.{phase}",
+            seconds,
+            {
+                "spectrum.endpoint": _endpoint(response.request.url.path),
+                "spectrum.models": models,
+            },
+        )
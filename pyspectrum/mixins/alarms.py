@@ -0,0 +1,356 @@
+from dataclasses import dataclass
+from pyspectrum.attributes import SpectrumModelAttributes as Attrs
+from pyspectrum.attributes import SpectrumAlarmAttributes as AlarmAttrs
+from pyspectrum.base_client import SpectrumBaseClient, AsyncSpectrumBaseClient
+from pyspectrum.responses import SpectrumAlarmResponseList
+from pyspectrum.filters import FilterExpr
+from pyspectrum.alarms import AlarmTable, AlarmDelta
+from pyspectrum.mixins.models import (
+    SpectrumModelsMixin,
+    AsyncSpectrumModelsMixin,
+)
+from pyspectrum.template import alarm_search_bytes
+from typing import Optional, List, Union, Dict, Iterator, AsyncIterator
+import time
+
+
+@dataclass
+class URIs:
+    """ Identifies API URL endpoints used"""
+
+    alarms = "/alarms"
+
+
+class SpectrumAlarmsMixin(SpectrumBaseClient):
+    """
+    Spectrum client mixin supporting the following features:
+        - alarms
+
+    Alarms are selected with the same filter expressions as model searches,
+    applied to the alarm attributes, and are paginated as per models.
+
+    Examples
+    --------
+        from pyspectrum import SpectrumClient
+        from pyspectrum.mixins.alarms import SpectrumAlarmsMixin
+
+        spectrum = SpectrumClient()
+        spectrum.mixin(SpectrumAlarmsMixin)
+        alarms = spectrum.get_alarms("severity >= 3").result
+    """
+
+    # General alarm attributes in a request, which identify the alarm and the
+    # alarmed model
+
+    ALARM_ATTRS = [
+        AlarmAttrs.ALARM_ID.value,
+        Attrs.MODEL_HANDLE.value,
+    ]
+
+    # Default alarm attributes to request
+
+    DEFAULT_ALARM_ATTRS = [
+        AlarmAttrs.SEVERITY.value,
+        AlarmAttrs.ALARM_TITLE.value,
+        AlarmAttrs.CREATION_DATE.value,
+        AlarmAttrs.ACKNOWLEDGED.value,
+        AlarmAttrs.CAUSE_CODE.value,
+        AlarmAttrs.OCCURRENCES.value,
+        Attrs.MODEL_NAME.value,
+    ]
+
+    # Subsequent pages are requested as per the pages of a model search
+
+    _iter_pages = SpectrumModelsMixin._iter_pages
+
+    def get_alarms(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+    ) -> SpectrumAlarmResponseList:
+        """
+        Search alarms that match the given filter, or all alarms if no filter
+        is given, and include the specified attributes, otherwise
+        `DEFAULT_ALARM_ATTRS`.
+        """
+
+        payload = self._alarm_search_payload(filters, attrs, self.api_throttle)
+        res = self._send("POST", URIs.alarms, content=payload)
+
+        return SpectrumAlarmResponseList(res, resolve_attrs, self.hooks)
+
+    def iter_alarm_pages(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+    ) -> Iterator[SpectrumAlarmResponseList]:
+        """
+        Generator which searches alarms that match the given filter and yields
+        each page of results, following the next-page link of each response
+        until the last page is reached.
+
+        Parameters
+        ----------
+        filters
+            The filter expression, as per `get_alarms`
+        attrs
+            The attributes to request
+        resolve_attrs
+            Resolve attribute IDs to names in the parsed output
+        page_size
+            The number of alarms to request per page. Defaults to the client
+            `api_throttle` value.
+        """
+
+        payload = self._alarm_search_payload(
+            filters, attrs, page_size or self.api_throttle
+        )
+        res = self._send("POST", URIs.alarms, content=payload)
+
+        yield from self._iter_pages(
+            URIs.alarms,
+            SpectrumAlarmResponseList(res, resolve_attrs, self.hooks),
+        )
+
+    def iter_alarms(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Generator which yields each alarm matching the given filter as a parsed
+        dictionary. Only a single page of results is held in memory at any one
+        time.
+        """
+        for page in self.iter_alarm_pages(
+            filters, attrs, resolve_attrs, page_size
+        ):
+            yield from page.result
+
+    def poll_alarms(
+        self,
+        table: AlarmTable,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        page_size: Optional[int] = None,
+    ) -> AlarmDelta:
+        """
+        Fetches the current alarms, or those matching the given filter, into a
+        local alarm table and returns only the alarms which are new, changed
+        or cleared since the previous poll. The first poll of an empty table
+        reports every alarm as new.
+
+        An alarm is reported as cleared once it is no longer returned, which
+        includes an alarm which no longer matches the filter, for example one
+        whose severity has dropped below the threshold of the filter.
+
+        Parameters
+        ----------
+        table
+            The table to update. The attributes held are set when the table is
+            created and otherwise default to `DEFAULT_ALARM_ATTRS`.
+        filters
+            The alarms to poll. If not given, all alarms are polled.
+        page_size
+            The number of alarms to request per page
+
+        Examples
+        --------
+            from pyspectrum.alarms import AlarmTable
+
+            table = AlarmTable()
+            while True:
+                delta = spectrum.poll_alarms(table, "severity >= 3")
+                for alarm_id, alarm in delta.cleared.items():
+                    print("cleared", alarm["alarm_title"])
+                time.sleep(10)
+        """
+
+        if not table.attrs:
+            table.attrs = list(self.DEFAULT_ALARM_ATTRS)
+
+        delta = AlarmDelta()
+        table.update(
+            self.iter_alarms(filters, table.attrs, page_size=page_size), delta
+        )
+        return delta
+
+    def watch_alarms(
+        self,
+        table: AlarmTable,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        interval: float = 10.0,
+        page_size: Optional[int] = None,
+    ) -> Iterator[AlarmDelta]:
+        """
+        Generator which polls the alarms every `interval` seconds, as per
+        `poll_alarms`, and yields the changes found by each poll, skipping any
+        poll which found no changes.
+
+        Examples
+        --------
+            from pyspectrum.alarms import AlarmTable
+
+            for delta in spectrum.watch_alarms(AlarmTable(), "severity >= 3"):
+                for alarm_id, alarm in delta.new.items():
+                    print("raised", alarm["alarm_title"])
+        """
+        while True:
+            start = time.monotonic()
+            delta = self.poll_alarms(table, filters, page_size)
+            if delta:
+                yield delta
+            time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+    # -------------------------------------------------------------------------
+    #                      Request Helpers
+    # -------------------------------------------------------------------------
+
+    def _alarm_search_payload(
+        self,
+        filters: Optional[Union[str, FilterExpr]],
+        attrs: List[Union[int, str]],
+        throttlesize: int,
+    ) -> bytes:
+        """ Build the XML payload for an alarms search request """
+
+        start = time.perf_counter()
+        req_attrs = self._normalize_attrs(
+            self.ALARM_ATTRS + (attrs or self.DEFAULT_ALARM_ATTRS)
+        )
+        try:
+            payload = alarm_search_bytes(filters, req_attrs, throttlesize)
+        except ValueError as err:
+            raise ValueError(
+                f"Unable to parse filter expression:\n\n{filters}"
+            ) from err
+
+        if self.hooks is not None:
+            self.hooks.on_build(URIs.alarms, time.perf_counter() - start)
+        return payload
+
+
+class AsyncSpectrumAlarmsMixin(AsyncSpectrumBaseClient):
+    """
+    Spectrum asyncio client mixin supporting the following features:
+        - alarms
+
+    Subsequent pages of a paginated response are fetched concurrently, up to
+    the `max_concurrency` limit of the client, and yielded in order.
+    """
+
+    ALARM_ATTRS = SpectrumAlarmsMixin.ALARM_ATTRS
+    DEFAULT_ALARM_ATTRS = SpectrumAlarmsMixin.DEFAULT_ALARM_ATTRS
+
+    _alarm_search_payload = SpectrumAlarmsMixin._alarm_search_payload
+    _iter_pages = AsyncSpectrumModelsMixin._iter_pages
+    _iter_responses = AsyncSpectrumModelsMixin._iter_responses
+
+    async def get_alarms(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+    ) -> SpectrumAlarmResponseList:
+        """
+        Search alarms that match the given filter, or all alarms if no filter
+        is given
+        """
+
+        payload = self._alarm_search_payload(filters, attrs, self.api_throttle)
+        res = await self._send("POST", URIs.alarms, content=payload)
+
+        return SpectrumAlarmResponseList(res, resolve_attrs, self.hooks)
+
+    async def iter_alarm_pages(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[SpectrumAlarmResponseList]:
+        """
+        Async generator which searches alarms that match the given filter and
+        yields each page of results in order.
+        """
+
+        payload = self._alarm_search_payload(
+            filters, attrs, page_size or self.api_throttle
+        )
+        res = await self._send("POST", URIs.alarms, content=payload)
+
+        async for page in self._iter_pages(
+            URIs.alarms,
+            SpectrumAlarmResponseList(res, resolve_attrs, self.hooks),
+        ):
+            yield page
+
+    async def iter_alarms(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Async generator which yields each alarm matching the given filter as a
+        parsed dictionary
+        """
+        async for page in self.iter_alarm_pages(
+            filters, attrs, resolve_attrs, page_size
+        ):
+            for alarm in page.result:
+                yield alarm
+
+    async def poll_alarms(
+        self,
+        table: AlarmTable,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        page_size: Optional[int] = None,
+    ) -> AlarmDelta:
+        """
+        Fetches the current alarms into a local alarm table and returns the
+        alarms which are new, changed or cleared since the previous poll, as
+        per `SpectrumAlarmsMixin.poll_alarms`
+        """
+
+        if not table.attrs:
+            table.attrs = list(self.DEFAULT_ALARM_ATTRS)
+
+        alarms = [
+            alarm
+            async for alarm in self.iter_alarms(
+                filters, table.attrs, page_size=page_size
+            )
+        ]
+
+        delta = AlarmDelta()
+        table.update(alarms, delta)
+        return delta
+
+    async def watch_alarms(
+        self,
+        table: AlarmTable,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        interval: float = 10.0,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[AlarmDelta]:
+        """
+        Async generator which polls the alarms every `interval` seconds and
+        yields the changes found by each poll, as per
+        `SpectrumAlarmsMixin.watch_alarms`
+        """
+        import asyncio
+
+        while True:
+            start = time.monotonic()
+            delta = await self.poll_alarms(table, filters, page_size)
+            if delta:
+                yield delta
+            await asyncio.sleep(
+                max(0.0, interval - (time.monotonic() - start))
+            )
@@ -1,10 +1,20 @@
 from dataclasses import dataclass
 from pyspectrum.attributes import SpectrumModelAttributes as Attrs
-from pyspectrum.base_client import SpectrumBaseClient
-from pyspectrum.responses import SpectrumModelResponseList
-from pyspectrum.filters import parse_filter
-from pyspectrum.template import model_search_xml
-from typing import Optional, List, Union
+from pyspectrum.base_client import SpectrumBaseClient, AsyncSpectrumBaseClient
+from pyspectrum.responses import (
+    SpectrumModelResponseList,
+    SpectrumModelResponseStream,
+    SpectrumFanoutResult,
+)
+from pyspectrum.filters import FilterExpr, F, And, Or
+from pyspectrum.inventory import InventorySnapshot, InventoryDelta
+from pyspectrum.template import model_search_payload, model_handles_bytes
+from typing import Optional, List, Union, Dict, Iterator, AsyncIterator
+from typing import Iterable
+from collections import deque
+from itertools import islice
+from httpx import Response, TransportError
+import time
 
 
 @dataclass
@@ -43,6 +53,21 @@ class SpectrumModelsMixin(SpectrumBaseClient):
         Attrs.COLLECTIONS_MODEL_NAME_STRING.value,
     ]
 
+    # Default number of model handles to request in a single payload
+
+    HANDLES_CHUNK_SIZE = 1000
+
+    # The range of model handles within each landscape
+
+    LANDSCAPE_HANDLE_SPAN = 0x100000
+
+    # Attributes whose values increase when a model is created or changed,
+    # used to find the models changed since the last inventory sync. The
+    # last successful poll time is not a default, as it advances for every
+    # device on each poll and so most devices would be fetched on each sync
+
+    WATERMARK_ATTRS = [Attrs.MDL_CREAT_TIME.value]
+
     def get_all_devices(
         self,
         attrs: Optional[List[Union[int, str]]] = [],
@@ -54,18 +79,121 @@ class SpectrumModelsMixin(SpectrumBaseClient):
         specified attributes.
         """
 
-        params = {
-            "attr": self._normalize_attrs(
-                self.MODEL_ATTRS + (attrs or self.DEVICE_ATTRS)
-            ),
-            "throttlesize": self.api_throttle,
-            **otherparams,
-        }
+        params = self._devices_params(attrs, self.api_throttle, **otherparams)
+
+        res = self._send("GET", URIs.devices, params=params)
+
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    def get_all_devices_by_landscape(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        landscapes: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        **otherparams,
+    ) -> SpectrumFanoutResult:
+        """
+        Requests all device models from each landscape concurrently. The
+        models in the `result` of the returned object are in landscape order,
+        and are tagged with their landscape ID. A failure for any landscape is
+        recorded in `errors` rather than failing the whole call.
+
+        Parameters
+        ----------
+        attrs
+            The attributes to request, as per `get_all_devices`
+        resolve_attrs
+            Resolve attribute IDs to names in the parsed output
+        landscapes
+            The landscape IDs to query. Defaults to all landscapes.
+        max_workers
+            The maximum number of concurrent requests. Defaults to the number
+            of landscapes.
+        """
+
+        def get_landscape_devices(landscape):
+            return self.get_all_devices(
+                attrs, resolve_attrs, landscapeid=landscape, **otherparams
+            )
+
+        return self._fan_out_landscapes(
+            get_landscape_devices, landscapes, max_workers
+        )
+
+    def iter_device_pages(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+        **otherparams,
+    ) -> Iterator[SpectrumModelResponseList]:
+        """
+        Generator which fetches all device models one page at a time, following
+        the next-page link of each response until the last page is reached.
+
+        Parameters
+        ----------
+        attrs
+            The attributes to request, as per `get_all_devices`
+        resolve_attrs
+            Resolve attribute IDs to names in the parsed output
+        page_size
+            The number of models to request per page. Defaults to the client
+            `api_throttle` value.
+        """
+
+        params = self._devices_params(
+            attrs, page_size or self.api_throttle, **otherparams
+        )
+
+        res = self._send("GET", URIs.devices, params=params)
+
+        yield from self._iter_pages(
+            URIs.devices,
+            SpectrumModelResponseList(res, resolve_attrs, self.hooks),
+        )
+
+    def iter_all_devices(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+        stream: bool = False,
+        **otherparams,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Generator which yields each device model as a parsed dictionary. Only
+        a single page of results is held in memory at any one time.
+
+        When `stream` is set, each page is parsed incrementally as it is
+        received and each model is yielded as soon as it has been read, rather
+        than once the whole page has been downloaded and parsed. Otherwise, if
+        the client has a `parse_pool`, the pages are parsed in its worker
+        processes.
 
-        res = self.api.get(url=URIs.devices, params=params)
-        res.raise_for_status()
+        Examples
+        --------
+            for device in spectrum.iter_all_devices(page_size=1000):
+                print(device["model_name"])
+        """
+        if stream or self.parse_pool is not None:
+            params = self._devices_params(
+                attrs, page_size or self.api_throttle, **otherparams
+            )
+            if stream:
+                yield from self._iter_stream(
+                    URIs.devices, resolve_attrs, "GET", params=params
+                )
+            else:
+                res = self._send("GET", URIs.devices, params=params)
+                yield from self._iter_parsed(URIs.devices, res, resolve_attrs)
+            return
 
-        return SpectrumModelResponseList(res, resolve_attrs)
+        for page in self.iter_device_pages(
+            attrs, resolve_attrs, page_size, **otherparams
+        ):
+            yield from page.result
 
     def get_model(
         self,
@@ -75,17 +203,72 @@ class SpectrumModelsMixin(SpectrumBaseClient):
     ) -> SpectrumModelResponseList:
         """ Fetch model with specific attributes """
 
-        res = self.api.get(
-            url=f"{URIs.model}/{hex(model_handle)}",
+        res = self._send(
+            "GET",
+            f"{URIs.model}/{hex(model_handle)}",
             params={"attr": self._normalize_attrs(self.MODEL_ATTRS + attrs)},
         )
-        res.raise_for_status()
 
-        return SpectrumModelResponseList(res, resolve_attrs)
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    def get_models_by_handles(
+        self,
+        model_handles: List[int],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> SpectrumModelResponseList:
+        """
+        Fetch many models with specific attributes. The model handles are
+        split into chunks, each of which is requested as a single model-request
+        payload, and the results merged into a single response. If no model
+        handles are given, an empty response is returned without a request.
+
+        Parameters
+        ----------
+        model_handles
+            The model handles to fetch
+        attrs
+            The attributes to request
+        resolve_attrs
+            Resolve attribute IDs to names in the parsed output
+        chunk_size
+            The number of model handles per request. Defaults to
+            `HANDLES_CHUNK_SIZE`.
+        """
+
+        if not model_handles:
+            return SpectrumModelResponseList.empty(resolve_attrs)
+
+        chunk_size = chunk_size or self.HANDLES_CHUNK_SIZE
+        req_attrs = self._normalize_attrs(self.MODEL_ATTRS + attrs)
+        merged = None
+
+        for offset in range(0, len(model_handles), chunk_size):
+            start = time.perf_counter()
+            payload = model_handles_bytes(
+                model_handles=model_handles[offset : offset + chunk_size],
+                req_attrs=req_attrs,
+                throttlesize=chunk_size,
+            )
+            if self.hooks is not None:
+                self.hooks.on_build(URIs.models, time.perf_counter() - start)
+            res = self._send("POST", URIs.models, content=payload)
+
+            for page in self._iter_pages(
+                URIs.models,
+                SpectrumModelResponseList(res, resolve_attrs, self.hooks),
+            ):
+                if merged is None:
+                    merged = page
+                else:
+                    merged.extend(page)
+
+        return merged
 
     def get_models(
         self,
-        filters: str,
+        filters: Union[str, FilterExpr],
         attrs: Optional[List[Union[int, str]]] = [],
         resolve_attrs: Optional[bool] = True,
         devices_only: Optional[bool] = False,
@@ -93,21 +276,818 @@ class SpectrumModelsMixin(SpectrumBaseClient):
     ) -> SpectrumModelResponseList:
         """ Search models that match the given filter """
 
+        payload = self._model_search_payload(
+            filters, attrs, self.api_throttle, devices_only, **otheropts
+        )
+        res = self._send("POST", URIs.models, content=payload)
+
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    def get_models_by_landscape(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        landscapes: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        **otheropts,
+    ) -> SpectrumFanoutResult:
+        """
+        Search models that match the given filter in each landscape
+        concurrently. Each search is restricted to a landscape by the range of
+        its model handles. The results are as per
+        `get_all_devices_by_landscape`.
+        """
+
+        filters = FilterExpr.coerce(filters)
+
+        def get_landscape_models(landscape):
+            return self.get_models(
+                self._landscape_filter(filters, landscape),
+                attrs,
+                resolve_attrs,
+                devices_only,
+                **otheropts,
+            )
+
+        return self._fan_out_landscapes(
+            get_landscape_models, landscapes, max_workers
+        )
+
+    def iter_model_pages(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        page_size: Optional[int] = None,
+        **otheropts,
+    ) -> Iterator[SpectrumModelResponseList]:
+        """
+        Generator which searches models that match the given filter and yields
+        each page of results, following the next-page link of each response
+        until the last page is reached.
+
+        Parameters
+        ----------
+        filters
+            The filter expression, as per `get_models`
+        attrs
+            The attributes to request
+        resolve_attrs
+            Resolve attribute IDs to names in the parsed output
+        devices_only
+            Restrict the search to device models
+        page_size
+            The number of models to request per page. Defaults to the client
+            `api_throttle` value.
+        """
+
+        payload = self._model_search_payload(
+            filters,
+            attrs,
+            page_size or self.api_throttle,
+            devices_only,
+            **otheropts,
+        )
+        res = self._send("POST", URIs.models, content=payload)
+
+        yield from self._iter_pages(
+            URIs.models,
+            SpectrumModelResponseList(res, resolve_attrs, self.hooks),
+        )
+
+    def iter_models(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        page_size: Optional[int] = None,
+        stream: bool = False,
+        **otheropts,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Generator which yields each model matching the given filter as a parsed
+        dictionary. Only a single page of results is held in memory at any one
+        time, or when `stream` is set, only the model being parsed. Otherwise,
+        if the client has a `parse_pool`, the pages are parsed in its worker
+        processes.
+        """
+        if stream or self.parse_pool is not None:
+            payload = self._model_search_payload(
+                filters,
+                attrs,
+                page_size or self.api_throttle,
+                devices_only,
+                **otheropts,
+            )
+            if stream:
+                yield from self._iter_stream(
+                    URIs.models, resolve_attrs, "POST", content=payload
+                )
+            else:
+                res = self._send("POST", URIs.models, content=payload)
+                yield from self._iter_parsed(URIs.models, res, resolve_attrs)
+            return
+
+        for page in self.iter_model_pages(
+            filters, attrs, resolve_attrs, devices_only, page_size, **otheropts
+        ):
+            yield from page.result
+
+    def iter_model_handles(
+        self,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        devices_only: Optional[bool] = True,
+        page_size: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Generator which yields the handle of every device, or of every model
+        matching the given filter. The handles are read from the response
+        without requesting or parsing any other attributes, so this is a cheap
+        way to list the models which exist.
+        """
+        throttlesize = page_size or self.api_throttle
+
+        if filters is None:
+            url = URIs.devices
+            res = self._send(
+                "GET",
+                url,
+                params={
+                    "attr": [hex(Attrs.MODEL_HANDLE.value)],
+                    "throttlesize": throttlesize,
+                },
+            )
+        else:
+            url = URIs.models
+            payload = self._model_search_payload(
+                filters, [], throttlesize, devices_only
+            )
+            res = self._send("POST", url, content=payload)
+
+        for page in self._iter_pages(
+            url, SpectrumModelResponseList(res, hooks=self.hooks)
+        ):
+            yield from page.model_handles
+
+    def sync_inventory(
+        self,
+        snapshot: InventorySnapshot,
+        filters: Optional[Union[str, FilterExpr]] = None,
+        page_size: Optional[int] = None,
+    ) -> InventoryDelta:
+        """
+        Brings a local snapshot of the devices, or of the models matching the
+        given filter, up to date and returns the models added, changed and
+        removed since the last sync.
+
+        The first sync of an empty snapshot fetches every model. Subsequent
+        syncs only fetch the models whose watermark attributes, by default
+        `mdl_creat_time`, have reached the highest value seen in the last
+        sync. Removed models, and any new models which do not have a
+        watermark value, are found by listing the model handles alone.
+
+        Changes to existing models are only found if a watermark attribute
+        advances when the model changes. To find the changes made by polling,
+        create the snapshot with `last_successful_poll` as a watermark
+        attribute, at the cost of fetching every device polled since the last
+        sync, which is usually most of them.
+
+        A model is only reported as changed if one of its attributes, other
+        than the watermark attributes, has changed.
+
+        The requests of a sync bypass the response cache of the client, if
+        any, so that the changes are never missed.
+
+        Parameters
+        ----------
+        snapshot
+            The snapshot to update. The attributes held, and the watermark
+            attributes, are set when the snapshot is created and otherwise
+            default to `DEVICE_ATTRS` and `WATERMARK_ATTRS`.
+        filters
+            The models to sync. If not given, all devices are synced.
+        page_size
+            The number of models to request per page
+
+        Examples
+        --------
+            from pyspectrum.inventory import InventorySnapshot
+
+            snapshot = InventorySnapshot.load("inventory.json")
+            delta = spectrum.sync_inventory(snapshot)
+            for handle, model in delta.changed.items():
+                print(handle, delta.previous[handle], model)
+            snapshot.save("inventory.json")
+        """
+
+        # The sync must see the current models, and so the requests bypass
+        # the response cache
+
+        with self._uncached():
+            return self._sync_inventory(snapshot, filters, page_size)
+
+    def _sync_inventory(
+        self,
+        snapshot: InventorySnapshot,
+        filters: Optional[Union[str, FilterExpr]],
+        page_size: Optional[int],
+    ) -> InventoryDelta:
+        """ Performs the sync of `sync_inventory` """
+
+        if not snapshot.attrs:
+            snapshot.attrs = list(self.DEVICE_ATTRS)
+        if not snapshot.watermark_attrs:
+            snapshot.watermark_attrs = [
+                hex(attr) for attr in self.WATERMARK_ATTRS
+            ]
+
+        attrs = snapshot.attrs + [
+            attr
+            for attr in snapshot.watermark_attrs
+            if attr not in snapshot.attrs
+        ]
+        delta = InventoryDelta()
+
+        # Every request of the sync must select the same models, or else the
+        # models selected by one request alone are added and then removed
+
+        devices_only = filters is None
+
+        # Without a watermark, every model is fetched and any model which was
+        # not returned has been removed
+
+        if not snapshot.watermarks:
+            if filters is None:
+                models = self.iter_all_devices(attrs, page_size=page_size)
+            else:
+                models = self.iter_models(
+                    filters,
+                    attrs,
+                    devices_only=devices_only,
+                    page_size=page_size,
+                )
+
+            seen = set()
+            snapshot.merge(self._track_handles(models, seen), delta)
+            snapshot.remove(
+                [handle for handle in snapshot.models if handle not in seen],
+                delta,
+            )
+            return delta
+
+        since = [
+            F[attr_id] >= mark for attr_id, mark in snapshot.watermarks.items()
+        ]
+        since = since[0] if len(since) == 1 else Or(*since)
+        if filters is not None:
+            since = And(FilterExpr.coerce(filters), since)
+
+        snapshot.merge(
+            self.iter_models(
+                since, attrs, devices_only=devices_only, page_size=page_size
+            ),
+            delta,
+        )
+
+        handles = set(
+            self.iter_model_handles(
+                filters, devices_only=devices_only, page_size=page_size
+            )
+        )
+        snapshot.remove(
+            [handle for handle in snapshot.models if handle not in handles],
+            delta,
+        )
+
+        missing = handles.difference(snapshot.models)
+        if missing:
+            snapshot.merge(
+                self.get_models_by_handles(
+                    [int(handle, 16) for handle in missing], attrs
+                ).result,
+                delta,
+            )
+
+        return delta
+
+    @staticmethod
+    def _track_handles(
+        models: Iterable[Dict[str, str]], seen: set
+    ) -> Iterator[Dict[str, str]]:
+        """ Yields each model, adding its handle to the `seen` set """
+        for model in models:
+            seen.add(model["model_handle"])
+            yield model
+
+    # -------------------------------------------------------------------------
+    #                      Request Helpers
+    # -------------------------------------------------------------------------
+
+    def _landscape_filter(
+        self, filters: FilterExpr, landscape: str
+    ) -> FilterExpr:
+        """ Restricts a filter to the range of model handles of a landscape """
+        first_mh = int(landscape, 0)
+        return And(
+            filters,
+            F.model_handle >= hex(first_mh),
+            F.model_handle < hex(first_mh + self.LANDSCAPE_HANDLE_SPAN),
+        )
+
+    def _devices_params(
+        self, attrs: List[Union[int, str]], throttlesize: int, **otherparams
+    ) -> dict:
+        """ Build the query parameters for a devices request """
+        return {
+            "attr": self._normalize_attrs(
+                self.MODEL_ATTRS + (attrs or self.DEVICE_ATTRS)
+            ),
+            "throttlesize": throttlesize,
+            **otherparams,
+        }
+
+    def _model_search_payload(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: List[Union[int, str]],
+        throttlesize: int,
+        devices_only: bool,
+        **otheropts,
+    ) -> bytes:
+        """ Build the XML payload for a models search request """
+
+        start = time.perf_counter()
         try:
-            filter_dict = parse_filter(filters)
+            payload = model_search_payload(
+                filters,
+                self._normalize_attrs(self.MODEL_ATTRS + attrs),
+                throttlesize,
+                devices_only,
+                **otheropts,
+            )
         except Exception:
             raise ValueError(
                 f"Unable to parse filter expression:\n\n{filters}"
             )
 
-        payload = model_search_xml(
-            filter=filter_dict,
-            req_attrs=self._normalize_attrs(self.MODEL_ATTRS + attrs),
-            throttlesize=self.api_throttle,
-            devices_only=devices_only,
+        if self.hooks is not None:
+            self.hooks.on_build(URIs.models, time.perf_counter() - start)
+        return payload
+
+    def _iter_stream(
+        self, url: str, resolve_attrs: bool, method: str, **kwargs
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Streams the response of the initial request, and then each subsequent
+        page of results, yielding each model as it is parsed.
+
+        If the connection fails part way through a subsequent page, that page
+        is requested again from the first model not yet received, according
+        to the retry policy of the client.
+        """
+        attempt = 0
+
+        while True:
+            received = 0
+            try:
+                with self._stream(method, url, **kwargs) as res:
+                    page = SpectrumModelResponseStream(
+                        res, resolve_attrs, self.hooks
+                    )
+                    for model in page:
+                        received += 1
+                        yield model
+            except TransportError as exc:
+                params = kwargs.get("params", {})
+                if "id" not in params or not self.retry.should_retry(
+                    method, url, attempt, exc=exc
+                ):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                kwargs = {
+                    "params": {
+                        **params,
+                        "start": int(params["start"]) + received,
+                    }
+                }
+                continue
+
+            attempt = 0
+
+            next_info = page.next_info
+            if not next_info:
+                return
+
+            method, kwargs = "GET", {
+                "params": {
+                    "id": next_info["id"],
+                    "start": next_info["start"],
+                    "throttlesize": next_info["throttle_size"],
+                }
+            }
+
+    def _iter_parsed(
+        self, url: str, res: Response, resolve_attrs: bool
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yields the models of the given response and then of each subsequent
+        page of results, parsed by the worker processes of the parse pool.
+        Each page is requested while the previous pages are being parsed.
+        """
+        from pyspectrum.parallel import next_page_info
+
+        def contents():
+            page = res
+            while True:
+                yield page.content
+
+                next_info = next_page_info(page.content)
+                if not next_info:
+                    return
+
+                page = self._send(
+                    "GET",
+                    url,
+                    params={
+                        "id": next_info["id"],
+                        "start": next_info["start"],
+                        "throttlesize": next_info["throttle_size"],
+                    },
+                )
+
+        for page in self.parse_pool.parse_pages(contents(), resolve_attrs):
+            yield from page.result
+
+    def _iter_pages(
+        self, url: str, page: SpectrumModelResponseList
+    ) -> Iterator[SpectrumModelResponseList]:
+        """
+        Yields the given response and then each subsequent page of results,
+        using the `next_info` of the previous page, until the last page. Each
+        page is parsed with the response class of the given response.
+        """
+        while True:
+            yield page
+
+            next_info = page.next_info
+            if not next_info:
+                return
+
+            res = self._send(
+                "GET",
+                url,
+                params={
+                    "id": next_info["id"],
+                    "start": next_info["start"],
+                    "throttlesize": next_info["throttle_size"],
+                },
+            )
+            page = type(page)(res, page.resolve_attrs, self.hooks)
+
+
+class AsyncSpectrumModelsMixin(AsyncSpectrumBaseClient):
+    """
+    Spectrum asyncio client mixin supporting the following features:
+        - devices
+        - model
+        - models
+
+    Subsequent pages of a paginated response are fetched concurrently, up to
+    the `max_concurrency` limit of the client, and yielded in order.
+    """
+
+    MODEL_ATTRS = SpectrumModelsMixin.MODEL_ATTRS
+    DEVICE_ATTRS = SpectrumModelsMixin.DEVICE_ATTRS
+
+    LANDSCAPE_HANDLE_SPAN = SpectrumModelsMixin.LANDSCAPE_HANDLE_SPAN
+
+    _devices_params = SpectrumModelsMixin._devices_params
+    _model_search_payload = SpectrumModelsMixin._model_search_payload
+    _landscape_filter = SpectrumModelsMixin._landscape_filter
+
+    async def get_all_devices(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        **otherparams,
+    ) -> SpectrumModelResponseList:
+        """
+        GET operation which will return all device models and include the
+        specified attributes.
+        """
+
+        params = self._devices_params(attrs, self.api_throttle, **otherparams)
+        res = await self._send("GET", URIs.devices, params=params)
+
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    async def get_model(
+        self,
+        model_handle: int,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+    ) -> SpectrumModelResponseList:
+        """ Fetch model with specific attributes """
+
+        res = await self._send(
+            "GET",
+            f"{URIs.model}/{hex(model_handle)}",
+            params={"attr": self._normalize_attrs(self.MODEL_ATTRS + attrs)},
+        )
+
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    async def gather_models(
+        self,
+        model_handles: List[int],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+    ) -> List[SpectrumModelResponseList]:
+        """
+        Fetch many models concurrently, returning the responses in the same
+        order as the given model handles.
+        """
+        import asyncio
+
+        return await asyncio.gather(
+            *(
+                self.get_model(model_handle, attrs, resolve_attrs)
+                for model_handle in model_handles
+            )
+        )
+
+    async def get_models(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        **otheropts,
+    ) -> SpectrumModelResponseList:
+        """ Search models that match the given filter """
+
+        payload = self._model_search_payload(
+            filters, attrs, self.api_throttle, devices_only, **otheropts
+        )
+        res = await self._send("POST", URIs.models, content=payload)
+
+        return SpectrumModelResponseList(res, resolve_attrs, self.hooks)
+
+    async def get_all_devices_by_landscape(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        landscapes: Optional[List[str]] = None,
+        **otherparams,
+    ) -> SpectrumFanoutResult:
+        """
+        Requests all device models from each landscape concurrently, as per
+        `SpectrumModelsMixin.get_all_devices_by_landscape`. The number of
+        concurrent requests is limited by the `max_concurrency` of the client.
+        """
+
+        async def get_landscape_devices(landscape):
+            return await self.get_all_devices(
+                attrs, resolve_attrs, landscapeid=landscape, **otherparams
+            )
+
+        return await self._fan_out_landscapes(
+            get_landscape_devices, landscapes
+        )
+
+    async def get_models_by_landscape(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        landscapes: Optional[List[str]] = None,
+        **otheropts,
+    ) -> SpectrumFanoutResult:
+        """
+        Search models that match the given filter in each landscape
+        concurrently, as per `SpectrumModelsMixin.get_models_by_landscape`
+        """
+
+        filters = FilterExpr.coerce(filters)
+
+        async def get_landscape_models(landscape):
+            return await self.get_models(
+                self._landscape_filter(filters, landscape),
+                attrs,
+                resolve_attrs,
+                devices_only,
+                **otheropts,
+            )
+
+        return await self._fan_out_landscapes(
+            get_landscape_models, landscapes
+        )
+
+    async def iter_device_pages(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+        **otherparams,
+    ) -> AsyncIterator[SpectrumModelResponseList]:
+        """
+        Async generator which fetches all device models and yields each page
+        of results in order.
+        """
+
+        params = self._devices_params(
+            attrs, page_size or self.api_throttle, **otherparams
+        )
+        res = await self._send("GET", URIs.devices, params=params)
+
+        async for page in self._iter_pages(
+            URIs.devices,
+            SpectrumModelResponseList(res, resolve_attrs, self.hooks),
+        ):
+            yield page
+
+    async def iter_all_devices(
+        self,
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: bool = True,
+        page_size: Optional[int] = None,
+        **otherparams,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Async generator which yields each device model as a parsed dictionary.
+        If the client has a `parse_pool`, the pages are parsed in its worker
+        processes.
+        """
+        if self.parse_pool is not None:
+            params = self._devices_params(
+                attrs, page_size or self.api_throttle, **otherparams
+            )
+            res = await self._send("GET", URIs.devices, params=params)
+            async for model in self._iter_parsed(
+                URIs.devices, res, resolve_attrs
+            ):
+                yield model
+            return
+
+        async for page in self.iter_device_pages(
+            attrs, resolve_attrs, page_size, **otherparams
+        ):
+            for model in page.result:
+                yield model
+
+    async def iter_model_pages(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        page_size: Optional[int] = None,
+        **otheropts,
+    ) -> AsyncIterator[SpectrumModelResponseList]:
+        """
+        Async generator which searches models that match the given filter and
+        yields each page of results in order.
+        """
+
+        payload = self._model_search_payload(
+            filters,
+            attrs,
+            page_size or self.api_throttle,
+            devices_only,
             **otheropts,
         )
-        res = self.api.post(url=URIs.models, content=payload.encode())
-        res.raise_for_status()
+        res = await self._send("POST", URIs.models, content=payload)
+
+        async for page in self._iter_pages(
+            URIs.models,
+            SpectrumModelResponseList(res, resolve_attrs, self.hooks),
+        ):
+            yield page
+
+    async def iter_models(
+        self,
+        filters: Union[str, FilterExpr],
+        attrs: Optional[List[Union[int, str]]] = [],
+        resolve_attrs: Optional[bool] = True,
+        devices_only: Optional[bool] = False,
+        page_size: Optional[int] = None,
+        **otheropts,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Async generator which yields each model matching the given filter as a
+        parsed dictionary. If the client has a `parse_pool`, the pages are
+        parsed in its worker processes.
+        """
+        if self.parse_pool is not None:
+            payload = self._model_search_payload(
+                filters,
+                attrs,
+                page_size or self.api_throttle,
+                devices_only,
+                **otheropts,
+            )
+            res = await self._send("POST", URIs.models, content=payload)
+            async for model in self._iter_parsed(
+                URIs.models, res, resolve_attrs
+            ):
+                yield model
+            return
+
+        async for page in self.iter_model_pages(
+            filters, attrs, resolve_attrs, devices_only, page_size, **otheropts
+        ):
+            for model in page.result:
+                yield model
+
+    async def _iter_pages(
+        self, url: str, page: SpectrumModelResponseList
+    ) -> AsyncIterator[SpectrumModelResponseList]:
+        """
+        Yields the given response and then each subsequent page of results,
+        each parsed with the response class of the given response.
+        """
 
-        return SpectrumModelResponseList(res, resolve_attrs)
+        yield page
+
+        async for res in self._iter_responses(
+            url, page.next_info, page.total_models
+        ):
+            yield type(page)(res, page.resolve_attrs, self.hooks)
+
+    async def _iter_parsed(
+        self, url: str, res: Response, resolve_attrs: bool
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Yields the models of the given response and then of each subsequent
+        page of results, parsed by the worker processes of the parse pool.
+        """
+        from pyspectrum.parallel import next_page_info, page_total
+
+        async def contents():
+            yield res.content
+            async for page in self._iter_responses(
+                url, next_page_info(res.content), page_total(res.content)
+            ):
+                yield page.content
+
+        async for page in self.parse_pool.parse_pages_async(
+            contents(), resolve_attrs
+        ):
+            for model in page.result:
+                yield model
+
+    async def _iter_responses(
+        self, url: str, next_info: Dict[str, str], total_models: int
+    ) -> AsyncIterator[Response]:
+        """
+        Yields the responses of the subsequent pages of a result set, given
+        the `next_info` and total number of models of the first page.
+
+        The first response identifies the result set, the page size and the
+        total number of models, from which the start offset of every remaining
+        page is known up front. These pages are requested concurrently, with
+        no more than `max_concurrency` pages buffered at once.
+        """
+        import asyncio
+
+        if not next_info:
+            return
+
+        page_size = int(next_info["throttle_size"])
+        starts = iter(
+            range(int(next_info["start"]), int(total_models), page_size)
+        )
+
+        def fetch(start):
+            return asyncio.ensure_future(
+                self._send(
+                    "GET",
+                    url,
+                    params={
+                        "id": next_info["id"],
+                        "start": start,
+                        "throttlesize": page_size,
+                    },
+                )
+            )
+
+        pending = deque(
+            fetch(start) for start in islice(starts, self.max_concurrency)
+        )
+
+        try:
+            while pending:
+                res = await pending.popleft()
+                start = next(starts, None)
+                if start is not None:
+                    pending.append(fetch(start))
+                yield res
+        finally:
+            for task in pending:
+                task.cancel()
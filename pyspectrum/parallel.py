@@ -0,0 +1,272 @@
+from pyspectrum.attributes import attr_id_to_name
+from pyspectrum.responses import _parse_next_link
+from lxml import etree
+from concurrent.futures import Executor, Future
+from collections import deque
+from functools import cached_property
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple, Union
+from typing import AsyncIterable, AsyncIterator
+import os
+import re
+import sys
+
+
+__all__ = [
+    "SpectrumParsePool",
+    "SpectrumParsedPage",
+    "parse_page",
+    "next_page_info",
+    "page_total",
+]
+
+
+# A parsed page, as returned by a worker: the distinct sets of attribute IDs
+# of the models, the index of the set of each model, and the values of each
+# model in the order of its set of attribute IDs
+
+PageData = Tuple[List[Tuple[str, ...]], List[int], List[tuple]]
+
+_ROOT_RE = re.compile(rb"<(?:[\w-]+:)?model-response-list\b[^>]*>")
+_LINK_RE = re.compile(rb"<(?:[\w-]+:)?link\b[^>]*>")
+_HREF_RE = re.compile(rb'href="([^"]*)"')
+_TOTAL_RE = re.compile(rb'total-models="(\d+)"')
+
+
+def next_page_info(content: bytes) -> Dict[str, str]:
+    """
+    Returns the parameters of the request for the next page of a raw
+    ModelResponseList, as per `SpectrumModelResponseList.next_info`, by
+    scanning the XML rather than parsing it
+    """
+    root = _ROOT_RE.search(content)
+    if root is None or b" error=" in root.group():
+        return {}
+
+    # The link follows the models, at the end of the document
+    tail = max(0, len(content) - 4096)
+    for link in reversed(_LINK_RE.findall(content, tail)):
+        if b'rel="next"' in link:
+            href = _HREF_RE.search(link)
+            return _parse_next_link(href.group(1).decode()) if href else {}
+    return {}
+
+
+def page_total(content: bytes) -> int:
+    """ Returns the total number of models of a raw ModelResponseList """
+    root = _ROOT_RE.search(content)
+    total = _TOTAL_RE.search(root.group()) if root else None
+    return int(total.group(1)) if total else 0
+
+
+def parse_page(content: bytes) -> PageData:
+    """
+    Parses the models of a raw ModelResponseList into a compact form, which
+    is cheap to pickle and return from a worker process. Values are interned,
+    so repeated values are only pickled once. Attribute IDs are resolved to
+    names by the parent process, which holds any registered attributes.
+    """
+    parser = etree.XMLParser(recover=True, remove_blank_text=True)
+    try:
+        root = etree.fromstring(content, parser=parser)
+    except etree.XMLSyntaxError as err:
+        raise ValueError(f"Unable to parse XML response\n\n{err}")
+
+    schemas: Dict[Tuple[str, ...], int] = {}
+    row_schemas = []
+    rows = []
+
+    if root is None or not len(root):
+        return [], row_schemas, rows
+
+    for model in root[0]:
+        ids = []
+        values = []
+        for attr in model:
+            ids.append(attr.get("id"))
+            if attr.tag.endswith("attribute-list"):
+                values.append(
+                    {
+                        instance.get("oid", ""): instance.get("value", "")
+                        for instance in attr
+                    }
+                )
+            else:
+                values.append(sys.intern(attr.text) if attr.text else None)
+
+        row_schemas.append(schemas.setdefault(tuple(ids), len(schemas)))
+        rows.append(tuple(values))
+
+    return list(schemas), row_schemas, rows
+
+
+class SpectrumParsedPage:
+    """
+    The models of a page parsed by `parse_page`. The models are converted to
+    dictionaries, as per `SpectrumModelResponseList.result`, when the page is
+    first iterated.
+    """
+
+    def __init__(self, data: PageData, resolve_attrs: bool = True) -> None:
+        schemas, self.row_schemas, self.rows = data
+        resolve = attr_id_to_name if resolve_attrs else str
+        self.names = [tuple(map(resolve, ids)) for ids in schemas]
+
+    def __repr__(self) -> str:
+        return f"SpectrumParsedPage <{len(self.rows)} models>"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.result)
+
+    @cached_property
+    def result(self) -> List[Dict]:
+        """ The parsed models, computed on first access and then retained """
+        names = self.names
+        return [
+            dict(zip(names[schema], row))
+            for schema, row in zip(self.row_schemas, self.rows)
+        ]
+
+
+class SpectrumParsePool:
+    """
+    Parses the pages of a paginated response in worker processes, so that
+    parsing large inventories uses every CPU core rather than one. Pages are
+    returned in order, and each page is parsed while the next is fetched.
+
+    A pool is used by a client given the `parse_pool` client option, by the
+    methods which yield parsed models, such as `iter_all_devices` and
+    `iter_models`. The worker processes are started on first use and are
+    kept until the pool is closed, and so the pool may be shared between
+    clients.
+
+    Examples
+    --------
+        from pyspectrum.parallel import SpectrumParsePool
+
+        with SpectrumParsePool(workers=4) as pool:
+            spectrum = SpectrumClient(parse_pool=pool)
+            for model in spectrum.iter_all_devices(page_size=5000):
+                ...
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        workers
+            The number of worker processes. Defaults to the number of CPUs.
+        executor
+            An existing executor to parse the pages with, such as a
+            `ProcessPoolExecutor` with a particular start method, instead of
+            starting one. It is not shut down when the pool is closed.
+        max_pending
+            The maximum number of pages fetched but not yet returned. Defaults
+            to twice the number of workers.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = executor
+        self._owned = executor is None
+
+    @classmethod
+    def coerce(
+        cls, value: Union[None, bool, int, Executor, "SpectrumParsePool"]
+    ) -> Optional["SpectrumParsePool"]:
+        """
+        Returns the pool given by the `parse_pool` client option: None, True
+        for a pool with a worker per CPU, a number of workers, an executor, or
+        a `SpectrumParsePool`
+        """
+        if value is None or value is False:
+            return None
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, Executor):
+            return cls(executor=value)
+        if value is True:
+            return cls()
+        return cls(workers=value)
+
+    def __repr__(self) -> str:
+        return f"SpectrumParsePool <{self.workers} workers>"
+
+    def __enter__(self) -> "SpectrumParsePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        """ The executor of the workers, which is started on first use """
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        """ Stops the worker processes, if they were started by the pool """
+        if self._owned and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def submit(self, content: bytes) -> Future:
+        """ Parses a raw ModelResponseList page in a worker process """
+        return self.executor.submit(parse_page, content)
+
+    def parse_pages(
+        self, contents: Iterable[bytes], resolve_attrs: bool = True
+    ) -> Iterator[SpectrumParsedPage]:
+        """
+        Parses each raw page in a worker process, and yields the parsed pages
+        in order. The next page is taken from `contents` while the workers
+        parse those already taken, up to `max_pending` pages.
+        """
+        pending = deque()
+        try:
+            for content in contents:
+                pending.append(self.submit(content))
+                while pending and (
+                    len(pending) >= self.max_pending or pending[0].done()
+                ):
+                    data = pending.popleft().result()
+                    yield SpectrumParsedPage(data, resolve_attrs)
+
+            while pending:
+                data = pending.popleft().result()
+                yield SpectrumParsedPage(data, resolve_attrs)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def parse_pages_async(
+        self, contents: AsyncIterable[bytes], resolve_attrs: bool = True
+    ) -> AsyncIterator[SpectrumParsedPage]:
+        """ The asyncio counterpart of `parse_pages` """
+        import asyncio
+
+        pending = deque()
+        try:
+            async for content in contents:
+                pending.append(asyncio.wrap_future(self.submit(content)))
+                while pending and (
+                    len(pending) >= self.max_pending or pending[0].done()
+                ):
+                    data = await pending.popleft()
+                    yield SpectrumParsedPage(data, resolve_attrs)
+
+            while pending:
+                data = await pending.popleft()
+                yield SpectrumParsedPage(data, resolve_attrs)
+        finally:
+            for future in pending:
+                future.cancel()
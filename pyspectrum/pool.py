@@ -0,0 +1,203 @@
+from pyspectrum.client import SpectrumClient
+from pyspectrum.responses import SpectrumFanoutResult
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    TimeoutError,
+    wait,
+)
+from typing import Optional, AnyStr, List, Dict, Union, Any
+import time
+
+
+__all__ = ["SpectrumClientPool"]
+
+
+class SpectrumClientPool:
+    """
+    A pool of clients, one per OneClick server, which runs any client method
+    across all of the servers concurrently and returns the results keyed by
+    server. Alternatively, a method can be sent to every server and the result
+    of whichever answers first returned, for failover between replicas.
+
+    Examples
+    --------
+        from pyspectrum.pool import SpectrumClientPool
+
+        with SpectrumClientPool(
+            ["https://oneclick-eu:8443", "https://oneclick-us:8443"],
+            username="admin",
+            password="P@55w0rd",
+            call_timeout=120,
+        ) as pool:
+            resp = pool.get_all_devices()
+            for server, err in resp.errors.items():
+                print(f"{server} failed: {err}")
+
+            resp = pool.first("get_model", 0x10a3b11)
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        servers: List[Union[AnyStr, Dict[str, Any]]],
+        username: Optional[AnyStr] = None,
+        password: Optional[AnyStr] = None,
+        max_workers: Optional[int] = None,
+        call_timeout: Optional[float] = None,
+        client_class: type = SpectrumClient,
+        **clientopts,
+    ) -> None:
+        """
+        Create a client for each server.
+
+        Parameters
+        ----------
+        servers
+            Either the base URL of each server, or a dictionary of `base_url`
+            and any client options specific to that server, such as
+            `username` and `password`.
+        username, password
+            The credentials used for any server which does not specify them
+        max_workers
+            The maximum number of concurrent requests across all servers
+        call_timeout
+            The number of seconds to wait for each server to respond to a
+            call, after which it is recorded as failed with a TimeoutError.
+            The call is abandoned rather than interrupted: its request
+            continues in a worker thread until it completes or reaches the
+            HTTP `timeout` client option, which should therefore be set for
+            unresponsive servers.
+        client_class
+            The client class to create for each server
+        clientopts
+            Client options, such as connection pool settings and the HTTP
+            `timeout`, shared by every server
+        """
+
+        self.call_timeout = call_timeout
+        self.clients: Dict[str, SpectrumClient] = {}
+
+        for server in servers:
+            if not isinstance(server, dict):
+                server = {"base_url": server}
+            opts = {
+                "username": username,
+                "password": password,
+                **clientopts,
+                **server,
+            }
+            self.clients[str(opts["base_url"])] = client_class(**opts)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers or min(len(self.clients), self.MAX_WORKERS) or 1
+        )
+
+    def __enter__(self):
+        """ Returns self when using Context Manager """
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """ Close every client when exiting Context Manager """
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SpectrumClientPool: {', '.join(self.clients)}"
+
+    def __getattr__(self, name: str):
+        """
+        Any client method can be called on the pool, which is equivalent to
+        `call(name, ...)`
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def call_all(*args, **kwargs) -> SpectrumFanoutResult:
+            return self.call(name, *args, **kwargs)
+
+        return call_all
+
+    def close(self) -> None:
+        """
+        Gracefully close every client and the worker threads. Any call which
+        was abandoned after exceeding the `call_timeout` is not waited for.
+        """
+        self._executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
+
+    def _submit(self, method: str, *args, **kwargs) -> Dict:
+        """ Submits the method call for every server """
+        return {
+            server: self._executor.submit(
+                getattr(client, method), *args, **kwargs
+            )
+            for server, client in self.clients.items()
+        }
+
+    def call(self, method: str, *args, **kwargs) -> SpectrumFanoutResult:
+        """
+        Calls the client method on every server concurrently. The results are
+        keyed by server in the returned object, and the failure of any server,
+        including exceeding the `call_timeout`, is recorded in `errors` rather
+        than failing the whole call.
+        """
+
+        futures = self._submit(method, *args, **kwargs)
+        wait(futures.values(), timeout=self.call_timeout)
+
+        fanout = SpectrumFanoutResult(tag="server")
+
+        for server, future in futures.items():
+            if not future.done():
+                future.cancel()
+                fanout.errors[server] = TimeoutError(
+                    f"{server} did not respond within {self.call_timeout}s"
+                )
+            elif future.exception() is not None:
+                fanout.errors[server] = future.exception()
+            else:
+                fanout.responses[server] = future.result()
+
+        return fanout
+
+    def first(self, method: str, *args, **kwargs) -> Any:
+        """
+        Calls the client method on every server concurrently and returns the
+        first successful result, which is intended for read queries against
+        replicated servers. If every server fails, or none succeed within the
+        `call_timeout`, a RuntimeError is raised from the last failure.
+        """
+
+        pending = set(self._submit(method, *args, **kwargs).values())
+        deadline = (
+            None
+            if self.call_timeout is None
+            else time.monotonic() + self.call_timeout
+        )
+        error = None
+
+        try:
+            while pending:
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    error = TimeoutError(
+                        f"No server responded within {self.call_timeout}s"
+                    )
+                    break
+
+                done, pending = wait(
+                    pending, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        raise RuntimeError(f"'{method}' failed on every server") from error
@@ -1,11 +1,26 @@
 from pyspectrum.attributes import attr_id_to_name
+from pyspectrum.export import _sort_key
 from lxml import etree
 from httpx import Response
-from typing import List, Dict
+from typing import List, Dict, Iterator, Iterable, Optional, Tuple, AnyStr
+from typing import Any, Callable
+from collections.abc import Sequence
+from functools import cached_property
+import csv
 import re
+import sys
+import time
 
 
-__all__ = ["SpectrumLandscapeResponse", "SpectrumModelResponseList"]
+__all__ = [
+    "SpectrumLandscapeResponse",
+    "SpectrumModelResponseList",
+    "SpectrumAlarmResponseList",
+    "SpectrumModelResponseStream",
+    "SpectrumModelColumns",
+    "SpectrumModelView",
+    "SpectrumFanoutResult",
+]
 
 
 def _camel_to_snake(name: str) -> str:
@@ -32,21 +47,28 @@ def _strip_ns(root: etree.Element) -> etree.Element:
 
 
 class SpectrumXMLResponse:
-    def __init__(self, response: Response, resolve_attrs: bool = True):
+    def __init__(
+        self, response: Response, resolve_attrs: bool = True, hooks=None
+    ):
         """
         Base response object which will check we have valid XML and will, by
-        default, strip the XML namespaces to avoid issues with parsing
+        default, strip the XML namespaces to avoid issues with parsing. The
+        time taken by each phase of parsing is reported to the instrumentation
+        `hooks` of the client, if any.
         """
 
         # Attempt to parse the response payload as XML
 
         _xparser = etree.XMLParser(recover=True, remove_blank_text=True)
+        start = time.perf_counter()
 
         try:
             root = etree.fromstring(response.content, parser=_xparser)
         except etree.XMLSyntaxError as err:
             raise ValueError(f"Unable to parse XML response\n\n{err}")
 
+        parsed = time.perf_counter()
+
         # Store original HTTPX response object
         self.response = response
 
@@ -56,6 +78,25 @@ class SpectrumXMLResponse:
         # Store the option to resolve attribute names
         self.resolve_attrs = resolve_attrs
 
+        self.hooks = hooks
+        if hooks is not None:
+            stripped = time.perf_counter()
+            hooks.on_parse(response, "xml", parsed - start, self._size())
+            hooks.on_parse(response, "strip_ns", stripped - parsed)
+
+    def _size(self) -> int:
+        """ The number of models in the response """
+        return 0
+
+    def _timed(self, phase: str, func: Callable):
+        """ Calls `func`, reporting the time taken to the hooks, if any """
+        if self.hooks is None:
+            return func()
+        start = time.perf_counter()
+        value = func()
+        self.hooks.on_parse(self.response, phase, time.perf_counter() - start)
+        return value
+
     def __repr__(self) -> str:
         """ Magic repr method for Response class """
         return f"Response <Success: {str(not self.response.is_error)}>"
@@ -71,9 +112,12 @@ class SpectrumLandscapeResponse(SpectrumXMLResponse):
     def total_landscapes(self) -> int:
         return self.xml.get("total-landscapes")
 
-    @property
+    @cached_property
     def result(self) -> List[Dict[str, str]]:
-        """ Parsed output of a Spectrum LandscapeResponse object """
+        """
+        Parsed output of a Spectrum LandscapeResponse object. The output is
+        computed on first access and then retained.
+        """
         result = []
         for landscape in self.xml:
             subdict = {}
@@ -97,6 +141,22 @@ class SpectrumModelResponseList(SpectrumXMLResponse):
     start_re = re.compile(r"start=(\d+)")
     throttle_re = re.compile(r"throttlesize=(\d+)")
 
+    @classmethod
+    def empty(cls, resolve_attrs: bool = True) -> "SpectrumModelResponseList":
+        """
+        A ModelResponseList without any models, for a request which need not
+        be sent
+        """
+        return cls(
+            Response(
+                200,
+                content=b'<model-response-list error="EndOfResults" '
+                b'throttle="0" total-models="0"><model-responses/>'
+                b"</model-response-list>",
+            ),
+            resolve_attrs,
+        )
+
     @property
     def total_models(self) -> int:
         return self.xml.get("total-models")
@@ -111,47 +171,568 @@ class SpectrumModelResponseList(SpectrumXMLResponse):
         Provides the necessary parameters to make a subsequent request if not
         all devices were returned.
         """
-        next_info = {}
-        if not self.xml.get("error"):
-            link = self.xml[1].get("href")
-            next_info["id"] = self.id_re.search(link).group(1)
-            next_info["start"] = self.start_re.search(link).group(1)
-            next_info["throttle_size"] = self.throttle_re.search(link).group(1)
-        return next_info
+        link = self.xml.find("link")
+        if self.xml.get("error") or link is None:
+            return {}
+        return _parse_next_link(link.get("href"))
+
+    def extend(self, other: "SpectrumModelResponseList") -> None:
+        """
+        Moves the models of another ModelResponseList into this one, for
+        example to merge the pages of a paginated response. Afterwards, the
+        `throttle` and `total_models` values reflect the number of models held
+        and the pagination state (`next_info`) is taken from `other`.
+        """
+
+        models = self.xml[0]
+        models.extend(other.xml[0])
+
+        self._reset()
+        other._reset()
+
+        self.xml.set("throttle", str(len(models)))
+        self.xml.set("total-models", str(len(models)))
+
+        if other.xml.get("error") is None:
+            self.xml.attrib.pop("error", None)
+        else:
+            self.xml.set("error", other.xml.get("error"))
+
+        link = self.xml.find("link")
+        if link is not None:
+            self.xml.remove(link)
+
+        other_link = other.xml.find("link")
+        if other_link is not None:
+            self.xml.append(other_link)
+
+    def _size(self) -> int:
+        return len(self.xml[0]) if len(self.xml) else 0
+
+    @property
+    def model_handles(self) -> List[str]:
+        """
+        The handle of each model in the response, read without parsing any of
+        the model attributes
+        """
+        return [model.get("mh") for model in self.xml[0]]
+
+    @cached_property
+    def models(self) -> "SpectrumModelView":
+        """
+        Lazy sequence of the models in the response. Each model is only
+        parsed when it is first indexed or iterated over, so consumers which
+        only need some of the models do not pay to parse all of them.
+        """
+        return SpectrumModelView(self.xml[0], self.resolve_attrs)
+
+    @cached_property
+    def result(self) -> List[Dict[str, str]]:
+        """
+        Parsed output of a Spectrum ModelResponseList object. The output is
+        computed on first access and then retained, so it should not be
+        modified by the caller.
+        """
+        return self._timed("models", lambda: list(self.models))
+
+    @property
+    def columns(self) -> "SpectrumModelColumns":
+        """
+        Columnar output of a Spectrum ModelResponseList object, which is far
+        more compact than `result` for a large number of models.
+        """
+        return self._timed(
+            "columns",
+            lambda: SpectrumModelColumns.from_elements(
+                self.xml[0], self.resolve_attrs
+            ),
+        )
+
+    def to_snapshot(self, filepath: AnyStr) -> int:
+        """
+        Writes the models to a binary snapshot file, which can be opened with
+        `SpectrumSnapshot`. Returns the number of models written.
+        """
+        from pyspectrum.snapshot import write_snapshot
+
+        return write_snapshot(self.models, filepath)
+
+    def _reset(self) -> None:
+        """ Discards any retained output after the models have changed """
+        self.__dict__.pop("models", None)
+        self.__dict__.pop("result", None)
+
+
+class SpectrumAlarmResponseList(SpectrumModelResponseList):
+    """
+    Subclass which adds properties for parsing the output of Spectrum's
+    AlarmResponseList model. Alarms are parsed, paginated and converted to
+    columns as per the models of a ModelResponseList.
+    """
+
+    def __init__(
+        self, response: Response, resolve_attrs: bool = True, hooks=None
+    ):
+        super().__init__(response, resolve_attrs, hooks)
+
+        # A response without any alarms has no <alarm-responses> element
+        if self.xml.find("alarm-responses") is None:
+            self.xml.insert(0, etree.Element("alarm-responses"))
+
+    @property
+    def total_alarms(self) -> int:
+        return self.xml.get("total-alarms")
+
+    # The pagination of the client reads the size of the result set from the
+    # `total_models` of the first page
+
+    total_models = total_alarms
+
+    @property
+    def alarm_ids(self) -> List[str]:
+        """
+        The ID of each alarm in the response, read without parsing any of the
+        alarm attributes
+        """
+        return [alarm.get("id") for alarm in self.xml[0]]
+
+    def extend(self, other: "SpectrumAlarmResponseList") -> None:
+        super().extend(other)
+        self.xml.set("total-alarms", self.xml.attrib.pop("total-models"))
+
+
+class SpectrumModelView(Sequence):
+    """
+    Read-only sequence of the models in a ModelResponseList, which converts
+    each <model> element to a dictionary when it is first accessed and then
+    retains the dictionary. The length is known without parsing any models.
+    """
+
+    __slots__ = ("_parent", "_resolve_attrs", "_elements", "_parsed")
+
+    def __init__(
+        self, parent: etree.Element, resolve_attrs: bool = True
+    ) -> None:
+        """ Create a view of the <model> elements of the parent element """
+        self._parent = parent
+        self._resolve_attrs = resolve_attrs
+        self._elements = None
+        self._parsed = [None] * len(parent)
+
+    def __repr__(self) -> str:
+        return f"SpectrumModelView <{len(self)} models>"
+
+    def __len__(self) -> int:
+        return len(self._parsed)
+
+    def __getitem__(self, index):
+        """ Returns the parsed model(s) at the index or slice """
+
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+
+        model = self._parsed[index]
+        if model is None:
+            # Indexing the parent element directly would walk the children
+            # on every lookup, so a list of the elements is made once
+            if self._elements is None:
+                self._elements = list(self._parent)
+            model = self._parsed[index] = _model_to_dict(
+                self._elements[index], self._resolve_attrs
+            )
+        return model
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        parsed = self._parsed
+        for idx, elem in enumerate(self._parent):
+            model = parsed[idx]
+            if model is None:
+                model = parsed[idx] = _model_to_dict(elem, self._resolve_attrs)
+            yield model
+
+
+class SpectrumModelColumns:
+    """
+    Columnar representation of parsed models. The schema of attribute IDs and
+    names is held once, and the values of each attribute are held in a list
+    per column, with repeated string values shared rather than duplicated. A
+    model without a value for an attribute has `None` in that column.
+
+    Instances are created from a ModelResponseList page with the `columns`
+    property, or from any iterable of parsed models, for example:
+
+        cols = SpectrumModelColumns.concat(
+            page.columns for page in spectrum.iter_device_pages()
+        )
+        cols = SpectrumModelColumns.from_models(spectrum.iter_all_devices())
+    """
+
+    __slots__ = (
+        "attr_ids",
+        "names",
+        "data",
+        "_index",
+        "_length",
+        "_resolve",
+    )
+
+    def __init__(self, resolve_attrs: bool = True) -> None:
+        """ Create an empty set of columns """
+        self.attr_ids: List[str] = []
+        self.names: List[str] = []
+        self.data: List[list] = []
+        self._index: Dict[str, int] = {}
+        self._length = 0
+        self._resolve = attr_id_to_name if resolve_attrs else str
+
+    def __len__(self) -> int:
+        """ The number of models (rows) """
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"SpectrumModelColumns <{self._length} x {len(self.names)}>"
+
+    def __getitem__(self, name: str) -> list:
+        """ Returns the values of the named column """
+        return self.data[self.names.index(name)]
+
+    def _column(self, attr_id: str) -> list:
+        """ Returns the column for the attribute ID, adding it if required """
+        col_idx = self._index.get(attr_id)
+        if col_idx is None:
+            col_idx = self._index[attr_id] = len(self.attr_ids)
+            self.attr_ids.append(attr_id)
+            self.names.append(self._resolve(attr_id))
+            self.data.append([None] * self._length)
+        return self.data[col_idx]
+
+    def _pad(self) -> None:
+        """ Completes the current row with `None` for any missing values """
+        self._length += 1
+        for column in self.data:
+            if len(column) < self._length:
+                column.append(None)
+
+    def append_element(self, model: etree.Element) -> None:
+        """ Adds a row from a <model> element of a ModelResponseList """
+        row = self._length
+        for attr in model:
+            value = _attr_data(attr)
+            if isinstance(value, str):
+                value = sys.intern(value)
+
+            # A repeated attribute replaces the value, as per `result`
+            column = self._column(attr.get("id"))
+            if len(column) > row:
+                column[row] = value
+            else:
+                column.append(value)
+        self._pad()
+
+    def append_model(self, model: Dict) -> None:
+        """ Adds a row from a parsed model dictionary """
+        for name, value in model.items():
+            if isinstance(value, str):
+                value = sys.intern(value)
+            self._column(name).append(value)
+        self._pad()
+
+    def extend(self, other: "SpectrumModelColumns") -> None:
+        """ Appends the rows of another set of columns """
+        for attr_id, column in zip(other.attr_ids, other.data):
+            self._column(attr_id).extend(column)
+        self._length += len(other)
+        for column in self.data:
+            column.extend([None] * (self._length - len(column)))
+
+    @classmethod
+    def from_elements(
+        cls, models: Iterable[etree.Element], resolve_attrs: bool = True
+    ) -> "SpectrumModelColumns":
+        """ Create the columns from <model> elements """
+        cols = cls(resolve_attrs)
+        for model in models:
+            cols.append_element(model)
+        return cols
+
+    @classmethod
+    def from_models(cls, models: Iterable[Dict]) -> "SpectrumModelColumns":
+        """
+        Create the columns from parsed model dictionaries, for example those
+        yielded by `iter_all_devices`. The dictionary keys are used as-is.
+        """
+        cols = cls(resolve_attrs=False)
+        for model in models:
+            cols.append_model(model)
+        return cols
+
+    @classmethod
+    def concat(
+        cls, columns: Iterable["SpectrumModelColumns"]
+    ) -> "SpectrumModelColumns":
+        """
+        Combine multiple sets of columns, for example from each page, into a
+        new set of columns. The given columns are not modified.
+        """
+        combined = None
+        for cols in columns:
+            if combined is None:
+                combined = cls()
+                combined._resolve = cols._resolve
+            combined.extend(cols)
+        return combined if combined is not None else cls()
+
+    def rows(self) -> Iterator[Tuple]:
+        """ Yields the values of each model as a tuple, ordered by `names` """
+        return zip(*self.data)
+
+    def to_dicts(self) -> Iterator[Dict]:
+        """ Yields each model as a dictionary of names and values """
+        names = self.names
+        for row in self.rows():
+            yield dict(zip(names, row))
+
+    def to_dict(self) -> Dict[str, list]:
+        """
+        Returns a dictionary of names and column values, which can be passed
+        directly to `pandas.DataFrame`, `numpy` or other columnar libraries.
+        """
+        return dict(zip(self.names, self.data))
+
+    def to_pandas(self):
+        """ Returns the columns as a `pandas.DataFrame` """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("pandas must be installed to use to_pandas()")
+        return pandas.DataFrame(self.to_dict(), columns=self.names)
+
+    def to_csv(
+        self,
+        filepath: AnyStr,
+        exclude: Optional[List[str]] = None,
+        orderby: Optional[str] = None,
+    ) -> None:
+        """
+        Store the models to a CSV file, as per `SpectrumClient.to_csv`. Only
+        the column order and row indexes are rearranged, the values are not
+        copied or modified.
+        """
+        exclude = exclude or []
+        col_idxs = [
+            idx for idx, name in enumerate(self.names) if name not in exclude
+        ]
+        columns = [self.data[idx] for idx in col_idxs]
+        rows = zip(*columns)
+
+        if orderby in self.names and orderby not in exclude:
+            key_col = self[orderby]
+            order = sorted(
+                range(self._length), key=lambda i: _sort_key(key_col[i])
+            )
+            rows = (tuple(col[i] for col in columns) for i in order)
+
+        with open(filepath, "w+", newline="") as outfile:
+            csv_wr = csv.writer(outfile, quoting=csv.QUOTE_NONNUMERIC)
+            csv_wr.writerow([self.names[idx] for idx in col_idxs])
+            csv_wr.writerows(rows)
+
+
+class SpectrumFanoutResult:
+    """
+    The responses of a request which was issued to multiple targets, such as
+    each landscape, keyed by target in the order the targets were given. A
+    failure for any target is recorded in `errors` instead of being raised.
+    """
+
+    def __init__(self, tag: str) -> None:
+        """
+        Parameters
+        ----------
+        tag
+            The key used to identify the target of each model in `result`
+        """
+        self.tag = tag
+        self.responses: Dict[Any, Any] = {}
+        self.errors: Dict[Any, Exception] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"SpectrumFanoutResult <{len(self.responses)} succeeded, "
+            f"{len(self.errors)} failed>"
+        )
+
+    @property
+    def ok(self) -> bool:
+        """ True if the request succeeded for every target """
+        return not self.errors
 
     @property
     def result(self) -> List[Dict[str, str]]:
-        """ Parsed output of a Spectrum ModelResponseList object """
+        """
+        The parsed models of every successful response, in target order, each
+        tagged with the target it was returned from.
+        """
+        return [
+            {**model, self.tag: target}
+            for target, response in self.responses.items()
+            for model in response.result
+        ]
 
-        parsed_models = []
 
-        # Parse each returned model
-        for model in self.xml[0]:
+class SpectrumModelResponseStream:
+    """
+    Incrementally parses a streamed Spectrum ModelResponseList. Iterating over
+    the object feeds the response body, as it is received, into an lxml pull
+    parser and yields each model as soon as its element is complete. Processed
+    elements are discarded, so memory use does not grow with the size of the
+    response.
+
+    The `total_models`, `throttle` and `next_info` properties are available
+    once the response has been fully iterated.
+
+    Examples
+    --------
+        with spectrum.api.stream("GET", "/devices", params=params) as res:
+            page = SpectrumModelResponseStream(res)
+            for model in page:
+                print(model["model_name"])
+    """
 
-            model_dict = {}
+    def __init__(
+        self, response: Response, resolve_attrs: bool = True, hooks=None
+    ):
+        """ Store the streamed HTTPX response object """
+        self.response = response
+        self.resolve_attrs = resolve_attrs
+        self.hooks = hooks
+        self.attrib = {}
+        self.link = None
 
-            for attr in model:
+    def __repr__(self) -> str:
+        """ Magic repr method for Response class """
+        return f"Response <Success: {str(not self.response.is_error)}>"
 
-                # Try to resolve the attribute ID to corresponding name
-                attr_name = (
-                    attr_id_to_name(attr.get("id"))
-                    if self.resolve_attrs
-                    else attr.get("id")
-                )
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """ Yields each parsed model as the response body is received """
+        models = self._iter_models()
+        return models if self.hooks is None else self._iter_timed(models)
 
-                # Some data may be an attribute list, in which case this is
-                # handled by adding a dictionary of the unique OIDs and values
-                attr_data = (
-                    {
-                        instance.get("oid", ""): instance.get("value", "")
-                        for instance in attr
-                    }
-                    if attr.tag == "attribute-list"
-                    else attr.text
-                )
+    def _iter_timed(self, models: Iterator[Dict]) -> Iterator[Dict]:
+        """
+        Yields each model, reporting the time spent receiving and parsing the
+        response, but not processing the models, to the hooks
+        """
+        seconds, count = 0.0, 0
+        while True:
+            start = time.perf_counter()
+            model = next(models, None)
+            seconds += time.perf_counter() - start
+            if model is None:
+                break
+            count += 1
+            yield model
+        self.hooks.on_parse(self.response, "stream", seconds, count)
+
+    def _iter_models(self) -> Iterator[Dict[str, str]]:
+        parser = etree.XMLPullParser(
+            events=("start", "end"), recover=True, remove_blank_text=True
+        )
+
+        for chunk in self.response.iter_bytes():
+            parser.feed(chunk)
+            yield from self._read_events(parser)
+
+        parser.close()
+        yield from self._read_events(parser)
+
+    def _read_events(self, parser: etree.XMLPullParser) -> Iterator[Dict]:
+        """
+        Handles the parser events received so far. Namespaces are removed from
+        each element as it is completed, so `_strip_ns` is not required.
+        """
 
-                model_dict.update({attr_name: attr_data})
+        for event, elem in parser.read_events():
 
-            parsed_models.append(model_dict)
+            if event == "start":
+                # The root element provides the ModelResponseList attributes
+                if elem.getparent() is None:
+                    self.attrib = dict(elem.attrib)
+                continue
 
-        return parsed_models
+            elem.tag = etree.QName(elem).localname
+
+            if elem.tag == "model":
+                yield _model_to_dict(elem, self.resolve_attrs)
+
+                # Discard the processed model and any preceding siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+            elif elem.tag == "link":
+                self.link = elem.get("href")
+
+    @property
+    def total_models(self) -> int:
+        return self.attrib.get("total-models")
+
+    @property
+    def throttle(self) -> int:
+        return self.attrib.get("throttle")
+
+    @property
+    def next_info(self):
+        """
+        Provides the necessary parameters to make a subsequent request if not
+        all devices were returned.
+        """
+        if self.attrib.get("error") or self.link is None:
+            return {}
+        return _parse_next_link(self.link)
+
+
+def _parse_next_link(link: str) -> Dict[str, str]:
+    """
+    Extracts the parameters for the subsequent request from the `href` of a
+    ModelResponseList next-page link.
+    """
+    cls = SpectrumModelResponseList
+    return {
+        "id": cls.id_re.search(link).group(1),
+        "start": cls.start_re.search(link).group(1),
+        "throttle_size": cls.throttle_re.search(link).group(1),
+    }
+
+
+def _model_to_dict(model: etree.Element, resolve_attrs: bool) -> Dict:
+    """
+    Parses a single <model> element of a ModelResponseList into a dictionary
+    of attribute names (or IDs) and values.
+    """
+
+    model_dict = {}
+
+    for attr in model:
+
+        # Try to resolve the attribute ID to corresponding name
+        attr_id = attr.get("id")
+        attr_name = attr_id_to_name(attr_id) if resolve_attrs else attr_id
+
+        model_dict.update({attr_name: _attr_data(attr)})
+
+    return model_dict
+
+
+def _attr_data(attr: etree.Element):
+    """
+    Returns the value of an attribute element. Some data may be an attribute
+    list, in which case this is handled by returning a dictionary of the
+    unique OIDs and values.
+    """
+    if attr.tag == "attribute-list":
+        return {
+            instance.get("oid", ""): instance.get("value", "")
+            for instance in attr
+        }
+    return attr.text
@@ -0,0 +1,214 @@
+from httpx import Response, TransportError
+from typing import Optional, Iterable, Union
+from threading import Lock
+import random
+import time
+
+
+__all__ = ["RetryPolicy", "TokenBucket"]
+
+
+# Response status codes which indicate a transient server condition
+
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Methods which can safely be repeated
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# POST endpoints which only search and so can safely be repeated
+
+SEARCH_PATHS = ("/models", "/alarms")
+
+
+class RetryPolicy:
+    """
+    Determines whether a failed request is retried, and how long to wait
+    before retrying it.
+
+    A request is retried when it raises a transport error, such as a connect
+    or read timeout, or the response status is one of `status_codes`. Only
+    idempotent requests, and POST requests to the search endpoints, are
+    retried. The delay before each retry grows exponentially from `backoff`
+    up to `max_backoff`, with full jitter, unless the server specifies a
+    `Retry-After` delay.
+
+    Examples
+    --------
+        from pyspectrum.retry import RetryPolicy
+        spectrum = SpectrumClient(retries=RetryPolicy(retries=5, backoff=1))
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        search_paths: Iterable[str] = SEARCH_PATHS,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        retries
+            The maximum number of times a request is retried
+        backoff
+            The delay, in seconds, before the first retry
+        max_backoff
+            The maximum delay, in seconds, between retries
+        jitter
+            Randomize each delay between zero and its computed value, so that
+            concurrent clients do not retry in lockstep
+        status_codes
+            The response status codes which are retried
+        methods
+            The request methods which are retried
+        search_paths
+            The endpoints for which POST requests are also retried
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.search_paths = tuple(search_paths)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(retries={self.retries}, "
+            f"backoff={self.backoff}, max_backoff={self.max_backoff})"
+        )
+
+    @classmethod
+    def coerce(
+        cls, retries: Union[None, int, "RetryPolicy"]
+    ) -> "RetryPolicy":
+        """ Returns a policy from a number of retries or an existing policy """
+        if isinstance(retries, cls):
+            return retries
+        return cls(retries=retries or 0)
+
+    def is_retryable(self, method: str, url: str) -> bool:
+        """ Returns True if the request can safely be repeated """
+        method = method.upper()
+        if method in self.methods:
+            return True
+        return method == "POST" and str(url).rstrip("/").endswith(
+            self.search_paths
+        )
+
+    def should_retry(
+        self,
+        method: str,
+        url: str,
+        attempt: int,
+        response: Optional[Response] = None,
+        exc: Optional[Exception] = None,
+    ) -> bool:
+        """
+        Returns True if the request should be retried following the response
+        or exception of the given attempt, numbered from zero.
+        """
+        if attempt >= self.retries or not self.is_retryable(method, url):
+            return False
+        if exc is not None:
+            return isinstance(exc, TransportError)
+        return response is not None and (
+            response.status_code in self.status_codes
+        )
+
+    def delay(
+        self, attempt: int, response: Optional[Response] = None
+    ) -> float:
+        """ Returns the number of seconds to wait before the next attempt """
+        retry_after = response is not None and response.headers.get(
+            "Retry-After"
+        )
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter. Each request takes a token from the bucket,
+    which refills at `rate` tokens per second up to `capacity`, allowing
+    short bursts. When the bucket is empty, the request waits until a token is
+    available.
+
+    A single bucket may be shared by several clients, including clients in
+    different threads, to limit their combined request rate.
+
+    Examples
+    --------
+        from pyspectrum.retry import TokenBucket
+        spectrum = SpectrumClient(rate_limit=TokenBucket(rate=20, capacity=40))
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Parameters
+        ----------
+        rate
+            The number of requests per second
+        capacity
+            The maximum burst of requests. Defaults to `rate`.
+        """
+        if rate <= 0:
+            raise ValueError("The rate must be greater than zero")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(rate={self.rate}, "
+            f"capacity={self.capacity})"
+        )
+
+    @classmethod
+    def coerce(
+        cls, rate_limit: Union[None, float, "TokenBucket"]
+    ) -> Optional["TokenBucket"]:
+        """ Returns a bucket from a rate, or an existing bucket """
+        if rate_limit is None or isinstance(rate_limit, cls):
+            return rate_limit
+        return cls(rate=rate_limit)
+
+    def reserve(self) -> float:
+        """
+        Takes a token, returning the number of seconds to wait before it may
+        be used. Tokens are reserved in order, so waiting callers are served
+        first come, first served.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """ Blocks until a token is available """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """ Waits, without blocking the event loop, for a token """
+        import asyncio
+
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
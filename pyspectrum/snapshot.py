@@ -0,0 +1,293 @@
+from typing import Optional, List, Dict, Iterable, Iterator, AnyStr, Union
+from array import array
+from bisect import bisect_left
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+__all__ = ["SpectrumSnapshot", "write_snapshot"]
+
+
+# File header: magic, version, number of models, columns, strings and indexed
+# handles, and the offsets of the column names, string offsets, string data,
+# column data and handle index sections
+
+_MAGIC = b"PYSPSNAP"
+_VERSION = 1
+_HEADER = struct.Struct("<8s5I4x5Q")
+
+# String ID of a value which a model does not have
+
+_MISSING = 0xFFFFFFFF
+
+# Prefix of a string which holds a JSON encoded value, such as an attribute
+# list, rather than a string value
+
+_JSON_PREFIX = "\x00"
+
+_HANDLE_KEYS = ("model_handle", "0x129fa")
+
+
+def _check_byteorder() -> None:
+    """
+    Snapshots are read and written with native arrays in little-endian order,
+    and so are only supported on little-endian platforms. This is checked
+    when a snapshot is used, so that the module can always be imported.
+    """
+    if sys.byteorder != "little":  # pragma: no cover
+        raise RuntimeError(
+            "Spectrum snapshots require a little-endian platform"
+        )
+
+
+def write_snapshot(
+    models: Iterable[Dict],
+    filepath: AnyStr,
+    fieldnames: Optional[List[str]] = None,
+) -> int:
+    """
+    Writes parsed models to a binary snapshot file, which can be opened with
+    `SpectrumSnapshot`. Returns the number of models written.
+
+    The values are held in columns, one per attribute, each of which is an
+    array of IDs into a table of the distinct strings. An index of the models
+    sorted by model handle allows a model to be found without reading the
+    rest of the file.
+
+    Parameters
+    ----------
+    models
+        Iterable of parsed model dictionaries
+    filepath
+        The path of the snapshot file
+    fieldnames
+        The attributes to write, in order. If not given, every attribute of
+        the models is written.
+    """
+    _check_byteorder()
+
+    strings: Dict[str, int] = {}
+    columns: Dict[str, array] = {
+        name: array("I") for name in (fieldnames or [])
+    }
+    count = 0
+
+    def string_id(value) -> int:
+        if not isinstance(value, str):
+            value = _JSON_PREFIX + json.dumps(value)
+        return strings.setdefault(value, len(strings))
+
+    for model in models:
+        for name, value in model.items():
+            column = columns.get(name)
+            if column is None:
+                if fieldnames:
+                    continue
+                column = columns[name] = array("I", [_MISSING]) * count
+            column.append(string_id(value))
+
+        count += 1
+        for column in columns.values():
+            if len(column) < count:
+                column.append(_MISSING)
+
+    handle_col = next(
+        (columns[key] for key in _HANDLE_KEYS if key in columns), None
+    )
+    names = [string_id(name) for name in columns]
+
+    # Encode the string table
+
+    data = bytearray()
+    offsets = array("Q", [0])
+    for value in strings:
+        data += value.encode()
+        offsets.append(len(data))
+
+    # Index of (handle, row) sorted by handle
+
+    table = list(strings)
+    index = sorted(
+        (int(table[sid], 16), row)
+        for row, sid in enumerate(handle_col or ())
+        if sid != _MISSING
+    )
+    index_handles = array("Q", (handle for handle, _ in index))
+    index_rows = array("I", (row for _, row in index))
+
+    sections = [
+        array("I", names).tobytes(),
+        offsets.tobytes(),
+        bytes(data),
+        b"".join(column.tobytes() for column in columns.values()),
+        index_handles.tobytes() + index_rows.tobytes(),
+    ]
+
+    # Each section is aligned to 8 bytes so that it can be read in place
+
+    section_offsets = []
+    position = _HEADER.size
+    for section in sections:
+        section_offsets.append(position)
+        position += -(-len(section) // 8) * 8
+
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, "wb") as fh:
+        fh.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                count,
+                len(columns),
+                len(strings),
+                len(index),
+                *section_offsets,
+            )
+        )
+        for offset, section in zip(section_offsets, sections):
+            fh.write(b"\x00" * (offset - fh.tell()))
+            fh.write(section)
+
+    os.replace(tmp_filepath, filepath)
+    return count
+
+
+class SpectrumSnapshot:
+    """
+    Read-only view of a snapshot file written by `write_snapshot`. The file is
+    memory-mapped, so opening it is immediate regardless of its size, and
+    only the parts of the file that are used are read from disk. A model is
+    found by handle using a binary search of the handle index.
+
+    Examples
+    --------
+        from pyspectrum.snapshot import SpectrumSnapshot
+
+        with SpectrumSnapshot("inventory.snap") as snapshot:
+            print(len(snapshot), snapshot.fieldnames)
+            print(snapshot.get("0x10a3b11"))
+            for model in snapshot:
+                ...
+    """
+
+    def __init__(self, filepath: AnyStr) -> None:
+        """ Opens and memory-maps the snapshot file """
+
+        _check_byteorder()
+
+        with open(filepath, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buf = self._buf = memoryview(self._mmap)
+        if len(buf) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{filepath} is not a Spectrum snapshot file")
+
+        (
+            magic,
+            version,
+            self._count,
+            n_columns,
+            n_strings,
+            n_index,
+            off_names,
+            off_offsets,
+            off_data,
+            off_columns,
+            off_index,
+        ) = _HEADER.unpack_from(buf)
+
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{filepath} is not a Spectrum snapshot file")
+
+        def section(offset: int, length: int, fmt: str) -> memoryview:
+            size = struct.calcsize(fmt)
+            return buf[offset : offset + length * size].cast(fmt)
+
+        self._offsets = section(off_offsets, n_strings + 1, "Q")
+        self._data = buf[off_data : off_data + self._offsets[n_strings]]
+        self._columns = section(off_columns, n_columns * self._count, "I")
+
+        self._handles = section(off_index, n_index, "Q")
+        self._rows = section(off_index + n_index * 8, n_index, "I")
+
+        self.fieldnames: List[str] = [
+            self._string(sid) for sid in section(off_names, n_columns, "I")
+        ]
+
+    def __repr__(self) -> str:
+        return f"SpectrumSnapshot <{self._count} models>"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "SpectrumSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getitem__(self, row: int) -> Dict:
+        """ Returns the model in the given row, in the order written """
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("snapshot row out of range")
+
+        model = {}
+        for col, name in enumerate(self.fieldnames):
+            sid = self._columns[col * self._count + row]
+            if sid != _MISSING:
+                model[name] = self._string(sid)
+        return model
+
+    def __iter__(self) -> Iterator[Dict]:
+        for row in range(self._count):
+            yield self[row]
+
+    def __contains__(self, model_handle: Union[int, str]) -> bool:
+        return self._find(model_handle) is not None
+
+    def get(self, model_handle: Union[int, str]) -> Optional[Dict]:
+        """ Returns the model with the given handle, or None """
+        row = self._find(model_handle)
+        return None if row is None else self[row]
+
+    def column(self, name: str) -> List:
+        """ Returns the values of an attribute for every model """
+        col = self.fieldnames.index(name)
+        ids = self._columns[col * self._count : (col + 1) * self._count]
+        return [None if sid == _MISSING else self._string(sid) for sid in ids]
+
+    def close(self) -> None:
+        """ Releases the memory-mapped file """
+        for name in ("_offsets", "_data", "_columns", "_handles", "_rows"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, "_buf", None) is not None:
+            self._buf.release()
+            self._buf = None
+        self._mmap.close()
+
+    def _find(self, model_handle: Union[int, str]) -> Optional[int]:
+        """ Returns the row of the model with the given handle, or None """
+        if isinstance(model_handle, str):
+            model_handle = int(model_handle, 16)
+        pos = bisect_left(self._handles, model_handle)
+        if pos < len(self._handles) and self._handles[pos] == model_handle:
+            return self._rows[pos]
+        return None
+
+    def _string(self, sid: int):
+        """ Returns the value of a string ID """
+        value = str(
+            self._data[self._offsets[sid] : self._offsets[sid + 1]], "utf-8"
+        )
+        if value.startswith(_JSON_PREFIX):
+            return json.loads(value[1:])
+        return value
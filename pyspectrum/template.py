@@ -1,15 +1,40 @@
 import os
 import re
 from dataclasses import dataclass
-from jinja2 import FileSystemLoader, Environment
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from typing import List, Union
+from pyspectrum.filters import parse_filter, normalize_filter, FilterExpr
+from pyspectrum.filters import _parse_filter_cached
+
+# Maximum number of rendered model search payloads to cache
+
+PAYLOAD_CACHE_SIZE = 256
 
 PATH = os.path.dirname(os.path.abspath(__file__))
 
-TEMPLATE_ENV = Environment(
-    autoescape=False,
-    loader=FileSystemLoader(os.path.join(PATH, "templates")),
-    trim_blocks=False,
-)
+
+@lru_cache(maxsize=None)
+def template_env():
+    """
+    Returns the Jinja2 environment of the payload templates. Jinja2 is only
+    required for payloads which the direct payload writers do not support, and
+    so it is imported, and the environment created, on the first call.
+    """
+    from jinja2 import FileSystemLoader, Environment
+
+    return Environment(
+        autoescape=False,
+        loader=FileSystemLoader(os.path.join(PATH, "templates")),
+        trim_blocks=False,
+    )
+
+
+def __getattr__(name: str):
+    # The environment was previously created at import as TEMPLATE_ENV
+    if name == "TEMPLATE_ENV":
+        return template_env()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
@@ -17,11 +42,12 @@ class SpectrumTemplateFiles:
     """ Maps the request to template file """
 
     model_search = "model_search.j2"
+    model_handles = "model_handles.j2"
 
 
 def _render_template(template_file, context):
     """ Helper function to return the correct Jinja2 temaplate file """
-    return TEMPLATE_ENV.get_template(template_file).render(context)
+    return template_env().get_template(template_file).render(context)
 
 
 def model_search_xml(**params):
@@ -31,3 +57,294 @@ def model_search_xml(**params):
     """
     xml_string = _render_template(SpectrumTemplateFiles.model_search, params)
     return re.sub(r"^$\n", "", xml_string, flags=re.MULTILINE)
+
+
+# -----------------------------------------------------------------------------
+#                      Direct Payload Writers
+# -----------------------------------------------------------------------------
+
+# The payload writers below produce output identical to the encoded Jinja2
+# templates, without the rendering and blank line removal passes. Any
+# parameter which the writer does not support falls back to the template.
+
+_REQUEST_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<rs:model-request xmlns:rs="http://www.ca.com/spectrum/restful/schema/'
+    'request" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'throttlesize="{throttlesize}" xsi:schemaLocation="http://www.ca.com/'
+    'spectrum/restful/schema/request ../../../xsd/Request.xsd ">\n'
+    "    <rs:target-models>"
+)
+
+_SEARCH_CRITERIA = (
+    "\n        <rs:models-search>"
+    '\n            <rs:search-criteria xmlns="http://www.ca.com/spectrum/'
+    'restful/schema/filter">'
+)
+
+_INDENT = "\n                "
+
+_SEARCH_PARAMS = frozenset(
+    {
+        "filter",
+        "filter_xml",
+        "req_attrs",
+        "throttlesize",
+        "devices_only",
+        "interfaces_only",
+        "child_models",
+        "parent_models",
+        "relation",
+    }
+)
+
+_HANDLES_PARAMS = frozenset({"model_handles", "req_attrs", "throttlesize"})
+
+
+def _hex_output(value: Union[int, str]) -> str:
+    """ Equivalent of the `hex_output` template macro """
+    return "%#x" % (value if isinstance(value, int) else int(value, 16))
+
+
+def _write_filter(exp: dict, parts: List[str]) -> None:
+    """
+    Equivalent of the `filter_exp` template macro. The values are escaped, as
+    per `FilterExpr.to_xml`, so that a string filter and the equivalent
+    filter expression produce the same payload.
+    """
+    for key, value in exp.items():
+        parts.append(f"\n<{key}>")
+        if isinstance(value[0], str):
+            parts.append(
+                f'\n<attribute id="{value[0]}">'
+                f"\n<value>{escape(value[1])}</value>"
+                f"\n</attribute>"
+            )
+        else:
+            for item in value:
+                _write_filter(item, parts)
+        parts.append(f"\n</{key}>")
+
+
+def _write_requested_attrs(req_attrs, parts: List[str]) -> None:
+    """ Appends the requested attributes and closes the model request """
+    for attr in req_attrs:
+        parts.append(
+            f'\n    <rs:requested-attribute id="{_hex_output(attr)}" />'
+        )
+    parts.append("\n    </rs:model-request>")
+
+
+def model_search_bytes(**params) -> bytes:
+    """
+    Writes the encoded Spectrum Model Search XML payload using the supplied
+    arguments. The output is identical to `model_search_xml(**params).encode()`
+    """
+
+    if not _SEARCH_PARAMS.issuperset(params):
+        return model_search_xml(**params).encode()
+
+    child_models = params.get("child_models")
+    parent_models = params.get("parent_models")
+    relation = params.get("relation")
+
+    parts = [
+        _REQUEST_HEAD.format(throttlesize=params.get("throttlesize") or 100),
+        _SEARCH_CRITERIA,
+        _INDENT,
+        "<devices-only-search />" if params.get("devices_only") else "",
+        _INDENT,
+        "<interfaces-of-devices-search />"
+        if params.get("interfaces_only")
+        else "",
+    ]
+
+    if child_models:
+        parts.append(_INDENT + "<child-models>")
+    elif parent_models:
+        parts.append(_INDENT + "<parent-models>")
+
+    parts.append(_INDENT + "<filtered-models>")
+
+    if params.get("filter_xml"):
+        parts.extend((_INDENT, params["filter_xml"]))
+    elif params.get("filter"):
+        parts.append(_INDENT)
+        _write_filter(params["filter"], parts)
+
+    parts.append(_INDENT + "</filtered-models>")
+
+    if relation:
+        parts.append(f"{_INDENT}<relation>{_hex_output(relation)}</relation>")
+
+    if child_models:
+        parts.append(_INDENT + "</child-models>")
+    elif parent_models:
+        parts.append(_INDENT + "</parent-models>")
+
+    parts.append(
+        "\n            </rs:search-criteria>"
+        "\n        </rs:models-search>"
+        "\n    </rs:target-models>"
+    )
+
+    _write_requested_attrs(params.get("req_attrs", ()), parts)
+    return "".join(parts).encode()
+
+
+def model_handles_bytes(**params) -> bytes:
+    """
+    Writes the encoded Spectrum Model Request XML payload which targets the
+    supplied list of model handles. The output is identical to
+    `model_handles_xml(**params).encode()`
+    """
+
+    if not _HANDLES_PARAMS.issuperset(params):
+        return model_handles_xml(**params).encode()
+
+    parts = [
+        _REQUEST_HEAD.format(throttlesize=params.get("throttlesize") or 100)
+    ]
+
+    for mh in params.get("model_handles", ()):
+        parts.append(f'\n        <rs:model mh="{_hex_output(mh)}" />')
+
+    parts.append("\n        </rs:target-models>")
+
+    _write_requested_attrs(params.get("req_attrs", ()), parts)
+    return "".join(parts).encode()
+
+
+_ALARM_REQUEST_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<rs:alarm-request xmlns:rs="http://www.ca.com/spectrum/restful/schema/'
+    'request" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'throttlesize="{throttlesize}" xsi:schemaLocation="http://www.ca.com/'
+    'spectrum/restful/schema/request ../../../xsd/Request.xsd ">'
+)
+
+
+def alarm_search_bytes(
+    filters: Union[None, str, FilterExpr],
+    req_attrs: List[Union[int, str]],
+    throttlesize: int,
+) -> bytes:
+    """
+    Writes the encoded Spectrum Alarm Request XML payload, which selects the
+    alarms whose attributes match the given filter expression, or every alarm
+    if no filter is given. The filter uses the same grammar as model searches.
+    """
+
+    parts = [_ALARM_REQUEST_HEAD.format(throttlesize=throttlesize or 100)]
+
+    if filters:
+        parts.append(
+            "\n    <rs:attribute-filter>"
+            '\n        <search-criteria xmlns="http://www.ca.com/spectrum/'
+            'restful/schema/filter">'
+            "\n            <filtered-models>"
+        )
+        if isinstance(filters, FilterExpr):
+            parts.append(filters.to_xml())
+        else:
+            _write_filter(parse_filter(filters), parts)
+        parts.append(
+            "\n            </filtered-models>"
+            "\n        </search-criteria>"
+            "\n    </rs:attribute-filter>"
+        )
+
+    for attr in req_attrs:
+        parts.append(
+            f'\n    <rs:requested-attribute id="{_hex_output(attr)}" />'
+        )
+    parts.append("\n</rs:alarm-request>")
+    return "".join(parts).encode()
+
+
+# -----------------------------------------------------------------------------
+#                      Payload Cache
+# -----------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def _model_search_payload_cached(
+    filters: str,
+    req_attrs: tuple,
+    throttlesize: int,
+    devices_only: bool,
+    otheropts: tuple,
+) -> bytes:
+    """
+    Writes a model search payload, caching the result. The filter expression
+    is already normalized, and the parsed filter is only read, so the cached
+    filter dictionary is used without copying it.
+    """
+    return model_search_bytes(
+        filter=_parse_filter_cached(filters),
+        req_attrs=req_attrs,
+        throttlesize=throttlesize,
+        devices_only=devices_only,
+        **dict(otheropts),
+    )
+
+
+def model_search_payload(
+    filters: Union[str, FilterExpr],
+    req_attrs: List[Union[int, str]],
+    throttlesize: int,
+    devices_only: bool = False,
+    **otheropts,
+) -> bytes:
+    """
+    Returns the encoded Spectrum Model Search XML payload for the given filter
+    expression and options. Payloads are held in a bounded LRU cache keyed on
+    the normalized filter expression, requested attributes, throttle size and
+    search options, so repeated searches skip both parsing and rendering.
+
+    A `FilterExpr` is serialized directly to the filter XML and is not cached.
+    """
+    if isinstance(filters, FilterExpr):
+        return model_search_bytes(
+            filter_xml=filters.to_xml(),
+            req_attrs=req_attrs,
+            throttlesize=throttlesize,
+            devices_only=devices_only,
+            **otheropts,
+        )
+
+    key = (
+        normalize_filter(filters),
+        tuple(req_attrs),
+        throttlesize,
+        devices_only,
+        tuple(sorted(otheropts.items())),
+    )
+
+    # Unhashable search options cannot be cached. The key is checked before
+    # the call, so that a TypeError raised while writing the payload is not
+    # mistaken for one
+    try:
+        hash(key)
+    except TypeError:
+        return _model_search_payload_cached.__wrapped__(*key)
+    return _model_search_payload_cached(*key)
+
+
+def payload_cache_info():
+    """ Returns the hit/miss statistics of the model search payload cache """
+    return _model_search_payload_cached.cache_info()
+
+
+def clear_payload_cache() -> None:
+    """ Removes all entries from the model search payload cache """
+    _model_search_payload_cached.cache_clear()
+
+
+def model_handles_xml(**params):
+    """
+    Uses Jinja2 to render the Spectrum Model Request XML payload which targets
+    the supplied list of model handles.
+    """
+    xml_string = _render_template(SpectrumTemplateFiles.model_handles, params)
+    return re.sub(r"^$\n", "", xml_string, flags=re.MULTILINE)
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# The fake OneClick server of the benchmarks backs the client tests
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"),
+)
+
+from fake_oneclick import FakeOneClick, generate_models  # noqa: E402
+from pyspectrum import SpectrumClient, AsyncSpectrumClient  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    return FakeOneClick(generate_models(50))
+
+
+@pytest.fixture
+def make_client(fake):
+    """ Returns a function which creates a client of the fake server """
+
+    def make_client(**clientopts):
+        return SpectrumClient(
+            base_url="http://oneclick",
+            username="test",
+            password="test",
+            transport=fake.transport(),
+            **clientopts,
+        )
+
+    return make_client
+
+
+@pytest.fixture
+def make_async_client(fake):
+    """ Returns a function which creates an asyncio client of the server """
+
+    def make_async_client(**clientopts):
+        return AsyncSpectrumClient(
+            base_url="http://oneclick",
+            username="test",
+            password="test",
+            transport=fake.transport(use_async=True),
+            **clientopts,
+        )
+
+    return make_async_client
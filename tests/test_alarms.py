@@ -0,0 +1,247 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from lxml import etree
+
+from pyspectrum import SpectrumClient, AsyncSpectrumClient
+from pyspectrum.alarms import AlarmTable
+from pyspectrum.filters import F
+from pyspectrum.mixins.alarms import (
+    SpectrumAlarmsMixin,
+    AsyncSpectrumAlarmsMixin,
+)
+from pyspectrum.responses import SpectrumAlarmResponseList
+
+NAMESPACE = "http://www.ca.com/spectrum/restful/schema/response"
+
+ALARMS_PATH = "/spectrum/restful/alarms"
+
+SEVERITY = "0x11f56"
+
+
+def alarm_id(n):
+    return f"5a{n:06d}-0000-0000-0000-000000000000"
+
+
+class FakeAlarms:
+    """
+    httpx request handler which responds to alarm searches, as a OneClick
+    server would, from a dictionary of alarms keyed by alarm ID. Only a
+    `severity >= n` filter is supported.
+    """
+
+    def __init__(self, count):
+        self.alarms = {}
+        self.payloads = []
+        self._cursors = {}
+        for n in range(count):
+            self.raise_alarm(n, severity=1 + n % 5)
+
+    def raise_alarm(self, n, severity):
+        self.alarms[alarm_id(n)] = {
+            "0x11f9c": alarm_id(n),
+            "0x129fa": hex(0x1000000 + n),
+            SEVERITY: str(severity),
+            "0x12b4c": f"alarm {n}",
+            "0x11f4d": "false",
+        }
+
+    def __call__(self, request):
+        assert request.url.path == ALARMS_PATH
+        params = request.url.params
+        if "id" in params:
+            alarms, attrs = self._cursors[params["id"]]
+            return self._page(
+                alarms,
+                attrs,
+                int(params["start"]),
+                int(params["throttlesize"]),
+                params["id"],
+            )
+
+        self.payloads.append(request.read())
+        root = etree.fromstring(request.content)
+        attrs = [
+            elem.get("id") for elem in root.iter("{*}requested-attribute")
+        ]
+        alarms = list(self.alarms.values())
+        cond = root.find(".//{*}greater-than-or-equals/{*}attribute")
+        if cond is not None:
+            threshold = int(cond.findtext("{*}value"))
+            alarms = [a for a in alarms if int(a[cond.get("id")]) >= threshold]
+
+        cursor = str(uuid.uuid4())
+        self._cursors[cursor] = (alarms, attrs)
+        return self._page(
+            alarms, attrs, 0, int(root.get("throttlesize")), cursor
+        )
+
+    async def handle_async(self, request):
+        return self(request)
+
+    @staticmethod
+    def _page(alarms, attrs, start, size, cursor):
+        chunk = alarms[start : start + size]
+        body = "".join(
+            f'<alarm id="{alarm["0x11f9c"]}">'
+            + "".join(
+                f'<attribute id="{attr}">{alarm[attr]}</attribute>'
+                for attr in attrs
+                if attr in alarm
+            )
+            + "</alarm>"
+            for alarm in chunk
+        )
+        if start + size < len(alarms):
+            error = ""
+            link = (
+                f'<link rel="next" href="http://oneclick{ALARMS_PATH}?'
+                f"id={cursor}&amp;start={start + size}&amp;"
+                f'throttlesize={size}" type="application/xml"/>'
+            )
+        else:
+            error, link = ' error="EndOfResults"', ""
+
+        responses = ""
+        if chunk:
+            responses = f"<alarm-responses>{body}</alarm-responses>"
+        return httpx.Response(
+            200,
+            content=(
+                f'<alarm-response-list xmlns="{NAMESPACE}"{error} '
+                f'throttle="{len(chunk)}" total-alarms="{len(alarms)}">'
+                f"{responses}{link}</alarm-response-list>"
+            ).encode(),
+        )
+
+
+@pytest.fixture
+def server():
+    return FakeAlarms(25)
+
+
+@pytest.fixture
+def spectrum(server):
+    spectrum = SpectrumClient(
+        base_url="http://oneclick",
+        username="test",
+        password="test",
+        transport=httpx.MockTransport(server),
+    )
+    spectrum.mixin(SpectrumAlarmsMixin)
+    return spectrum
+
+
+def test_get_alarms(spectrum):
+    res = spectrum.get_alarms()
+
+    assert isinstance(res, SpectrumAlarmResponseList)
+    assert len(res.result) == 25
+    assert res.total_alarms == res.total_models == "25"
+    assert res.alarm_ids[0] == alarm_id(0)
+    assert res.result[0]["severity"] == "1"
+    assert res.result[0]["alarm_title"] == "alarm 0"
+
+
+def test_get_alarms_without_results(spectrum):
+    assert spectrum.get_alarms(F.severity >= 9).result == []
+
+
+def test_invalid_filter(spectrum):
+    with pytest.raises(ValueError, match="Unable to parse") as exc_info:
+        spectrum.get_alarms("severity ?? 1")
+    assert "expected operator" in str(exc_info.value.__cause__)
+
+    with pytest.raises(ValueError, match="not a recognised"):
+        spectrum.get_alarms("severity >= 1", attrs=["no_such_attribute"])
+
+
+def test_iter_alarm_pages(spectrum):
+    pages = list(spectrum.iter_alarm_pages(page_size=10))
+
+    assert [len(page.result) for page in pages] == [10, 10, 5]
+    assert all(isinstance(page, SpectrumAlarmResponseList) for page in pages)
+
+    pages[0].extend(pages[1])
+    assert pages[0].total_alarms == "20"
+    assert len(pages[0].result) == 20
+
+
+def test_iter_alarms_with_filter(spectrum, server):
+    alarms = list(spectrum.iter_alarms("severity >= 4", page_size=3))
+
+    assert len(alarms) == 10
+    assert all(int(alarm["severity"]) >= 4 for alarm in alarms)
+    assert b'throttlesize="3"' in server.payloads[0]
+
+
+def test_poll_alarms_reports_changes(spectrum, server):
+    table = AlarmTable()
+    delta = spectrum.poll_alarms(table, "severity >= 3", page_size=4)
+    assert len(delta.new) == len(table) == 15
+    assert not delta.changed and not delta.cleared
+
+    assert not spectrum.poll_alarms(table, "severity >= 3", page_size=4)
+
+    server.alarms[alarm_id(2)]["0x11f4d"] = "true"
+    server.raise_alarm(100, severity=5)
+    del server.alarms[alarm_id(4)]
+    server.alarms[alarm_id(3)][SEVERITY] = "1"
+
+    delta = spectrum.poll_alarms(table, "severity >= 3", page_size=4)
+    assert list(delta.new) == [alarm_id(100)]
+    assert list(delta.changed) == [alarm_id(2)]
+    assert delta.previous[alarm_id(2)]["acknowledged"] == "false"
+    assert delta.changed[alarm_id(2)]["acknowledged"] == "true"
+    assert sorted(delta.cleared) == [alarm_id(3), alarm_id(4)]
+    assert alarm_id(4) not in table
+
+
+def test_alarm_table_save_and_load(spectrum, tmp_path):
+    filepath = str(tmp_path / "alarms.json")
+    table = AlarmTable(["severity"])
+    spectrum.poll_alarms(table)
+    table.save(filepath)
+
+    loaded = AlarmTable.load(filepath)
+    assert loaded.attrs == ["severity"]
+    assert loaded.alarms == table.alarms
+    assert not spectrum.poll_alarms(loaded)
+
+    assert len(AlarmTable.load(str(tmp_path / "missing.json"))) == 0
+
+
+def test_watch_alarms_skips_polls_without_changes(spectrum, server):
+    watch = spectrum.watch_alarms(AlarmTable(), interval=0)
+
+    assert len(next(watch).new) == 25
+    server.raise_alarm(100, severity=5)
+    assert list(next(watch).new) == [alarm_id(100)]
+    watch.close()
+
+
+def test_async_alarms(spectrum, server):
+    async def main():
+        async with AsyncSpectrumClient(
+            base_url="http://oneclick",
+            username="test",
+            password="test",
+            transport=httpx.MockTransport(server.handle_async),
+        ) as aspectrum:
+            aspectrum.mixin(AsyncSpectrumAlarmsMixin)
+            alarms = [
+                alarm async for alarm in aspectrum.iter_alarms(page_size=4)
+            ]
+            assert alarms == list(spectrum.iter_alarms(page_size=7))
+
+            table = AlarmTable(["severity"])
+            assert len((await aspectrum.poll_alarms(table)).new) == 25
+
+            server.alarms[alarm_id(2)][SEVERITY] = "5"
+            delta = await aspectrum.poll_alarms(table)
+            assert list(delta.changed) == [alarm_id(2)]
+            assert "alarm_title" not in delta.changed[alarm_id(2)]
+
+    asyncio.run(main())
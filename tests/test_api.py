@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from pyspectrum.api import SpectrumSession
+
+
+def pool_limits(session):
+    pool = session._transport._pool
+    return (
+        pool._max_connections,
+        pool._max_keepalive_connections,
+        pool._keepalive_expiry,
+    )
+
+
+def test_default_connection_pool():
+    session = SpectrumSession("http://oneclick")
+    assert pool_limits(session) == (100, 20, 5.0)
+
+
+def test_connection_pool_options():
+    session = SpectrumSession(
+        "http://oneclick", max_connections=40, keepalive_expiry=1.0
+    )
+    assert pool_limits(session) == (40, 20, 1.0)
+
+
+def test_limits_option():
+    limits = httpx.Limits(max_connections=3, max_keepalive_connections=1)
+    session = SpectrumSession("http://oneclick", limits=limits)
+    assert pool_limits(session)[:2] == (3, 1)
+
+
+@pytest.mark.parametrize(
+    "option",
+    ["max_connections", "max_keepalive_connections", "keepalive_expiry"],
+)
+def test_limits_cannot_be_combined_with_pool_options(option):
+    with pytest.raises(ValueError, match=option):
+        SpectrumSession(
+            "http://oneclick", limits=httpx.Limits(), **{option: 1}
+        )
+
+
+def test_compression():
+    default = SpectrumSession("http://oneclick")
+    assert default.headers["Accept-Encoding"] == httpx.Client().headers[
+        "Accept-Encoding"
+    ]
+    assert "gzip" in default.headers["Accept-Encoding"]
+
+    plain = SpectrumSession("http://oneclick", compression=False)
+    assert plain.headers["Accept-Encoding"] == "identity"
+
+
+def test_optional_client_features_are_imported_on_use():
+    code = (
+        "import sys\n"
+        "from pyspectrum import SpectrumClient\n"
+        "SpectrumClient(base_url='http://oneclick', username='a', "
+        "password='b')\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    for name in (
+        "concurrent.futures",
+        "pyspectrum.cache",
+        "pyspectrum.metrics",
+        "pyspectrum.parallel",
+    ):
+        assert name not in modules
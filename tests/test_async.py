@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from fake_oneclick import FakeOneClick, generate_models
+
+
+@pytest.fixture
+def fake():
+    return FakeOneClick(generate_models(40, landscapes=2))
+
+
+def test_sync_context_manager_is_rejected(make_async_client):
+    spectrum = make_async_client()
+    with pytest.raises(TypeError, match="async with"):
+        with spectrum:
+            pass
+    asyncio.run(spectrum.close())
+
+
+def test_async_context_manager(make_async_client):
+    async def run():
+        async with make_async_client() as spectrum:
+            return (await spectrum.get_all_devices()).result
+
+    assert len(asyncio.run(run())) == 40
+
+
+def test_iter_all_devices_in_order(make_async_client, make_client):
+    async def run():
+        async with make_async_client() as spectrum:
+            return [
+                model
+                async for model in spectrum.iter_all_devices(page_size=7)
+            ]
+
+    expected = list(make_client().iter_all_devices(page_size=40))
+    assert asyncio.run(run()) == expected
+
+
+def test_get_all_devices_by_landscape(make_async_client):
+    async def run():
+        async with make_async_client() as spectrum:
+            return await spectrum.get_all_devices_by_landscape()
+
+    fanout = asyncio.run(run())
+    assert list(fanout.responses) == ["0x1000000", "0x2000000"]
+    assert not fanout.errors
+    assert fanout.ok
+
+
+def test_get_models_by_landscape_records_errors(make_async_client):
+    async def run():
+        async with make_async_client() as spectrum:
+            return await spectrum.get_models_by_landscape(
+                "model_type_name = Rtr_Cisco",
+                landscapes=["0x1000000", "invalid"],
+            )
+
+    fanout = asyncio.run(run())
+    assert list(fanout.responses) == ["0x1000000"]
+    assert isinstance(fanout.errors["invalid"], ValueError)
+    assert all(
+        int(model["model_handle"], 16) < 0x2000000 for model in fanout.result
+    )
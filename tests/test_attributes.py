@@ -0,0 +1,80 @@
+import pytest
+
+from pyspectrum import attributes
+from pyspectrum.attributes import (
+    SpectrumAlarmAttributes,
+    SpectrumModelAttributes,
+    attr_id_to_name,
+    attr_name_to_id,
+    register_attribute,
+)
+
+
+@pytest.fixture(autouse=True)
+def tables(monkeypatch):
+    """ Restores the lookup tables after each test """
+    for name in ("_NAME_TO_ID", "_ID_TO_NAME", "_HEX_TO_NAME"):
+        monkeypatch.setattr(attributes, name, dict(getattr(attributes, name)))
+    monkeypatch.setattr(attributes, "_UNKNOWN_HEX", set())
+
+
+@pytest.mark.parametrize(
+    "attr", [*SpectrumModelAttributes, *SpectrumAlarmAttributes]
+)
+def test_every_attribute_resolves_both_ways(attr):
+    name = attr.name.lower()
+
+    assert attr_name_to_id(name) == attr_name_to_id(attr.name) == attr.value
+    assert attr_id_to_name(attr.value) == name
+    assert attr_id_to_name(hex(attr.value)) == name
+    assert attr_id_to_name(hex(attr.value).upper().replace("X", "x")) == name
+
+
+def test_unknown_names_and_ids():
+    assert attr_name_to_id("0x1102d") == attr_name_to_id(0x1102D) == 0x1102D
+    assert attr_id_to_name(0x1102D) == attr_id_to_name("0x1102D") == "0x1102d"
+
+    with pytest.raises(ValueError, match="not a recognised"):
+        attr_name_to_id("sys_contact")
+    with pytest.raises(ValueError):
+        attr_id_to_name("sys_contact")
+
+
+def test_register_attribute():
+    assert attr_id_to_name("0x1102d") == "0x1102d"
+
+    register_attribute("Sys_Contact", 0x1102D)
+
+    assert attr_name_to_id("sys_contact") == 0x1102D
+    assert attr_id_to_name("0x1102d") == "sys_contact"
+    assert attr_id_to_name(0x1102D) == "sys_contact"
+
+
+def test_register_attribute_replaces_the_previous_mapping():
+    register_attribute("sys_contact", 0x1102D)
+    register_attribute("sys_location", 0x1102D)
+
+    assert attr_id_to_name("0x1102d") == "sys_location"
+    with pytest.raises(ValueError):
+        attr_name_to_id("sys_contact")
+
+    register_attribute("sys_location", 0x1102E)
+
+    assert attr_name_to_id("sys_location") == 0x1102E
+    assert attr_id_to_name("0x1102d") == "0x1102d"
+    assert attr_id_to_name(0x1102D) == "0x1102d"
+
+
+def test_unknown_ids_are_remembered_up_to_a_limit(monkeypatch):
+    monkeypatch.setattr(attributes, "UNKNOWN_HEX_LIMIT", 3)
+
+    for value in range(0x500000, 0x500010):
+        assert attr_id_to_name(hex(value)) == hex(value)
+
+    assert len(attributes._UNKNOWN_HEX) == 3
+    assert len(attributes._HEX_TO_NAME) == len(attributes._ID_TO_NAME)
+    assert attr_id_to_name("0x500001") == "0x500001"
+
+    register_attribute("custom", 0x500001)
+    assert attr_id_to_name("0x500001") == "custom"
+    assert "0x500001" not in attributes._UNKNOWN_HEX
@@ -0,0 +1,204 @@
+import time
+
+import httpx
+import pytest
+
+from pyspectrum import SpectrumClient
+from pyspectrum.cache import SpectrumResponseCache, SqliteResponseCache
+
+
+class Revalidating:
+    """
+    Serves the fake server's responses with an `ETag`, and responds with
+    `304 Not Modified` to a conditional request for an unchanged response
+    """
+
+    ETAG = '"v1"'
+
+    def __init__(self, fake):
+        self.fake = fake
+        self.conditional = 0
+
+    def __call__(self, request):
+        if request.headers.get("If-None-Match") == self.ETAG:
+            self.conditional += 1
+            return httpx.Response(304)
+
+        res = self.fake.handle(request)
+        res.headers["ETag"] = self.ETAG
+        return res
+
+
+def client_for(handler, **clientopts):
+    return SpectrumClient(
+        base_url="http://oneclick",
+        username="test",
+        password="test",
+        transport=httpx.MockTransport(handler),
+        **clientopts,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        yield SpectrumResponseCache()
+    else:
+        cache = SqliteResponseCache(str(tmp_path / "cache.db"))
+        yield cache
+        cache.close()
+
+
+# -----------------------------------------------------------------------------
+#                      Cache Interface
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "path, endpoint",
+    [
+        ("/devices", "/devices"),
+        ("/model/0x1000001", "/model"),
+        ("/spectrum/restful/model/0x1000001", "/model"),
+        ("http://oneclick/spectrum/restful/models", "/models"),
+    ],
+)
+def test_endpoint(path, endpoint):
+    assert SpectrumResponseCache.endpoint(path) == endpoint
+
+
+@pytest.mark.parametrize(
+    "method, path, params, cacheable",
+    [
+        ("GET", "/devices", None, True),
+        ("GET", "/model/0x1000001", {"attr": "0x1006e"}, True),
+        ("POST", "/models", None, True),
+        ("POST", "/alarms", None, False),
+        ("PUT", "/model/0x1000001", None, False),
+        ("GET", "/devices", {"id": "abc", "start": "100"}, False),
+        ("GET", "/landscapes", None, False),
+    ],
+)
+def test_is_cacheable(method, path, params, cacheable):
+    cache = SpectrumResponseCache(ttls={"/landscapes": 0})
+    assert cache.is_cacheable(method, path, params) is cacheable
+
+
+def test_key_ignores_parameter_order():
+    key = SpectrumResponseCache.key
+
+    assert key("http://a", "GET", "/devices", [("x", 1), ("y", 2)]) == key(
+        "http://a", "GET", "/devices", [("y", 2), ("x", 1)]
+    )
+    assert key("http://a", "GET", "/devices") != key(
+        "http://b", "GET", "/devices"
+    )
+    assert key("http://a", "POST", "/models", content=b"<a/>") != key(
+        "http://a", "POST", "/models", content=b"<b/>"
+    )
+
+
+def test_ttl_per_endpoint():
+    cache = SpectrumResponseCache(ttl=60, ttls={"/model": 5})
+
+    assert cache.ttl_for("/devices") == 60
+    assert cache.ttl_for("/spectrum/restful/model/0x1") == 5
+
+
+def test_lru_eviction(cache):
+    cache.maxsize = 2
+    for n in range(3):
+        cache.put(
+            f"key-{n}",
+            httpx.Response(
+                200, content=b"ok", request=httpx.Request("GET", "/devices")
+            ),
+        )
+
+    assert len(cache) == 2
+    assert cache.get("key-0") is None
+    assert cache.get("key-2").content == b"ok"
+    assert cache.info().evictions == 1
+
+
+# -----------------------------------------------------------------------------
+#                      Client
+# -----------------------------------------------------------------------------
+
+
+def test_client_serves_repeated_requests_from_the_cache(fake, cache):
+    spectrum = client_for(fake.handle, cache=cache)
+
+    first = spectrum.get_all_devices()
+    second = spectrum.get_all_devices()
+
+    assert fake.requests == 1
+    assert second.result == first.result
+    assert (cache.info().hits, cache.info().misses) == (1, 1)
+
+
+def test_client_caches_model_searches(fake, cache):
+    spectrum = client_for(fake.handle, cache=cache)
+
+    spectrum.get_models("model_name ~ device-00001")
+    spectrum.get_models("model_name ~ device-00001")
+    spectrum.get_models("model_name ~ device-00002")
+
+    assert fake.requests == 2
+
+
+def test_client_does_not_cache_paginated_responses(fake, cache):
+    spectrum = client_for(fake.handle, cache=cache)
+
+    for _ in range(2):
+        assert len(list(spectrum.iter_all_devices(page_size=20))) == 50
+    assert fake.requests == 6
+    assert len(cache) == 0
+
+
+def test_client_refreshes_expired_responses_with_304(fake, cache):
+    handler = Revalidating(fake)
+    cache.ttl = 0.05
+    spectrum = client_for(handler, cache=cache)
+
+    first = spectrum.get_all_devices()
+    time.sleep(0.1)
+    second = spectrum.get_all_devices()
+    third = spectrum.get_all_devices()
+
+    assert fake.requests == 1
+    assert handler.conditional == 1
+    assert second.result == third.result == first.result
+    assert cache.info().revalidated == 1
+
+
+def test_invalidate_endpoint(fake, cache):
+    spectrum = client_for(fake.handle, cache=cache)
+
+    spectrum.get_all_devices()
+    spectrum.get_models("model_name ~ device-00001")
+    assert cache.invalidate("/devices") == 1
+
+    spectrum.get_all_devices()
+    spectrum.get_models("model_name ~ device-00001")
+    assert fake.requests == 3
+
+
+def test_sqlite_cache_is_retained_between_runs(fake, tmp_path):
+    filepath = str(tmp_path / "cache.db")
+
+    for _ in range(2):
+        cache = SqliteResponseCache(filepath)
+        spectrum = client_for(fake.handle, cache=cache)
+        assert len(spectrum.get_all_devices().result) == 50
+        cache.close()
+
+    assert fake.requests == 1
+
+
+def test_cache_option(fake):
+    assert isinstance(
+        client_for(fake.handle, cache=True).cache,
+        SpectrumResponseCache,
+    )
+    assert client_for(fake.handle, cache=False).cache is None
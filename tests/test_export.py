@@ -0,0 +1,140 @@
+import csv
+import json
+import random
+
+import pytest
+
+from pyspectrum import SpectrumClient
+from pyspectrum import export
+from pyspectrum.export import write_csv, write_jsonl
+
+
+def read_csv(filepath):
+    with open(filepath, newline="") as infile:
+        return list(csv.reader(infile))
+
+
+def random_models(count, seed=0):
+    rnd = random.Random(seed)
+    names = ["alpha", "Alpha", "beta", "BETA", "gamma", None]
+    return [
+        {
+            "model_handle": hex(0x1000000 + n),
+            "model_name": rnd.choice(names),
+            "condition": str(rnd.randrange(3)),
+        }
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def run_files(monkeypatch):
+    """ Sorts in runs of 3 rows, recording each temporary run file """
+    files = []
+    temporary_file = export.TemporaryFile
+
+    def counted():
+        files.append(temporary_file())
+        return files[-1]
+
+    monkeypatch.setattr(export, "SORT_CHUNK_SIZE", 3)
+    monkeypatch.setattr(export, "TemporaryFile", counted)
+    return files
+
+
+def test_write_csv(tmp_path):
+    filepath = str(tmp_path / "models.csv")
+    models = random_models(5)
+
+    assert write_csv(iter(models), filepath, exclude=["condition"]) == 5
+    assert read_csv(filepath) == [["model_handle", "model_name"]] + [
+        [model["model_handle"], model["model_name"] or ""]
+        for model in models
+    ]
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 4, 6, 7, 10])
+def test_sorted_runs_match_an_in_memory_sort(tmp_path, run_files, count):
+    filepath = str(tmp_path / "models.csv")
+    models = random_models(count, seed=count)
+    expected = sorted(
+        models, key=lambda model: (model["model_name"] or "").lower()
+    )
+
+    assert write_csv(models, filepath, orderby="model_name") == count
+    rows = read_csv(filepath)[1:]
+    assert [row[0] for row in rows] == [
+        model["model_handle"] for model in expected
+    ]
+
+    # Runs are only spilled to files if there is more than one
+    assert len(run_files) == (0 if count < 3 else -(-count // 3))
+    assert all(run_file.closed for run_file in run_files)
+
+
+def test_sorted_runs_with_non_string_values(tmp_path, run_files):
+    filepath = str(tmp_path / "models.jsonl")
+    models = [
+        {"name": name, "value": value}
+        for name, value in zip("abcdefg", ["b", {"1": "x"}, "A", None, "c"])
+    ]
+
+    write_jsonl(models, filepath, orderby="value")
+    with open(filepath) as infile:
+        names = [json.loads(line)["name"] for line in infile]
+    assert names == ["b", "d", "c", "a", "e"]
+    assert run_files
+
+
+def test_empty_input(tmp_path):
+    filepath = tmp_path / "models.csv"
+
+    assert write_csv([], str(filepath)) == 0
+    assert filepath.read_text() == ""
+
+    assert write_csv([], str(filepath), fieldnames=["model_name"]) == 0
+    assert read_csv(str(filepath)) == [["model_name"]]
+
+    assert write_jsonl([], str(tmp_path / "models.jsonl")) == 0
+    assert (tmp_path / "models.jsonl").read_text() == ""
+
+
+def test_write_jsonl(tmp_path):
+    filepath = str(tmp_path / "models.jsonl")
+    models = random_models(4)
+
+    assert write_jsonl(models, filepath, fieldnames=["model_name"]) == 4
+    with open(filepath) as infile:
+        assert [json.loads(line) for line in infile] == [
+            {"model_name": model["model_name"]} for model in models
+        ]
+
+
+def test_extra_fields(tmp_path):
+    filepath = str(tmp_path / "models.csv")
+    models = [{"a": "1"}, {"a": "2", "b": "3"}]
+
+    assert write_csv(models, filepath) == 2
+    assert read_csv(filepath) == [["a"], ["1"], ["2"]]
+
+    with pytest.raises(ValueError, match="'b'"):
+        write_csv(models, filepath, extrasaction="raise")
+    assert write_csv(models, filepath, exclude=["b"], extrasaction="raise")
+
+    with pytest.raises(ValueError):
+        write_csv(models, filepath, extrasaction="drop")
+
+
+def test_to_csv_does_not_modify_the_models(tmp_path):
+    filepath = str(tmp_path / "models.csv")
+    models = random_models(4)
+    copies = [dict(model) for model in models]
+
+    SpectrumClient.to_csv(
+        models, filepath, exclude=["condition"], orderby="model_name"
+    )
+    assert models == copies
+    assert read_csv(filepath)[0] == ["model_handle", "model_name"]
+
+    with pytest.raises(ValueError):
+        SpectrumClient.to_csv(models + [{"bogus": "1"}], filepath)
@@ -0,0 +1,164 @@
+import random
+
+import pytest
+
+from pyspectrum.filters import (
+    FilterExpr,
+    F,
+    parse_filter,
+    parse_filter_peg,
+    _OPERATORS,
+)
+
+VALID = [
+    "model_name = LAB_RTR",
+    "model_name ~ FW",
+    "  model_name  =  lab  ",
+    "model_type_name != Pingable",
+    "condition >= 2",
+    "condition<3",
+    "network_address =~ 10.1.",
+    "model_name =$ .net",
+    "model_name ^= core",
+    "model_name !~ test",
+    "model_name = 'Site A - Rack 1'",
+    'model_name = "it\'s here"',
+    "model_name = dir\\sub/file.txt",
+    "0x1006e = lab",
+    "0X1006E = lab",
+    "and(model_name ~ lab, condition > 0)",
+    "or(model_name ~ lab, model_name ~ core, model_name ~ edge)",
+    "not(model_name = lab, condition = 0)",
+    "and(or(model_name ~ a, model_name ~ b), "
+    "not(condition = 0, condition = 1))",
+    "and( model_name = a ,condition=0 )",
+    "and(model_name = a,\ncondition = 0)",
+]
+
+INVALID = [
+    "",
+    "   ",
+    "model_name",
+    "model_name =",
+    "model_name == lab",
+    "model_name => lab",
+    "model_name <> lab",
+    "model_name ~ lab core",
+    "model_name = 'unterminated",
+    'model_name = "unterminated',
+    "foo_bar = 1",
+    "and()",
+    "and(model_name = a",
+    "and(model_name = a, condition = 0",
+    "and(model_name = a))",
+    "and model_name = a, condition = 0)",
+    "or(model_name = a)",
+    "and(model_name = a, )",
+    "and(, model_name = a)",
+    "and(model_name = a,, condition = 0)",
+    "xor(model_name = a, condition = 0)",
+    "and(model_name = a, condition = 0) trailing",
+    "= lab",
+]
+
+
+def parse_both(expr):
+    """ Returns the result, or exception type, of each parser """
+    results = []
+    for parse in (parse_filter, parse_filter_peg):
+        try:
+            results.append(parse(expr))
+        except Exception as exc:
+            results.append(type(exc))
+    return results
+
+
+@pytest.mark.parametrize("expr", VALID)
+def test_parsers_agree_on_valid_expressions(expr):
+    fast, peg = parse_both(expr)
+    assert isinstance(fast, dict)
+    assert fast == peg
+
+
+@pytest.mark.parametrize("expr", INVALID)
+def test_parsers_reject_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        parse_filter(expr)
+    with pytest.raises(ValueError):
+        parse_filter_peg(expr)
+
+
+def random_expr(rnd, depth=0):
+    """ A random, possibly invalid, filter expression """
+    if depth < 2 and rnd.random() < 0.3:
+        items = [
+            random_expr(rnd, depth + 1) for _ in range(rnd.randrange(0, 4))
+        ]
+        group = rnd.choice(["and", "or", "not", "nor"])
+        # Whitespace before a comma is excluded, as the parsers differ on it
+        sep = rnd.choice([",", ", ", ",,"])
+        return f"{group}({sep.join(items)}" + rnd.choice([")", "", "))"])
+    attr = rnd.choice(["model_name", "condition", "0x1006e", "bogus", ""])
+    oper = rnd.choice(list(_OPERATORS) + ["==", "=>", ""])
+    value = rnd.choice(
+        ["lab", "'a b'", '"x y"', "'open", "10.1.1.1", "", "a b", "C:\\x"]
+    )
+    ws = rnd.choice(["", " ", "  "])
+    return f"{attr}{ws}{oper}{ws}{value}"
+
+
+def test_parsers_agree_on_random_expressions():
+    rnd = random.Random(0)
+    for _ in range(2000):
+        expr = random_expr(rnd)
+        fast, peg = parse_both(expr)
+        assert fast == peg, expr
+
+
+def test_whitespace_before_every_comma():
+    # The grammar only accepts whitespace before the first comma of a group
+    # list, whereas the hand-written parser accepts it before every comma
+    expr = "and(model_name = a ,condition = 1 ,condition = 2)"
+    assert parse_filter(expr) == {
+        "and": [
+            {"equals-ignore-case": ("0x1006e", "a")},
+            {"equals-ignore-case": ("0x1000a", "1")},
+            {"equals-ignore-case": ("0x1000a", "2")},
+        ]
+    }
+    with pytest.raises(ValueError):
+        parse_filter_peg(expr)
+
+    expr = "and(model_name = a ,condition = 1)"
+    assert parse_filter(expr) == parse_filter_peg(expr)
+
+
+def test_filter_expr_is_abstract():
+    with pytest.raises(TypeError):
+        FilterExpr()
+
+
+def test_parse_filter_result_is_not_shared():
+    parse_filter("model_name = lab")["equals-ignore-case"] = None
+    assert parse_filter("model_name = lab") == {
+        "equals-ignore-case": ("0x1006e", "lab")
+    }
+
+
+def test_nested_parse_filter_result_is_not_shared():
+    expr = "and(model_name = lab, or(condition = 0, condition = 1))"
+    parsed = parse_filter(expr)
+    parsed["and"][1]["or"].append({"equals": ("0x1000a", "2")})
+    parsed["and"].pop(0)
+
+    assert parse_filter(expr) == parse_filter_peg(expr)
+
+
+def test_filter_expr_round_trip():
+    expr = "and(model_name ~ lab, or(condition > 0, condition = 0))"
+    parsed = parse_filter(expr)
+    assert FilterExpr.coerce(expr).to_dict() == parsed
+    assert FilterExpr.from_dict(parsed).to_dict() == parsed
+    assert (F.model_name == "lab").to_dict() == parse_filter(
+        "model_name = lab"
+    )
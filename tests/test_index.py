@@ -0,0 +1,144 @@
+import pytest
+
+from fake_oneclick import generate_models
+from pyspectrum.filters import F
+from pyspectrum.index import ModelIndex
+
+MODELS = [
+    {
+        "model_handle": "0x1000001",
+        "model_name": "core-rtr-01",
+        "model_type_name": "Rtr_Cisco",
+        "network_address": "10.0.0.1",
+        "condition": "0",
+    },
+    {
+        "model_handle": "0x1000002",
+        "model_name": "Core-SW-02",
+        "model_type_name": "SwCiscoIOS",
+        "network_address": "10.0.0.2",
+        "condition": "3",
+    },
+    {
+        "model_handle": "0x1000003",
+        "model_name": "edge-fw",
+        "model_type_name": "FW_Juniper",
+        "condition": "10",
+    },
+    {"model_handle": "0x1000004", "model_name": "lab-host"},
+]
+
+
+@pytest.fixture
+def index():
+    return ModelIndex(MODELS)
+
+
+def names(models):
+    return [model["model_name"] for model in models]
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ("model_name = CORE-RTR-01", ["core-rtr-01"]),
+        ("model_name != Core-SW-02", ["core-rtr-01", "edge-fw", "lab-host"]),
+        ("model_name != core-sw-02", names(MODELS)),
+        ("model_name ~ core", ["core-rtr-01", "Core-SW-02"]),
+        ("model_name !~ core", ["edge-fw", "lab-host"]),
+        ("model_name =~ '^core-.*-0[12]$'", ["core-rtr-01", "Core-SW-02"]),
+        ("model_name ^= EDGE", ["edge-fw"]),
+        ("model_name =$ -host", ["lab-host"]),
+        ("condition < 3", ["core-rtr-01"]),
+        ("condition <= 3", ["core-rtr-01", "Core-SW-02"]),
+        ("condition > 3", ["edge-fw"]),
+        ("condition >= 3", ["Core-SW-02", "edge-fw"]),
+        ("network_address = 10.0.0.2", ["Core-SW-02"]),
+        (
+            "and(model_name ~ core, condition > 0)",
+            ["Core-SW-02"],
+        ),
+        (
+            "or(model_type_name = rtr_cisco, model_name ~ lab)",
+            ["core-rtr-01", "lab-host"],
+        ),
+        ("not(model_name ~ core, condition = 10)", ["lab-host"]),
+    ],
+)
+def test_filter_operators(index, filters, expected):
+    assert names(index.filter(filters)) == expected
+
+
+def test_condition_on_missing_attribute_never_matches(index):
+    assert names(index.filter("network_address !~ 10.0")) == []
+    assert names(
+        index.filter("not(network_address ~ 10.0, condition = 10)")
+    ) == ["lab-host"]
+
+
+def test_filter_expressions_and_dictionaries(index):
+    expr = F.model_name.startswith("core") & (F.condition >= 1)
+
+    assert names(index.filter(expr)) == ["Core-SW-02"]
+    assert index.filter(expr.to_dict()) == index.filter(expr)
+
+
+def test_get_and_lookup(index):
+    assert index.get("0x1000003")["model_name"] == "edge-fw"
+    assert index.get(0x1000003) is index.get("0x1000003")
+    assert index.get("0x1000009") is None
+    assert "0x1000001" in index
+
+    assert names(index.lookup("model_type_name", "rtr_cisco")) == [
+        "core-rtr-01"
+    ]
+    assert names(index.lookup(0x12D7F, "10.0.0.1")) == ["core-rtr-01"]
+
+
+def test_add_replaces_the_model_with_the_same_handle(index):
+    index.add({**MODELS[0], "network_address": "10.9.9.9"})
+
+    assert len(index) == len(MODELS)
+    assert index.lookup("network_address", "10.0.0.1") == []
+    assert names(index.lookup("network_address", "10.9.9.9")) == [
+        "core-rtr-01"
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        "model_type_name = Rtr_Cisco",
+        "and(model_type_name = Pingable, condition >= 2)",
+        "and(device_type = 'Linux Server', model_name ~ 1)",
+        "or(model_type_name = Rtr_Cisco, model_type_name = FW_Juniper)",
+        "or(model_type_name = Rtr_Cisco, condition = 5)",
+        "not(model_type_name = Rtr_Cisco, condition = 0)",
+    ],
+)
+def test_indexed_filters_match_a_full_scan(filters):
+    models = generate_models(500)
+    indexed = ModelIndex(models, resolve_attrs=False)
+    scanned = ModelIndex(models, indexes=["model_handle"], resolve_attrs=False)
+
+    assert indexed.filter(filters) == scanned.filter(filters)
+    assert indexed.filter(filters)
+
+
+def test_from_pages(make_client):
+    spectrum = make_client()
+    index = ModelIndex.from_pages(spectrum.iter_device_pages(page_size=20))
+
+    assert len(index) == 50
+    assert index.resolve_attrs
+    assert len(index.filter("model_type_name = Rtr_Cisco")) == 9
+    assert len(ModelIndex.from_pages([])) == 0
+
+
+def test_from_response(make_client):
+    spectrum = make_client()
+    res = spectrum.get_all_devices(resolve_attrs=False)
+    index = ModelIndex.from_response(res)
+
+    assert not index.resolve_attrs
+    assert index.get("0x1000000")["0x1006e"] == "device-000000.example.net"
@@ -0,0 +1,116 @@
+from pyspectrum.inventory import InventorySnapshot
+
+
+def remove_model(fake, index):
+    """ Removes a model from the fake server """
+    model = fake.models.pop(index)
+    fake._index = None
+    return model["0x129fa"]
+
+
+def test_first_sync_adds_every_device(make_client, fake):
+    snapshot = InventorySnapshot()
+    delta = make_client().sync_inventory(snapshot, page_size=20)
+
+    assert len(delta.added) == len(fake.models)
+    assert not delta.changed and not delta.removed
+    assert len(snapshot) == len(fake.models)
+
+
+def add_port(fake, index):
+    """ Adds a model which is not a device to the fake server """
+    model = {
+        "0x129fa": hex(0x2000000 + index),
+        "0x1006e": f"port-{index:06d}",
+        "0x10000": "Port_If",
+        "0x1102a": str(1800000000 + index),
+    }
+    fake.models.append(model)
+    fake._index = None
+    return model["0x129fa"]
+
+
+def test_sync_finds_changed_and_removed_models(make_client, fake):
+    spectrum = make_client()
+    snapshot = InventorySnapshot(
+        watermark_attrs=["mdl_creat_time", "last_successful_poll"]
+    )
+    spectrum.sync_inventory(snapshot, page_size=20)
+
+    handle = remove_model(fake, 10)
+    fake.models[0]["0x12d7f"] = "192.0.2.1"
+    fake.models[0]["0x11620"] = "1800000000"
+
+    delta = spectrum.sync_inventory(snapshot, page_size=20)
+
+    assert list(delta.removed) == [handle]
+    assert list(delta.changed) == [fake.models[0]["0x129fa"]]
+    assert handle not in snapshot
+
+
+def test_sync_only_fetches_models_past_the_watermark(make_client, fake):
+    spectrum = make_client()
+    snapshot = InventorySnapshot()
+    spectrum.sync_inventory(snapshot, page_size=20)
+
+    fake.models[0]["0x11620"] = "1800000000"
+    fake.models.append({**fake.models[1], "0x129fa": "0x1fffff"})
+    fake.models[-1]["0x1102a"] = "1700000000"
+    fake._index = None
+
+    requests = fake.requests
+    delta = spectrum.sync_inventory(snapshot)
+
+    assert list(delta.added) == ["0x1fffff"]
+    assert not delta.changed and not delta.removed
+    assert fake.requests - requests == 2
+
+
+def test_filtered_sync_keeps_models_other_than_devices(make_client, fake):
+    spectrum = make_client()
+    ports = [add_port(fake, index) for index in range(3)]
+    snapshot = InventorySnapshot()
+
+    delta = spectrum.sync_inventory(snapshot, "model_name ~ -00000")
+    assert len(delta.added) == 13
+    assert set(ports) <= set(delta.added)
+
+    assert not spectrum.sync_inventory(snapshot, "model_name ~ -00000")
+
+    handle = add_port(fake, 3)
+    delta = spectrum.sync_inventory(snapshot, "model_name ~ -00000")
+    assert list(delta.added) == [handle]
+    assert not delta.removed and len(snapshot) == 14
+
+    assert len(spectrum.sync_inventory(InventorySnapshot()).added) == 50
+
+
+def test_sync_bypasses_response_cache(make_client, fake):
+    spectrum = make_client(cache=True)
+    snapshot = InventorySnapshot()
+    spectrum.sync_inventory(snapshot, page_size=20)
+    spectrum.sync_inventory(snapshot, page_size=20)
+
+    handle = remove_model(fake, 5)
+    delta = spectrum.sync_inventory(snapshot, page_size=20)
+
+    assert list(delta.removed) == [handle]
+    assert spectrum.cache.info().hits == 0
+    assert len(spectrum.cache) == 0
+
+
+def test_snapshot_save_and_load(make_client, tmp_path):
+    snapshot = InventorySnapshot()
+    make_client().sync_inventory(snapshot)
+
+    filepath = tmp_path / "inventory.json"
+    snapshot.save(filepath)
+    loaded = InventorySnapshot.load(filepath)
+
+    assert loaded.models == snapshot.models
+    assert loaded.watermarks == snapshot.watermarks
+    assert not make_client().sync_inventory(loaded)
+
+
+def test_load_missing_snapshot(tmp_path):
+    assert len(InventorySnapshot.load(tmp_path / "missing.json")) == 0
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from fake_oneclick import FakeOneClick, generate_models
+from pyspectrum import SpectrumClient
+
+LANDSCAPES = ["0x1000000", "0x2000000", "0x3000000"]
+
+
+class Tracker:
+    """
+    httpx request handler which passes each request to the fake server after
+    a delay, and records the most requests in flight at once
+    """
+
+    def __init__(self, fake, delay=0.05, fail=()):
+        self.fake = fake
+        self.delay = delay
+        self.fail = fail
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.paths.append(request.url.path.rsplit("/", 1)[1])
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if request.url.params.get("landscapeid") in self.fail:
+                return httpx.Response(500)
+            return self.fake.handle(request)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fake():
+    return FakeOneClick(generate_models(30, landscapes=3))
+
+
+@pytest.fixture
+def make_tracked_client(fake):
+    """ Returns a function which creates a client and its request tracker """
+
+    def make_tracked_client(**trackeropts):
+        tracker = Tracker(fake, **trackeropts)
+        spectrum = SpectrumClient(
+            base_url="http://oneclick",
+            username="test",
+            password="test",
+            transport=httpx.MockTransport(tracker),
+        )
+        return spectrum, tracker
+
+    return make_tracked_client
+
+
+def landscape_of(model):
+    return hex(int(model["model_handle"], 16) >> 24 << 24)
+
+
+def test_get_all_devices_by_landscape(make_tracked_client):
+    spectrum, tracker = make_tracked_client()
+    fanout = spectrum.get_all_devices_by_landscape()
+
+    assert fanout.ok
+    assert list(fanout.responses) == LANDSCAPES
+    assert [len(res.result) for res in fanout.responses.values()] == [10] * 3
+    assert [model["landscape"] for model in fanout.result] == [
+        landscape for landscape in LANDSCAPES for _ in range(10)
+    ]
+    assert all(
+        landscape_of(model) == model["landscape"] for model in fanout.result
+    )
+    assert tracker.paths == ["landscapes"] + ["devices"] * 3
+
+
+def test_landscapes_are_requested_concurrently(make_tracked_client):
+    spectrum, tracker = make_tracked_client()
+    spectrum.get_all_devices_by_landscape(landscapes=LANDSCAPES)
+
+    assert tracker.most_in_flight == 3
+    assert "landscapes" not in tracker.paths
+
+
+def test_max_workers(make_tracked_client):
+    spectrum, tracker = make_tracked_client(delay=0.01)
+    fanout = spectrum.get_all_devices_by_landscape(max_workers=1)
+
+    assert tracker.most_in_flight == 1
+    assert list(fanout.responses) == LANDSCAPES
+
+
+def test_failed_landscape_is_recorded(make_tracked_client):
+    spectrum, tracker = make_tracked_client(fail=["0x2000000"])
+    fanout = spectrum.get_all_devices_by_landscape()
+
+    assert not fanout.ok
+    assert list(fanout.responses) == ["0x1000000", "0x3000000"]
+    assert isinstance(fanout.errors["0x2000000"], httpx.HTTPStatusError)
+    assert len(fanout.result) == 20
+
+
+def test_get_models_by_landscape(make_tracked_client):
+    spectrum, tracker = make_tracked_client()
+    fanout = spectrum.get_models_by_landscape(
+        "model_name ~ device", landscapes=LANDSCAPES[1:] + ["invalid"]
+    )
+
+    assert list(fanout.responses) == LANDSCAPES[1:]
+    assert isinstance(fanout.errors["invalid"], ValueError)
+    assert len(fanout.result) == 20
+    assert all(
+        landscape_of(model) == model["landscape"] for model in fanout.result
+    )
+    assert tracker.most_in_flight == 2
+
+
+def test_no_landscapes(make_tracked_client):
+    spectrum, tracker = make_tracked_client()
+    fanout = spectrum.get_all_devices_by_landscape(landscapes=[])
+
+    assert fanout.ok and fanout.result == []
+    assert tracker.paths == []
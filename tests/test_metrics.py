@@ -0,0 +1,118 @@
+import httpx
+import pytest
+
+from pyspectrum import SpectrumClient
+from pyspectrum.metrics import SpectrumHooks, SpectrumMetrics
+from pyspectrum.retry import RetryPolicy
+
+
+class Recorder(SpectrumHooks):
+    """ Records the events of each hook """
+
+    def __init__(self):
+        self.events = []
+
+    def on_build(self, url, seconds):
+        self.events.append(("build", url))
+
+    def on_request(self, method, url, response, seconds, error=None):
+        self.events.append(("request", method, url))
+
+    def on_parse(self, response, phase, seconds, models=0):
+        self.events.append(("parse", phase, models))
+
+
+def test_metrics_of_a_device_list(make_client):
+    metrics = SpectrumMetrics()
+    spectrum = make_client(hooks=metrics)
+
+    assert len(spectrum.get_all_devices().result) == 50
+
+    stats = metrics.stats()["/devices"]
+    assert (stats.requests, stats.errors, stats.pages) == (1, 0, 1)
+    assert stats.models == 50
+    assert stats.bytes_received > 0
+    assert {"xml", "models"} <= set(stats.parse_times)
+    assert stats.parse_time == pytest.approx(sum(stats.parse_times.values()))
+
+
+def test_metrics_of_paginated_searches(make_client):
+    metrics = SpectrumMetrics()
+    spectrum = make_client(hooks=metrics)
+
+    models = list(spectrum.iter_models("model_name ~ device", page_size=20))
+    assert len(models) == 50
+
+    stats = metrics.stats()["/models"]
+    assert (stats.requests, stats.pages, stats.models) == (3, 3, 50)
+    assert stats.bytes_sent > 0
+    assert stats.build_time > 0
+
+
+def test_metrics_count_failed_attempts(fake):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(503)
+        return fake.handle(request)
+
+    metrics = SpectrumMetrics()
+    spectrum = SpectrumClient(
+        base_url="http://oneclick",
+        username="test",
+        password="test",
+        transport=httpx.MockTransport(handler),
+        retries=RetryPolicy(backoff=0),
+        hooks=metrics,
+    )
+    spectrum.get_all_devices()
+
+    stats = metrics.stats()["/devices"]
+    assert (stats.requests, stats.errors, stats.pages) == (2, 1, 1)
+
+
+def test_total_summary_and_reset(make_client):
+    metrics = SpectrumMetrics()
+    spectrum = make_client(hooks=metrics)
+
+    spectrum.get_all_devices().result
+    spectrum.get_models("model_name ~ device-00001").result
+
+    total = metrics.total()
+    assert total.requests == 2
+    assert total.models == 60
+    assert set(total.parse_times) == set(
+        metrics.stats()["/devices"].parse_times
+    )
+
+    lines = metrics.summary().splitlines()
+    assert [line.split()[0] for line in lines] == [
+        "endpoint",
+        "/devices",
+        "/models",
+        "total",
+    ]
+
+    metrics.reset()
+    assert metrics.stats() == {}
+    assert metrics.total().requests == 0
+
+
+def test_hooks_option(make_client):
+    first, second = Recorder(), Recorder()
+    spectrum = make_client(hooks=[first, second])
+
+    spectrum.get_models("model_name ~ device-00001").result
+
+    assert first.events == second.events
+    assert first.events[:2] == [
+        ("build", "/models"),
+        ("request", "POST", "/models"),
+    ]
+    assert ("parse", "xml", 10) in first.events
+
+    assert make_client(hooks=[first]).hooks is first
+    assert make_client(hooks=[]).hooks is None
+    assert make_client().hooks is None
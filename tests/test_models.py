@@ -0,0 +1,206 @@
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from pyspectrum import SpectrumClient
+from pyspectrum.retry import RetryPolicy
+
+
+class BrokenStream(httpx.SyncByteStream):
+    """ A response body which fails after the given number of models """
+
+    def __init__(self, content, models):
+        self.content = content
+        self.models = models
+
+    def __iter__(self):
+        end = 0
+        for _ in range(self.models):
+            end = self.content.index(b"</model>", end) + len(b"</model>")
+        yield self.content[:end]
+        raise httpx.ReadError("Connection reset by peer")
+
+
+def breaking_client(fake, breaks, retries=3):
+    """
+    A client of the fake server, whose responses to the requests for
+    subsequent pages fail part way through, after the number of models in
+    `breaks` for each request in turn
+    """
+    breaks = list(breaks)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        res = fake.handle(request)
+        if "id" in request.url.params and breaks:
+            return httpx.Response(
+                200, stream=BrokenStream(res.content, breaks.pop(0))
+            )
+        return res
+
+    spectrum = SpectrumClient(
+        base_url="http://oneclick",
+        username="test",
+        password="test",
+        transport=httpx.MockTransport(handler),
+        retries=RetryPolicy(retries, backoff=0),
+    )
+    return spectrum, requests
+
+
+# -----------------------------------------------------------------------------
+#                      Pagination
+# -----------------------------------------------------------------------------
+
+
+def test_iter_device_pages(make_client, fake):
+    pages = list(make_client().iter_device_pages(page_size=20))
+
+    assert [len(page.result) for page in pages] == [20, 20, 10]
+    assert [page.next_info.get("start") for page in pages] == [
+        "20",
+        "40",
+        None,
+    ]
+    assert fake.requests == 3
+
+
+@pytest.mark.parametrize("page_size", [1, 7, 49, 50, 51, None])
+def test_iter_all_devices_matches_get_all_devices(make_client, page_size):
+    spectrum = make_client()
+    models = list(spectrum.iter_all_devices(page_size=page_size))
+
+    assert models == spectrum.get_all_devices().result
+    assert len(models) == 50
+
+
+def test_iter_all_devices_is_lazy(make_client, fake):
+    devices = make_client().iter_all_devices(page_size=20)
+
+    assert fake.requests == 0
+    assert len([next(devices) for _ in range(21)]) == 21
+    assert fake.requests == 2
+
+
+def test_iter_model_pages(make_client, fake):
+    pages = list(
+        make_client().iter_model_pages("model_name ~ device", page_size=15)
+    )
+
+    assert [len(page.result) for page in pages] == [15, 15, 15, 5]
+    assert [
+        parse_qs(urlparse(str(page.response.url)).query).get("start")
+        for page in pages
+    ] == [None, ["15"], ["30"], ["45"]]
+
+
+@pytest.mark.parametrize("page_size", [3, 10, 11])
+def test_iter_models_matches_get_models(make_client, page_size):
+    spectrum = make_client()
+    filters = "model_type_name = Rtr_Cisco"
+    models = list(spectrum.iter_models(filters, page_size=page_size))
+
+    assert models == spectrum.get_models(filters).result
+    assert len(models) == 9
+
+
+def test_iter_models_without_results(make_client, fake):
+    spectrum = make_client()
+
+    assert list(spectrum.iter_models("model_name = none", page_size=5)) == []
+    assert fake.requests == 1
+
+
+def test_iter_model_handles(make_client):
+    spectrum = make_client()
+    handles = [model["model_handle"] for model in spectrum.iter_all_devices()]
+
+    assert list(spectrum.iter_model_handles(page_size=20)) == handles
+    assert list(
+        spectrum.iter_model_handles("model_name ~ device", page_size=20)
+    ) == handles
+
+
+# -----------------------------------------------------------------------------
+#                      Streaming
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("page_size", [7, 50, None])
+def test_stream_matches_pages(make_client, page_size):
+    spectrum = make_client()
+
+    assert list(
+        spectrum.iter_all_devices(page_size=page_size, stream=True)
+    ) == list(spectrum.iter_all_devices(page_size=page_size))
+    assert list(
+        spectrum.iter_models(
+            "model_name ~ device", page_size=page_size, stream=True
+        )
+    ) == list(spectrum.iter_models("model_name ~ device", page_size=page_size))
+
+
+def test_stream_resumes_after_transport_error(make_client, fake):
+    expected = list(make_client().iter_all_devices(page_size=20))
+    spectrum, requests = breaking_client(fake, [5, 0, 19])
+
+    assert list(spectrum.iter_all_devices(page_size=20, stream=True)) == (
+        expected
+    )
+    assert [request.url.params.get("start") for request in requests] == [
+        None,
+        "20",
+        "25",
+        "25",
+        "44",
+    ]
+
+
+def test_stream_raises_when_retries_are_exhausted(fake):
+    spectrum, requests = breaking_client(fake, [1, 1, 1], retries=2)
+    models = []
+
+    with pytest.raises(httpx.ReadError):
+        for model in spectrum.iter_all_devices(page_size=20, stream=True):
+            models.append(model)
+
+    assert len(models) == 23
+    assert len(requests) == 4
+
+
+# -----------------------------------------------------------------------------
+#                      Model Handles
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("chunk_size, requests", [(7, 3), (10, 2), (None, 1)])
+def test_get_models_by_handles(make_client, fake, chunk_size, requests):
+    handles = [0x1000000 + index for index in range(0, 50, 3)][::-1]
+    res = make_client().get_models_by_handles(
+        handles, ["network_address"], chunk_size=chunk_size
+    )
+
+    assert res.model_handles == [hex(handle) for handle in handles]
+    assert res.total_models == res.throttle == str(len(handles))
+    assert res.result[0]["network_address"] == "10.0.0.48"
+    assert not res.next_info
+    assert fake.requests == requests
+
+
+def test_get_models_by_handles_skips_unknown_handles(make_client):
+    res = make_client().get_models_by_handles(
+        [0x1000001, 0x1ffffff, 0x1000002], chunk_size=2
+    )
+
+    assert res.model_handles == ["0x1000001", "0x1000002"]
+
+
+def test_get_models_by_handles_without_handles(make_client, fake):
+    res = make_client().get_models_by_handles([])
+
+    assert res.result == [] and res.model_handles == []
+    assert res.total_models == "0"
+    assert not res.next_info
+    assert fake.requests == 0
@@ -0,0 +1,112 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from fake_oneclick import generate_models, model_response_list
+from pyspectrum.parallel import (
+    SpectrumParsePool,
+    SpectrumParsedPage,
+    parse_page,
+    next_page_info,
+    page_total,
+)
+from pyspectrum.responses import SpectrumModelResponseList
+
+MODELS = generate_models(25, extra_attrs=2)
+
+CURSOR = "5e7a1c2b-0d3f-4e9a-8b6c-1f2e3d4c5b6a"
+
+
+def parse_serial(content, resolve_attrs=True):
+    return SpectrumModelResponseList(
+        httpx.Response(200, content=content), resolve_attrs
+    )
+
+
+def pages(size):
+    return [
+        model_response_list(MODELS, start=start, size=size, cursor=CURSOR)
+        for start in range(0, len(MODELS), size)
+    ]
+
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(2) as executor:
+        yield SpectrumParsePool(executor=executor, max_pending=2)
+
+
+@pytest.mark.parametrize("resolve_attrs", [True, False])
+def test_parse_page_matches_serial_parse(resolve_attrs):
+    content = model_response_list(MODELS, size=10, cursor=CURSOR)
+    page = SpectrumParsedPage(parse_page(content), resolve_attrs)
+
+    assert len(page) == 10
+    assert page.result == parse_serial(content, resolve_attrs).result
+    assert list(page) == page.result
+
+
+def test_parse_empty_page():
+    content = model_response_list([])
+
+    assert SpectrumParsedPage(parse_page(content)).result == []
+    assert page_total(content) == 0
+    assert next_page_info(content) == {}
+
+
+def test_next_page_info_matches_serial_parse():
+    for content in pages(10):
+        assert next_page_info(content) == parse_serial(content).next_info
+        assert page_total(content) == len(MODELS)
+
+
+def test_parse_pages_in_order(pool):
+    parsed = list(pool.parse_pages(pages(4)))
+
+    assert [len(page) for page in parsed] == [4, 4, 4, 4, 4, 4, 1]
+    assert [model for page in parsed for model in page] == (
+        parse_serial(model_response_list(MODELS)).result
+    )
+
+
+def test_parse_pages_async(pool):
+    async def contents():
+        for content in pages(4):
+            yield content
+
+    async def main():
+        return [page async for page in pool.parse_pages_async(contents())]
+
+    assert [len(page) for page in asyncio.run(main())] == [4] * 6 + [1]
+
+
+def test_coerce():
+    pool = SpectrumParsePool(workers=3)
+    executor = ThreadPoolExecutor(1)
+
+    assert SpectrumParsePool.coerce(None) is None
+    assert SpectrumParsePool.coerce(False) is None
+    assert SpectrumParsePool.coerce(pool) is pool
+    assert SpectrumParsePool.coerce(2).workers == 2
+    assert SpectrumParsePool.coerce(True).workers >= 1
+    assert SpectrumParsePool.coerce(executor).executor is executor
+    executor.shutdown()
+
+
+def test_closing_pool_keeps_a_given_executor(pool):
+    executor = pool.executor
+    pool.close()
+
+    assert pool.executor is executor
+    assert executor.submit(len, b"ok").result() == 2
+
+
+def test_client_parse_pool(make_client):
+    with SpectrumParsePool(workers=2) as pool:
+        spectrum = make_client(parse_pool=pool)
+        models = list(spectrum.iter_all_devices(page_size=20))
+
+    assert models == list(make_client().iter_all_devices(page_size=20))
+    assert len(models) == 50
@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from fake_oneclick import FakeOneClick, generate_models
+from pyspectrum.pool import SpectrumClientPool
+
+
+def make_pool(fakes, **options):
+    return SpectrumClientPool(
+        [
+            {"base_url": f"http://oneclick-{n}", "transport": fake.transport()}
+            for n, fake in enumerate(fakes)
+        ],
+        username="test",
+        password="test",
+        **options,
+    )
+
+
+def test_call_every_server():
+    fakes = [FakeOneClick(generate_models(n)) for n in (5, 8)]
+    with make_pool(fakes) as pool:
+        fanout = pool.get_all_devices()
+
+    assert not fanout.errors
+    assert {
+        server: len(resp.result) for server, resp in fanout.responses.items()
+    } == {"http://oneclick-0": 5, "http://oneclick-1": 8}
+    servers = {model["server"] for model in fanout.result}
+    assert servers == set(fanout.responses)
+
+
+def test_http_timeout_is_passed_to_clients():
+    fakes = [FakeOneClick(generate_models(1))]
+    with make_pool(fakes, timeout=7, call_timeout=30) as pool:
+        (client,) = pool.clients.values()
+        assert client.api.timeout.read == 7
+        assert pool.call_timeout == 30
+
+
+def test_call_timeout_abandons_slow_server():
+    fakes = [
+        FakeOneClick(generate_models(3)),
+        FakeOneClick(generate_models(3), latency=1.0),
+    ]
+    pool = make_pool(fakes, call_timeout=0.2)
+    fanout = pool.get_all_devices()
+
+    assert list(fanout.responses) == ["http://oneclick-0"]
+    assert isinstance(fanout.errors["http://oneclick-1"], TimeoutError)
+
+    start = time.monotonic()
+    pool.close()
+    assert time.monotonic() - start < 0.5
+
+
+def test_first_returns_fastest_server():
+    fakes = [
+        FakeOneClick(generate_models(3), latency=0.5),
+        FakeOneClick(generate_models(4)),
+    ]
+    with make_pool(fakes) as pool:
+        assert len(pool.first("get_all_devices").result) == 4
+
+
+def test_first_raises_when_every_server_fails():
+    fakes = [FakeOneClick(generate_models(1)) for _ in range(2)]
+    with make_pool(fakes) as pool:
+        with pytest.raises(RuntimeError):
+            pool.first("get_models", "not a filter")
@@ -0,0 +1,292 @@
+import csv
+
+import httpx
+import pytest
+from lxml import etree
+
+from fake_oneclick import NAMESPACE, generate_models, model_response_list
+from pyspectrum.responses import (
+    SpectrumModelColumns,
+    SpectrumModelResponseList,
+    SpectrumModelResponseStream,
+    SpectrumModelView,
+)
+
+MODELS = generate_models(12)
+
+
+def parse(content, resolve_attrs=True):
+    return SpectrumModelResponseList(
+        httpx.Response(200, content=content), resolve_attrs
+    )
+
+
+def model_elements(xml):
+    root = etree.fromstring(
+        f'<model-responses xmlns="{NAMESPACE}">{xml}</model-responses>'
+    )
+    for elem in root.iter():
+        elem.tag = etree.QName(elem).localname
+    return list(root)
+
+
+def stream(content, chunk_size, resolve_attrs=True):
+    chunks = [
+        content[start : start + chunk_size]
+        for start in range(0, len(content), chunk_size)
+    ]
+    return SpectrumModelResponseStream(
+        httpx.Response(200, content=iter(chunks)), resolve_attrs
+    )
+
+
+def read_csv(filepath):
+    with open(filepath, newline="") as infile:
+        return list(csv.reader(infile))
+
+
+# -----------------------------------------------------------------------------
+#                      SpectrumModelView
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture
+def page():
+    return parse(model_response_list(MODELS))
+
+
+def test_view_length_without_parsing(page):
+    view = page.models
+
+    assert isinstance(view, SpectrumModelView)
+    assert len(view) == len(MODELS)
+    assert view._parsed == [None] * len(MODELS)
+    assert "result" not in page.__dict__
+
+
+@pytest.mark.parametrize("index", [0, 5, 11, -1, -5, -12])
+def test_view_index(page, index):
+    expected = parse(model_response_list(MODELS)).result[index]
+    view = page.models
+
+    assert view[index] == expected
+    assert view[index] is view[index % len(MODELS)]
+    assert sum(model is not None for model in view._parsed) == 1
+
+
+@pytest.mark.parametrize("index", [12, -13])
+def test_view_index_out_of_range(page, index):
+    with pytest.raises(IndexError):
+        page.models[index]
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        slice(2, 5),
+        slice(None, None, -2),
+        slice(-3, None),
+        slice(-100, 100),
+        slice(10, 2),
+        slice(3, -3, 4),
+    ],
+)
+def test_view_slice(page, index):
+    expected = parse(model_response_list(MODELS)).result[index]
+    view = page.models
+    models = view[index]
+
+    assert models == expected
+    assert all(
+        model is view[idx]
+        for model, idx in zip(models, range(*index.indices(len(view))))
+    )
+
+
+def test_view_iteration_keeps_parsed_models(page):
+    view = page.models
+    first, last = view[0], view[-1]
+    models = list(view)
+
+    assert models[0] is first and models[-1] is last
+    assert models == page.result
+    assert all(a is b for a, b in zip(page.result, view))
+    assert list(reversed(view)) == models[::-1]
+    assert view.index(models[3]) == 3 and models[3] in view
+
+
+def test_view_is_reset_by_extend():
+    first = parse(model_response_list(MODELS[:5]))
+    second = parse(model_response_list(MODELS[5:]))
+    view = first.models
+
+    first.extend(second)
+
+    assert len(view) == 5
+    assert len(first.models) == len(MODELS)
+    assert first.models[-1]["model_handle"] == MODELS[-1]["0x129fa"]
+    assert first.result == parse(model_response_list(MODELS)).result
+
+
+# -----------------------------------------------------------------------------
+#                      SpectrumModelColumns
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("resolve_attrs", [True, False])
+def test_columns_match_result(resolve_attrs):
+    res = parse(model_response_list(MODELS), resolve_attrs)
+    cols = res.columns
+
+    assert len(cols) == len(MODELS)
+    assert list(cols.to_dicts()) == res.result
+    assert cols.to_dict()[cols.names[0]] == cols.data[0]
+
+
+def test_from_elements_with_missing_and_repeated_attributes():
+    models = model_elements(
+        '<model mh="0x1"><attribute id="0x1006e">a</attribute>'
+        '<attribute id="0x1006e">b</attribute></model>'
+        '<model mh="0x2"><attribute id="0x10000">Rtr</attribute></model>'
+        '<model mh="0x3"><attribute id="0x1006e">c</attribute>'
+        '<attribute-list id="0x12a56">'
+        '<instance oid="1" value="x"/></attribute-list></model>'
+    )
+    cols = SpectrumModelColumns.from_elements(models)
+
+    assert cols.names == ["model_name", "model_type_name", "0x12a56"]
+    assert list(cols.rows()) == [
+        ("b", None, None),
+        (None, "Rtr", None),
+        ("c", None, {"1": "x"}),
+    ]
+    assert all(len(column) == len(cols) for column in cols.data)
+
+
+def test_from_models():
+    models = [{"name": "a", "size": 1}, {"name": "b", "type": "x"}]
+    cols = SpectrumModelColumns.from_models(models)
+
+    assert cols.names == ["name", "size", "type"]
+    assert list(cols.to_dicts()) == [
+        {"name": "a", "size": 1, "type": None},
+        {"name": "b", "size": None, "type": "x"},
+    ]
+
+
+def test_extend_and_concat_with_differing_schemas():
+    first = SpectrumModelColumns.from_models([{"a": "1"}, {"a": "2"}])
+    second = SpectrumModelColumns.from_models([{"b": "3"}])
+    third = SpectrumModelColumns.from_models([{"a": "4", "c": "5"}])
+
+    cols = SpectrumModelColumns.concat([first, second, third])
+    assert cols.names == ["a", "b", "c"]
+    assert list(cols.rows()) == [
+        ("1", None, None),
+        ("2", None, None),
+        (None, "3", None),
+        ("4", None, "5"),
+    ]
+
+    # The inputs are not modified
+    assert (first.names, len(first)) == (["a"], 2)
+    assert list(first.rows()) == [("1",), ("2",)]
+
+    first.extend(second)
+    assert list(first.rows()) == [("1", None), ("2", None), (None, "3")]
+    assert len(SpectrumModelColumns.concat([])) == 0
+
+
+def test_concat_pages_keeps_attribute_ids():
+    pages = [
+        parse(model_response_list(MODELS[:5]), resolve_attrs=False),
+        parse(model_response_list(MODELS[5:])),
+    ]
+    cols = SpectrumModelColumns.concat(page.columns for page in pages)
+
+    assert cols.names == pages[0].columns.names
+    assert list(cols.to_dicts()) == parse(
+        model_response_list(MODELS), resolve_attrs=False
+    ).result
+
+
+def test_to_csv(tmp_path):
+    cols = SpectrumModelColumns.from_models(
+        [
+            {"name": "b", "type": "x", "size": 2},
+            {"name": "C", "type": "y"},
+            {"name": "a", "type": "z", "size": 1},
+        ]
+    )
+    filepath = str(tmp_path / "models.csv")
+
+    cols.to_csv(filepath, exclude=["type"], orderby="name")
+    assert read_csv(filepath) == [
+        ["name", "size"],
+        ["a", "1"],
+        ["b", "2"],
+        ["C", ""],
+    ]
+
+    cols.to_csv(filepath)
+    assert read_csv(filepath)[0] == ["name", "type", "size"]
+    assert len(read_csv(filepath)) == 4
+
+
+def test_to_csv_orderby_non_string_values(tmp_path):
+    cols = SpectrumModelColumns.from_models(
+        [{"name": "b", "list": {"1": "x"}}, {"name": "a", "list": "y"}]
+    )
+    filepath = str(tmp_path / "models.csv")
+
+    cols.to_csv(filepath, orderby="list")
+    assert [row[0] for row in read_csv(filepath)[1:]] == ["b", "a"]
+
+
+# -----------------------------------------------------------------------------
+#                      SpectrumModelResponseStream
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1 << 20])
+@pytest.mark.parametrize("resolve_attrs", [True, False])
+def test_stream_matches_parsed_page(chunk_size, resolve_attrs):
+    content = model_response_list(
+        MODELS, size=5, cursor="5e7a1c2b-0d3f-4e9a-8b6c-1f2e3d4c5b6a"
+    )
+    page = stream(content, chunk_size, resolve_attrs)
+    parsed = parse(content, resolve_attrs)
+
+    assert page.next_info == {}
+    assert list(page) == parsed.result
+    assert page.next_info == parsed.next_info
+    assert (page.total_models, page.throttle) == ("12", "5")
+
+
+def test_stream_of_last_page():
+    page = stream(model_response_list(MODELS, start=10, size=5), 64)
+
+    assert [model["model_handle"] for model in page] == [
+        MODELS[10]["0x129fa"],
+        MODELS[11]["0x129fa"],
+    ]
+    assert page.next_info == {}
+
+
+def test_stream_yields_models_as_they_are_received():
+    content = model_response_list(MODELS[:3])
+    end = content.index(b"</model>") + len(b"</model>")
+    received = []
+
+    def chunks():
+        received.append(content[:end])
+        yield content[:end]
+        received.append(content[end:])
+        yield content[end:]
+
+    page = SpectrumModelResponseStream(httpx.Response(200, content=chunks()))
+    models = iter(page)
+
+    assert next(models)["model_handle"] == MODELS[0]["0x129fa"]
+    assert len(received) == 1
+    assert len(list(models)) == 2
@@ -0,0 +1,177 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pyspectrum import SpectrumClient, AsyncSpectrumClient
+from pyspectrum.retry import RetryPolicy, TokenBucket
+
+
+class Flaky:
+    """ Fails the first `failures` requests, then defers to the fake server """
+
+    def __init__(self, fake, failures, status_code=503):
+        self.fake = fake
+        self.failures = failures
+        self.status_code = status_code
+        self.attempts = 0
+
+    def __call__(self, request):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            if self.status_code is None:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(self.status_code)
+        return self.fake.handle(request)
+
+    async def handle_async(self, request):
+        return self(request)
+
+
+def flaky_client(handler, **clientopts):
+    return SpectrumClient(
+        base_url="http://oneclick",
+        username="test",
+        password="test",
+        transport=httpx.MockTransport(handler),
+        **clientopts,
+    )
+
+
+# -----------------------------------------------------------------------------
+#                      RetryPolicy
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "method, url, retryable",
+    [
+        ("GET", "/devices", True),
+        ("get", "/devices", True),
+        ("DELETE", "/model/0x1000001", True),
+        ("POST", "/models", True),
+        ("POST", "http://oneclick/spectrum/restful/models/", True),
+        ("POST", "/alarms", True),
+        ("POST", "/action", False),
+        ("PATCH", "/model/0x1000001", False),
+    ],
+)
+def test_is_retryable(method, url, retryable):
+    assert RetryPolicy().is_retryable(method, url) is retryable
+
+
+def test_should_retry():
+    policy = RetryPolicy(retries=2)
+    retry, ok = httpx.Response(503), httpx.Response(404)
+    exc = httpx.ReadTimeout("timed out")
+
+    assert policy.should_retry("GET", "/devices", 0, response=retry)
+    assert policy.should_retry("GET", "/devices", 1, exc=exc)
+    assert not policy.should_retry("GET", "/devices", 2, response=retry)
+    assert not policy.should_retry("GET", "/devices", 0, response=ok)
+    assert not policy.should_retry("GET", "/devices", 0, exc=ValueError())
+    assert not policy.should_retry("POST", "/action", 0, response=retry)
+
+
+def test_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+    assert policy.delay(
+        0, httpx.Response(429, headers={"Retry-After": "3"})
+    ) == 3
+    assert policy.delay(
+        0, httpx.Response(429, headers={"Retry-After": "60"})
+    ) == 5
+
+    jittered = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= jittered.delay(3) <= 5 for _ in range(100))
+
+
+def test_coerce():
+    policy = RetryPolicy(retries=5)
+
+    assert RetryPolicy.coerce(policy) is policy
+    assert RetryPolicy.coerce(2).retries == 2
+    assert RetryPolicy.coerce(None).retries == 0
+
+
+# -----------------------------------------------------------------------------
+#                      TokenBucket
+# -----------------------------------------------------------------------------
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_coerce():
+    bucket = TokenBucket(rate=5)
+
+    assert TokenBucket.coerce(bucket) is bucket
+    assert TokenBucket.coerce(None) is None
+    assert TokenBucket.coerce(20).capacity == 20
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+# -----------------------------------------------------------------------------
+#                      Client
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("status_code", [429, 502, 503, 504, None])
+def test_client_retries_transient_failures(fake, status_code):
+    flaky = Flaky(fake, failures=2, status_code=status_code)
+    spectrum = flaky_client(flaky, retries=RetryPolicy(retries=2, backoff=0))
+
+    assert len(spectrum.get_all_devices().result) == 50
+    assert flaky.attempts == 3
+
+
+def test_client_retries_model_searches(fake):
+    flaky = Flaky(fake, failures=1)
+    spectrum = flaky_client(flaky, retries=RetryPolicy(backoff=0))
+
+    res = spectrum.get_models("model_name ~ device-00001")
+    assert len(res.result) == 10
+    assert flaky.attempts == 2
+
+
+def test_client_raises_once_retries_are_exhausted(fake):
+    flaky = Flaky(fake, failures=3)
+    spectrum = flaky_client(flaky, retries=RetryPolicy(retries=2, backoff=0))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        spectrum.get_all_devices()
+    assert flaky.attempts == 3
+
+
+def test_client_does_not_retry_other_errors(fake):
+    flaky = Flaky(fake, failures=1, status_code=500)
+    spectrum = flaky_client(flaky, retries=RetryPolicy(backoff=0))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        spectrum.get_all_devices()
+    assert flaky.attempts == 1
+
+
+def test_async_client_retries_transient_failures(fake):
+    flaky = Flaky(fake, failures=2)
+
+    async def main():
+        async with AsyncSpectrumClient(
+            base_url="http://oneclick",
+            username="test",
+            password="test",
+            transport=httpx.MockTransport(flaky.handle_async),
+            retries=RetryPolicy(backoff=0),
+        ) as spectrum:
+            return await spectrum.get_all_devices()
+
+    assert len(asyncio.run(main()).result) == 50
+    assert flaky.attempts == 3
@@ -0,0 +1,48 @@
+import importlib
+import sys
+
+import pytest
+
+import pyspectrum.snapshot
+from pyspectrum.snapshot import SpectrumSnapshot, write_snapshot
+
+MODELS = [
+    {"model_handle": "0x1000003", "model_name": "core", "condition": "0"},
+    {"model_handle": "0x1000001", "model_name": "édge", "ports": {"1": "a"}},
+    {"model_handle": "0x2000002", "model_name": "core", "condition": None},
+]
+
+
+def test_write_and_read_snapshot(tmp_path):
+    filepath = tmp_path / "inventory.snap"
+    assert write_snapshot(MODELS, filepath) == len(MODELS)
+
+    with SpectrumSnapshot(filepath) as snapshot:
+        assert len(snapshot) == len(MODELS)
+        assert list(snapshot) == MODELS
+        assert snapshot.get("0x1000001")["ports"] == {"1": "a"}
+        assert snapshot.get(0x2000002)["model_name"] == "core"
+        assert snapshot.get("0x1000002") is None
+        assert "0x1000003" in snapshot
+        assert snapshot[-1]["model_handle"] == "0x2000002"
+        assert snapshot.column("condition") == ["0", None, None]
+
+
+def test_snapshot_from_response(make_client, fake, tmp_path):
+    response = make_client().get_all_devices()
+    filepath = tmp_path / "devices.snap"
+    response.to_snapshot(filepath)
+
+    with SpectrumSnapshot(filepath) as snapshot:
+        assert list(snapshot) == response.result
+
+
+def test_package_imports_on_big_endian_platform(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "byteorder", "big")
+    try:
+        module = importlib.reload(pyspectrum.snapshot)
+        with pytest.raises(RuntimeError):
+            module.write_snapshot(MODELS, tmp_path / "inventory.snap")
+    finally:
+        monkeypatch.undo()
+        importlib.reload(pyspectrum.snapshot)
@@ -0,0 +1,146 @@
+import itertools
+
+import pytest
+from lxml import etree
+
+from pyspectrum import template
+from pyspectrum.filters import F, parse_filter
+from pyspectrum.template import (
+    model_search_bytes,
+    model_search_xml,
+    model_handles_bytes,
+    model_handles_xml,
+    model_search_payload,
+    alarm_search_bytes,
+    clear_payload_cache,
+    payload_cache_info,
+)
+
+FILTERS = [
+    {},
+    {"filter": parse_filter("model_name ~ lab")},
+    {
+        "filter": parse_filter(
+            "and(model_name ~ lab, or(condition > 0, not(condition = 1, "
+            "condition = 2)))"
+        )
+    },
+    {"filter_xml": (F.model_name == "lab").to_xml()},
+    {"filter": parse_filter("model_name = 'R&D <lab>'")},
+]
+
+SEARCH_OPTIONS = [
+    {},
+    {"devices_only": True},
+    {"interfaces_only": True},
+    {"devices_only": True, "interfaces_only": True},
+    {"child_models": True},
+    {"child_models": True, "relation": 0x10002},
+    {"parent_models": True, "relation": "0x10002"},
+    {"child_models": True, "parent_models": True},
+]
+
+REQ_ATTRS = [[], ["0x1006e"], [0x1006E, "0x10000", 0x12D7F]]
+
+THROTTLES = [{}, {"throttlesize": 5000}]
+
+
+@pytest.mark.parametrize(
+    "filters, options, req_attrs, throttle",
+    itertools.product(FILTERS, SEARCH_OPTIONS, REQ_ATTRS, THROTTLES),
+)
+def test_model_search_bytes_matches_template(
+    filters, options, req_attrs, throttle
+):
+    params = {**filters, **options, "req_attrs": req_attrs, **throttle}
+    payload = model_search_bytes(**params)
+
+    assert payload == model_search_xml(**params).encode()
+    etree.fromstring(payload)
+
+
+@pytest.mark.parametrize(
+    "model_handles, req_attrs, throttle",
+    itertools.product(
+        [[], [0x1000001], [0x1000001, "0x1000002", 0x20000AB]],
+        REQ_ATTRS,
+        THROTTLES,
+    ),
+)
+def test_model_handles_bytes_matches_template(
+    model_handles, req_attrs, throttle
+):
+    params = {
+        "model_handles": model_handles,
+        "req_attrs": req_attrs,
+        **throttle,
+    }
+    payload = model_handles_bytes(**params)
+
+    assert payload == model_handles_xml(**params).encode()
+    etree.fromstring(payload)
+
+
+def test_unsupported_parameters_fall_back_to_template():
+    params = {"req_attrs": ["0x1006e"], "unknown_option": True}
+    assert model_search_bytes(**params) == model_search_xml(**params).encode()
+
+
+def test_model_search_payload_is_cached():
+    clear_payload_cache()
+    first = model_search_payload("model_name ~ lab", ["0x1006e"], 100)
+    second = model_search_payload(" model_name ~ lab ", ["0x1006e"], 100)
+
+    assert first == second
+    assert payload_cache_info().hits == 1
+    assert first == model_search_bytes(
+        filter=parse_filter("model_name ~ lab"),
+        req_attrs=["0x1006e"],
+        throttlesize=100,
+        devices_only=False,
+    )
+
+
+def test_unhashable_search_options_are_not_cached():
+    clear_payload_cache()
+    payload = model_search_payload(
+        "model_name ~ lab", ["0x1006e"], 100, unknown_option=["a"]
+    )
+
+    assert payload == model_search_payload(
+        "model_name ~ lab", ["0x1006e"], 100
+    )
+    assert payload_cache_info().currsize == 1
+
+
+def test_type_error_while_writing_payload_is_raised(monkeypatch):
+    calls = []
+
+    def model_search_bytes(**params):
+        calls.append(params)
+        raise TypeError("unexpected value")
+
+    clear_payload_cache()
+    monkeypatch.setattr(template, "model_search_bytes", model_search_bytes)
+
+    with pytest.raises(TypeError, match="unexpected value"):
+        model_search_payload("model_name ~ lab", ["0x1006e"], 100)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("value", ["R&D", "<lab>", "a > b & c < d"])
+def test_string_filter_values_are_escaped(value):
+    clear_payload_cache()
+    payload = model_search_payload(f"model_name = '{value}'", [], 100)
+
+    assert payload == model_search_payload(F.model_name == value, [], 100)
+    values = etree.fromstring(payload).xpath("//*[local-name()='value']")
+    assert [v.text for v in values] == [value]
+
+
+def test_alarm_string_filter_values_are_escaped():
+    payload = alarm_search_bytes("alarm_title = 'A&B <C>'", [], 100)
+
+    assert payload == alarm_search_bytes(F.alarm_title == "A&B <C>", [], 100)
+    values = etree.fromstring(payload).xpath("//*[local-name()='value']")
+    assert [v.text for v in values] == ["A&B <C>"]